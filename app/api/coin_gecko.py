@@ -1,28 +1,108 @@
 # app/api/coin_gecko.py
-import requests
+import threading
 import time
-from typing import List, Dict, Optional
-from ..config import API_BASE_URL, API_TIMEOUT
+from typing import List, Dict, Optional, Tuple, Any, Union
+from ..config import API_BASE_URL, API_TIMEOUT, API_RATE_LIMIT_PER_MINUTE, API_MIN_REQUEST_INTERVAL, RECORD_DIR
+from .network_monitor import NetworkMonitor, network_monitor
+from .rate_budget import RateBudget
+from ..utils.tracing import tracer
+
+# Shared by every client so all periodic work draws from one upstream budget
+rate_budget = RateBudget(API_RATE_LIMIT_PER_MINUTE)
 
 class CoinGeckoAPI:
     """A client for interacting with the CoinGecko API."""
     
-    def __init__(self, base_url: str = API_BASE_URL, timeout: int = API_TIMEOUT):
+    def __init__(self, base_url: str = API_BASE_URL, timeout: int = API_TIMEOUT,
+                 monitor: NetworkMonitor = network_monitor):
         self.base_url = base_url
         self.timeout = timeout
-        self.session = requests.Session()
+        self.monitor = monitor  # fed with the outcome and latency of every request
+        self.budget = rate_budget
+        self._local = threading.local()  # one HTTP session per thread (sessions are not thread-safe)
+        # (url, params) -> (ETag, decoded body); revalidated with If-None-Match
+        self._etags: Dict[Tuple, Tuple[str, Any]] = {}
+        self._lock = threading.Lock()  # guards the ETag cache and the request pacing
         self.last_request_time = 0
-        self.min_request_interval = 1.2 # ~50 requests/min limit
+        self.min_request_interval = API_MIN_REQUEST_INTERVAL # ~50 requests/min limit by default
+        self.recorder = None
+        if RECORD_DIR:
+            from ..replay.recorder import ResponseRecorder
+            self.recorder = ResponseRecorder(RECORD_DIR)
+
+    @property
+    def session(self):
+        """This thread's HTTP session, created on first use so `requests` stays off the startup path."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+            session = self._local.session = requests.Session()
+        return session
+
+    def _get(self, url: str, params: Dict, timeout: float, description: str, reserved: bool = False):
+        """Performs a GET request and returns the decoded JSON, or None on failure.
+
+        `reserved` means the caller already took the request's slot from the rate budget.
+        """
+        import requests
+        if not reserved:
+            self.budget.record()
+        cache_key = (url, tuple(sorted(params.items())))
+        with self._lock:
+            cached = self._etags.get(cache_key)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        started = time.perf_counter()
+        try:
+            with tracer.span("api.http", "api", request=description):
+                response = self.session.get(url, params=params, timeout=timeout, headers=headers)
+        except requests.exceptions.RequestException as e:
+            # No response at all: connectivity problem
+            self.monitor.record_unreachable()
+            print(f"API Error fetching {description}: {e}")
+            return None
+
+        self.monitor.record_response(time.perf_counter() - started, ok=response.ok)
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After", "")
+            self.budget.exhaust(float(retry_after) if retry_after.isdigit() else 60.0)
+        tracer.count("api.requests")
+        if response.status_code == 304 and cached:
+            tracer.count("api.not_modified")
+            return cached[1]  # unchanged since our copy
+        try:
+            response.raise_for_status() # Raises HTTPError for bad responses (4XX or 5XX)
+            with tracer.span("api.json_decode", "api", bytes=len(response.content)):
+                data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"API Error fetching {description}: {e}")
+            return None
+
+        if self.recorder is not None:
+            self.recorder.record(url[len(self.base_url):], params, data)
+        etag = response.headers.get("ETag")
+        if etag:
+            with self._lock:
+                if len(self._etags) >= 64 and cache_key not in self._etags:
+                    self._etags.pop(next(iter(self._etags)))  # drop the oldest entry
+                self._etags[cache_key] = (etag, data)
+        return data
 
     def _rate_limit(self):
-        """Ensures requests do not exceed the API rate limit."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
-
-    def get_top_coins(self, limit: int = 50, currency: str = 'usd') -> Optional[List[Dict]]:
-        """Fetches the top N cryptocurrencies by market cap."""
+        """Ensures requests do not exceed the API rate limit.
+
+        Each caller reserves the next free slot under the lock, so concurrent threads
+        are spaced `min_request_interval` apart instead of all passing at once.
+        """
+        with self._lock:
+            now = time.time()
+            slot = max(now, self.last_request_time + self.min_request_interval)
+            self.last_request_time = slot
+        if slot > now:
+            with tracer.span("api.rate_limit_sleep", "api"):
+                time.sleep(slot - now)
+
+    def get_top_coins(self, limit: int = 50, currency: str = 'usd', sparkline: bool = False) -> Optional[List[Dict]]:
+        """Fetches the top N cryptocurrencies by market cap (optionally with 7-day sparklines)."""
         self._rate_limit()
         
         endpoint = "/coins/markets"
@@ -31,29 +111,83 @@ class CoinGeckoAPI:
             'order': 'market_cap_desc',
             'per_page': limit,
             'page': 1,
-            'sparkline': 'false'
+            'sparkline': 'true' if sparkline else 'false'
         }
         
-        try:
-            response = self.session.get(f"{self.base_url}{endpoint}", params=params, timeout=self.timeout)
-            response.raise_for_status() # Raises HTTPError for bad responses (4XX or 5XX)
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"API Error fetching top coins: {e}")
-            return None
+        return self._get(f"{self.base_url}{endpoint}", params, self.timeout, "top coins")
     
-    def fetch_coin_history(self, coin_id: str, days: int = 7, currency: str = "usd"):
-        """Fetch historical market chart data for a coin."""
+    def get_coins_by_ids(self, ids: List[str], currency: str = "usd", sparkline: bool = False) -> Optional[List[Dict]]:
+        """Fetches market data for specific coins (e.g. holdings outside the top N) in one call."""
+        if not ids:
+            return []
+        self._rate_limit()
+
+        params = {
+            "vs_currency": currency,
+            "ids": ",".join(ids),
+            "order": "market_cap_desc",
+            "per_page": len(ids),
+            "page": 1,
+            "sparkline": "true" if sparkline else "false"
+        }
+        return self._get(f"{self.base_url}/coins/markets", params, self.timeout, "portfolio coins")
+
+    def fetch_coin_history(self, coin_id: str, days: int = 7, currency: str = "usd",
+                           wait_for_budget: bool = False, cancelled: Optional[threading.Event] = None):
+        """Fetch historical market chart data for a coin.
+
+        With `wait_for_budget` (bulk exports) the call first waits for a free slot in the
+        rate budget; it returns None if `cancelled` is set while waiting.
+        """
+        if wait_for_budget and not self.budget.acquire(cancelled):
+            return None
+        self._rate_limit()
+
         url = f"{self.base_url}/coins/{coin_id}/market_chart"
         params = {
             "vs_currency": currency,
             "days": days,
             "interval": "daily"
         }
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"API Error fetching history for {coin_id}: {e}")
-            return None
\ No newline at end of file
+        return self._get(url, params, 10, f"history for {coin_id}", reserved=wait_for_budget)
+    
+    def fetch_coin_ohlc(self, coin_id: str, days: int = 7, currency: str = "usd") -> Optional[List[List[float]]]:
+        """Fetch OHLC candles ([timestamp, open, high, low, close]) for a coin.
+
+        CoinGecko picks the candle granularity from `days`: 30 minutes for 1-2 days,
+        4 hours for 3-30 days and 4 days beyond that.
+        """
+        self._rate_limit()
+
+        url = f"{self.base_url}/coins/{coin_id}/ohlc"
+        params = {
+            "vs_currency": currency,
+            "days": days
+        }
+        return self._get(url, params, self.timeout, f"OHLC for {coin_id}")
+
+    def get_simple_prices(self, ids: List[str], currency: Union[str, List[str]] = "usd") -> Optional[Dict[str, Dict]]:
+        """Fetches current price, 24h change and market cap for specific coins in one call.
+
+        `currency` may list several currencies; they are all quoted in the same request.
+        """
+        if not ids:
+            return {}
+        self._rate_limit()
+
+        params = {
+            "ids": ",".join(ids),
+            "vs_currencies": currency if isinstance(currency, str) else ",".join(currency),
+            "include_market_cap": "true",
+            "include_24hr_change": "true"
+        }
+        return self._get(f"{self.base_url}/simple/price", params, self.timeout, "simple prices")
+
+    def get_json(self, endpoint: str, params: Dict, description: Optional[str] = None):
+        """GET any endpoint relative to the base URL (used by the local server to proxy requests)."""
+        self._rate_limit()
+        return self._get(f"{self.base_url}{endpoint}", params, self.timeout, description or endpoint)
+
+    def ping(self) -> bool:
+        """Lightweight connectivity probe against the API's /ping endpoint."""
+        return self._get(f"{self.base_url}/ping", {}, 5, "ping") is not None
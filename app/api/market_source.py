@@ -0,0 +1,204 @@
+# app/api/market_source.py
+import json
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+from ..config import API_BASE_URL, WATCHLIST, MARKET_SOURCE
+from .coin_gecko import CoinGeckoAPI
+
+
+class PriceTick(NamedTuple):
+    """One coin's latest price fields (named like the formatted coin dicts)."""
+    coin_id: str
+    price: Optional[float]
+    change_24h: Optional[float] = None
+    market_cap: Optional[float] = None
+    ts: float = 0.0
+
+    def fields(self) -> Dict[str, float]:
+        """The non-empty price fields, ready to update a formatted coin dict."""
+        values = {"price": self.price, "change_24h": self.change_24h, "market_cap": self.market_cap}
+        return {key: value for key, value in values.items() if value is not None}
+
+
+TickCallback = Callable[[List[PriceTick]], None]
+
+
+def ticks_from_markets(coins: Iterable[Dict], ts: Optional[float] = None) -> List[PriceTick]:
+    """Converts raw /coins/markets entries into ticks."""
+    ts = ts or time.time()
+    return [
+        PriceTick(coin["id"], coin.get("current_price"), coin.get("price_change_percentage_24h"),
+                  coin.get("market_cap"), ts)
+        for coin in coins if coin.get("id")
+    ]
+
+
+def ticks_from_simple_prices(quotes: Dict[str, Dict], currency: str = "usd",
+                             ts: Optional[float] = None) -> List[PriceTick]:
+    """Converts a /simple/price response into ticks."""
+    ts = ts or time.time()
+    return [
+        PriceTick(coin_id, quote.get(currency), quote.get(f"{currency}_24h_change"),
+                  quote.get(f"{currency}_market_cap"), ts)
+        for coin_id, quote in quotes.items()
+    ]
+
+
+class MarketDataSource:
+    """Delivers per-coin price ticks to a callback.
+
+    Callbacks may be invoked from a background thread; GUI consumers should hand the
+    ticks to a TickCoalescer rather than touching widgets directly.
+    """
+
+    def __init__(self):
+        self._on_ticks: Optional[TickCallback] = None
+
+    @property
+    def is_push(self) -> bool:
+        """True if the source delivers ticks on its own (no external polling needed)."""
+        return False
+
+    def start(self, on_ticks: TickCallback) -> None:
+        self._on_ticks = on_ticks
+
+    def stop(self) -> None:
+        self._on_ticks = None
+
+    def set_coin_ids(self, coin_ids: Iterable[str]) -> None:
+        """Changes the coins the source follows (sources covering a whole market ignore this)."""
+
+    def _emit(self, ticks: List[PriceTick]) -> None:
+        if ticks and self._on_ticks is not None:
+            self._on_ticks(ticks)
+
+
+class PollingSource(MarketDataSource):
+    """Pull adapter over CoinGeckoAPI's /simple/price.
+
+    `poll()` performs one blocking fetch and emits ticks for prices that changed; the
+    GUI calls it from its RefreshScheduler so polling keeps adapting to the rate budget.
+    """
+
+    def __init__(self, api: CoinGeckoAPI, coin_ids: Iterable[str] = WATCHLIST, currency: str = "usd"):
+        super().__init__()
+        self.api = api
+        self.coin_ids = list(coin_ids)
+        self.currency = currency
+        self._last: Dict[str, PriceTick] = {}
+
+    def set_coin_ids(self, coin_ids: Iterable[str]) -> None:
+        self.coin_ids = list(dict.fromkeys(coin_ids))
+
+    def poll(self) -> int:
+        """Fetches the current quotes once; returns the number of ticks emitted."""
+        quotes = self.api.get_simple_prices(self.coin_ids, self.currency)
+        if not quotes:
+            return 0
+        ticks = []
+        for tick in ticks_from_simple_prices(quotes, self.currency):
+            previous = self._last.get(tick.coin_id)
+            if previous is None or previous[1:4] != tick[1:4]:
+                ticks.append(tick)
+            self._last[tick.coin_id] = tick
+        self._emit(ticks)
+        return len(ticks)
+
+
+class StreamingSource(MarketDataSource):
+    """Push adapter for the local server's Server-Sent Events feed (`<base>/stream`).
+
+    Runs a reader thread that reconnects with exponential backoff and resumes from the
+    last seen snapshot version via Last-Event-ID.
+    """
+
+    def __init__(self, base_url: str = API_BASE_URL, reconnect_min: float = 1.0,
+                 reconnect_max: float = 60.0, read_timeout: float = 60.0):
+        super().__init__()
+        self.url = f"{base_url}/stream"
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+        self.read_timeout = read_timeout  # the server sends keep-alives well within this
+        self.last_event_id = ""
+        self.connected = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._response = None
+
+    @property
+    def is_push(self) -> bool:
+        return True
+
+    def start(self, on_ticks: TickCallback) -> None:
+        super().start(on_ticks)
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="market-stream", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            response.close()  # unblocks the reader
+        super().stop()
+
+    def _run(self):
+        import requests
+        session = requests.Session()
+        backoff = self.reconnect_min
+        while not self._stop.is_set():
+            headers = {"Accept": "text/event-stream"}
+            if self.last_event_id:
+                headers["Last-Event-ID"] = self.last_event_id
+            try:
+                with session.get(self.url, headers=headers, stream=True,
+                                 timeout=(5, self.read_timeout)) as response:
+                    response.raise_for_status()
+                    self._response = response
+                    self.connected = True
+                    backoff = self.reconnect_min
+                    self._read_events(response.iter_lines(decode_unicode=True))
+            except (requests.exceptions.RequestException, AttributeError, ValueError) as e:
+                if not self._stop.is_set():
+                    print(f"Market stream disconnected: {e}")
+            finally:
+                self._response = None
+                self.connected = False
+            if self._stop.wait(backoff):
+                break
+            backoff = min(backoff * 2, self.reconnect_max)
+        session.close()
+
+    def _read_events(self, lines: Iterable[str]):
+        """Parses the SSE wire format and emits one batch of ticks per event."""
+        event_id, data = "", []
+        for line in lines:
+            if self._stop.is_set():
+                return
+            if not line:  # blank line terminates an event
+                if data:
+                    self._emit(ticks_from_markets(json.loads("\n".join(data))))
+                    if event_id:
+                        self.last_event_id = event_id
+                event_id, data = "", []
+            elif line.startswith(":"):
+                continue  # keep-alive comment
+            else:
+                field, _, value = line.partition(":")
+                value = value[1:] if value.startswith(" ") else value
+                if field == "data":
+                    data.append(value)
+                elif field == "id":
+                    event_id = value
+
+
+def create_market_source(api: CoinGeckoAPI, kind: str = MARKET_SOURCE,
+                         coin_ids: Iterable[str] = WATCHLIST) -> MarketDataSource:
+    """Builds the configured source ("poll" or "stream"; streaming needs `python -m app.server`)."""
+    if kind == "stream":
+        return StreamingSource(api.base_url)
+    source = PollingSource(api)
+    source.set_coin_ids(coin_ids)
+    return source
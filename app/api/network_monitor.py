@@ -0,0 +1,102 @@
+# app/api/network_monitor.py
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Iterable
+
+
+class NetworkMonitor:
+    """Infers connectivity passively from the outcome and latency of real API calls.
+
+    Any HTTP response (even a 429 or 5xx) proves the network is up; only connection
+    errors and timeouts count as offline. Active probes are only suggested when no
+    real traffic happened recently, with exponential backoff while offline.
+    """
+
+    def __init__(self, window: int = 100, idle_after: float = 30.0,
+                 online_probe_interval: float = 60.0,
+                 offline_probe_min: float = 5.0, offline_probe_max: float = 300.0):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)  # seconds, successful requests only
+        self.idle_after = idle_after
+        self.online_probe_interval = online_probe_interval
+        self.offline_probe_min = offline_probe_min
+        self.offline_probe_max = offline_probe_max
+
+        self.online: Optional[bool] = None  # None until the first request completes
+        self.last_activity = 0.0
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.errors = 0
+        self._probe_backoff = offline_probe_min
+        self._next_probe_at = time.time() + idle_after  # startup traffic makes an early probe redundant
+        self.probing = False
+
+    # ----- Passive observations -----
+    def record_response(self, latency: float, ok: bool = True):
+        """Records a request that reached the server (`ok` is False for HTTP errors)."""
+        with self._lock:
+            self.requests += 1
+            self.last_activity = time.time()
+            self.online = True
+            self.consecutive_failures = 0
+            self._probe_backoff = self.offline_probe_min
+            if ok:
+                self._latencies.append(latency)
+            else:
+                self.errors += 1
+
+    def record_unreachable(self):
+        """Records a request that failed before any response (DNS, connect, timeout)."""
+        with self._lock:
+            self.requests += 1
+            self.errors += 1
+            self.last_activity = time.time()
+            self.consecutive_failures += 1
+            self.online = False
+
+    # ----- Derived state -----
+    def latency_percentiles(self, percentiles: Iterable[int] = (50, 95)) -> Dict[int, float]:
+        """Returns rolling latency percentiles in milliseconds (empty without samples)."""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return {}
+        last = len(samples) - 1
+        return {p: samples[min(last, round(p / 100 * last))] * 1000 for p in percentiles}
+
+    def idle_for(self) -> float:
+        """Seconds since the last real or probe request finished."""
+        return time.time() - self.last_activity if self.last_activity else float("inf")
+
+    # ----- Active probing -----
+    def should_probe(self) -> bool:
+        """True when an active probe is due: no recent traffic and the backoff has elapsed."""
+        with self._lock:
+            if self.probing:
+                return False
+            now = time.time()
+            idle = now - self.last_activity if self.last_activity else float("inf")
+            if idle < self.idle_after and self.online is not False:
+                return False
+            return now >= self._next_probe_at
+
+    def probe_started(self):
+        """Marks a probe as in flight so only one runs at a time."""
+        with self._lock:
+            self.probing = True
+
+    def probe_finished(self):
+        """Schedules the next probe: fixed interval when online, exponential backoff when offline."""
+        with self._lock:
+            self.probing = False
+            if self.online is False:
+                delay = self._probe_backoff
+                self._probe_backoff = min(self._probe_backoff * 2, self.offline_probe_max)
+            else:
+                delay = self.online_probe_interval
+            self._next_probe_at = time.time() + delay
+
+
+# Shared by every CoinGeckoAPI client in the process
+network_monitor = NetworkMonitor()
@@ -0,0 +1,73 @@
+# app/api/rate_budget.py
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+class RateBudget:
+    """Sliding one-minute request budget shared by every API client in the process.
+
+    Clients record each request; schedulers read `remaining_fraction()` to slow
+    down periodic work before the upstream rate limit is hit. A 429 response
+    exhausts the budget until the window rolls over.
+    """
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self._lock = threading.Lock()
+        self._stamps = deque()
+        self._blocked_until = 0.0
+
+    def _expire(self, now: float):
+        while self._stamps and now - self._stamps[0] >= 60:
+            self._stamps.popleft()
+
+    def record(self):
+        """Counts one request against the budget."""
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            self._stamps.append(now)
+
+    def acquire(self, cancelled: Optional[threading.Event] = None) -> bool:
+        """Waits for a free slot and counts it; returns False if `cancelled` is set first.
+
+        Used by bulk work (history exports) that must stay within the budget rather
+        than run into 429 responses.
+        """
+        while True:
+            with self._lock:
+                now = time.time()
+                if now >= self._blocked_until:
+                    self._expire(now)
+                    if len(self._stamps) < self.per_minute:
+                        self._stamps.append(now)
+                        return True
+                    wait = 60 - (now - self._stamps[0])
+                else:
+                    wait = self._blocked_until - now
+            wait = min(max(wait, 0.01), 1.0)  # re-check at least every second
+            if cancelled is not None:
+                if cancelled.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+    def exhaust(self, retry_after: float = 60.0):
+        """Marks the budget as used up (e.g. after a 429 Too Many Requests)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.time() + retry_after)
+
+    def remaining(self) -> int:
+        """Requests still available in the current one-minute window."""
+        with self._lock:
+            now = time.time()
+            if now < self._blocked_until:
+                return 0
+            self._expire(now)
+            return max(self.per_minute - len(self._stamps), 0)
+
+    def remaining_fraction(self) -> float:
+        """Share of the per-minute budget still available (0.0 - 1.0)."""
+        return self.remaining() / self.per_minute if self.per_minute else 1.0
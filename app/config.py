@@ -1,4 +1,5 @@
 # app/config.py
+import os
 from pathlib import Path
 
 # Base directory of the application
@@ -9,6 +10,15 @@ RESOURCES_DIR = BASE_DIR / "resources"
 STYLESHEET_PATH = RESOURCES_DIR / "styles.qss"
 IMAGES_DIR = RESOURCES_DIR / "images"
 
+# Local data directory (snapshot store, caches); override with BLUE_MOON_DATA_DIR
+DATA_DIR = Path(os.environ.get("BLUE_MOON_DATA_DIR", Path.home() / ".blue_moon"))
+SNAPSHOT_DB_PATH = DATA_DIR / "snapshots.db"
+HISTORY_DIR = DATA_DIR / "history"  # memory-mapped per-coin price history files
+WARM_START_PATH = DATA_DIR / "warm_start.json"  # last snapshot, rendered instantly on startup
+WARM_CHART_PATH = DATA_DIR / "warm_chart.json"  # last displayed chart series (kept apart: small, cheap to rewrite)
+PORTFOLIO_PATH = DATA_DIR / "portfolio.json"  # watchlist/holdings: coin id, quantity, cost basis
+ALERTS_PATH = DATA_DIR / "alerts.json"  # alert rules: a JSON list such as ["BTC < 60k", "top100 move > 10%"]
+
 # Icon paths
 LOGO_ICON = str(IMAGES_DIR / "logo.png")
 LIGHT_THEME_ICON = str(IMAGES_DIR / "light.png")
@@ -17,5 +27,69 @@ REFRESH_LIGHT_ICON = str(IMAGES_DIR / "refresh_light.png")
 REFRESH_DARK_ICON = str(IMAGES_DIR / "refresh_dark.png")
 
 # API Configuration
-API_BASE_URL = "https://api.coingecko.com/api/v3"
-API_TIMEOUT = 15
\ No newline at end of file
+UPSTREAM_API_URL = "https://api.coingecko.com/api/v3"
+# Set BLUE_MOON_API_BASE_URL=http://<host>:8765/api/v3 to use a shared local server (python -m app.server)
+API_BASE_URL = os.environ.get("BLUE_MOON_API_BASE_URL", UPSTREAM_API_URL)
+API_TIMEOUT = 15
+# CoinGecko public API budget shared by all clients; raise both when targeting a local stand-in
+API_RATE_LIMIT_PER_MINUTE = int(os.environ.get("BLUE_MOON_API_RATE_LIMIT", 30))
+API_MIN_REQUEST_INTERVAL = float(os.environ.get("BLUE_MOON_API_MIN_INTERVAL", 1.2))  # seconds between calls
+
+# Refresh scheduling (seconds). Intervals stretch when the window is hidden, on battery,
+# offline or low on rate budget; watchlist prices speed up while the market is volatile.
+REFRESH_INTERVALS = {
+    "markets": 120,  # full /coins/markets snapshot
+    "prices": 60,    # /simple/price for the watchlist
+    "chart": 300,    # revalidate the displayed chart
+}
+REFRESH_MIN_INTERVAL = 15
+REFRESH_MAX_INTERVAL = 30 * 60
+WATCHLIST = ["bitcoin", "ethereum"]
+VOLATILITY_THRESHOLD = 1.0  # % price range of a watchlist coin within the window below
+VOLATILITY_WINDOW = 300     # seconds of watchlist prices the volatility is measured over
+
+# Alerts: a fired rule re-arms once the value retreats past its threshold by this fraction,
+# and repeated crossings within the cooldown (seconds) are not notified again
+ALERT_HYSTERESIS = 0.01
+ALERT_COOLDOWN = 15 * 60
+
+# Quote currencies: data is fetched in BASE_CURRENCY and the others come from one batched
+# /simple/price call per refresh, so switching currency re-renders from memory
+BASE_CURRENCY = "usd"
+CURRENCIES = ["usd", "eur", "jpy", "btc"]
+
+# Live price source: "poll" (/simple/price on the scheduler) or "stream" (SSE from app.server)
+MARKET_SOURCE = os.environ.get("BLUE_MOON_MARKET_SOURCE", "poll")
+
+# Local fan-out server: one upstream poller shared by many dashboards
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_MARKETS_LIMIT = 250  # coins polled upstream (CoinGecko's maximum page size)
+
+# Offline record/replay stand-in for CoinGecko (python -m app.replay.server)
+REPLAY_PORT = 8766
+RECORD_DIR = os.environ.get("BLUE_MOON_RECORD_DIR")  # when set, every API response is recorded here
+
+# Continuous export: when BLUE_MOON_AUTO_EXPORT_DIR is set, every fetched snapshot is appended there
+AUTO_EXPORT_DIR = os.environ.get("BLUE_MOON_AUTO_EXPORT_DIR")
+AUTO_EXPORT_FORMAT = os.environ.get("BLUE_MOON_AUTO_EXPORT_FORMAT", "csv")  # "csv" or "jsonl"
+AUTO_EXPORT_ROTATE = os.environ.get("BLUE_MOON_AUTO_EXPORT_ROTATE", "day")  # "day" or "size"
+AUTO_EXPORT_MAX_BYTES = int(os.environ.get("BLUE_MOON_AUTO_EXPORT_MAX_MB", 64)) * 1024 * 1024
+AUTO_EXPORT_GZIP = os.environ.get("BLUE_MOON_AUTO_EXPORT_GZIP", "") not in ("", "0")
+AUTO_EXPORT_FSYNC_EVERY = 10  # snapshots between fsyncs (at most this many are lost on a crash)
+
+# Sparkline column: number of cached mini-chart pixmaps kept in memory
+SPARKLINE_CACHE_SIZE = 2048
+
+# Chart history cache (seconds before history/OHLC data is fetched again)
+HISTORY_CACHE_TTL = 120
+
+# Technical indicator overlays: name -> parameters
+# (SMA/EMA/RSI take a period, BB takes a period and a band width in standard deviations)
+INDICATOR_PARAMS = {
+    "SMA": (5,),
+    "EMA": (5,),
+    "BB": (5, 2.0),
+    "RSI": (5,),
+}
+INDICATOR_MEMO_SIZE = 32  # memoized (coin, range, indicator, params) series, least recently used evicted
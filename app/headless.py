@@ -0,0 +1,154 @@
+# app/headless.py
+"""
+Headless daemon mode: `python -m app.headless`.
+
+Runs the fetch -> format -> store pipeline of the GUI without importing PySide6,
+so it can poll CoinGecko on servers with no display. Each cycle's snapshot is
+recorded in the local store (as in the GUI) and optionally appended to CSV and
+JSON Lines files. Intervals come from the same RefreshPolicy as the GUI.
+"""
+import argparse
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .api.coin_gecko import CoinGeckoAPI
+from .logic.data_controller import DataController
+from .logic.refresh_policy import RefreshPolicy, VolatilityTracker
+from .storage.rolling_export import encode_snapshot
+
+
+class SnapshotWriter:
+    """Appends each snapshot to a CSV and/or JSON Lines file (one flush per cycle)."""
+
+    def __init__(self, csv_path: Optional[Path] = None, jsonl_path: Optional[Path] = None):
+        self.csv_path = Path(csv_path) if csv_path else None
+        self.jsonl_path = Path(jsonl_path) if jsonl_path else None
+
+    def write(self, coins: List[Dict], fetched_at: float):
+        if self.csv_path:
+            self._append(self.csv_path, "csv", coins, fetched_at)
+        if self.jsonl_path:
+            self._append(self.jsonl_path, "jsonl", coins, fetched_at)
+
+    def _append(self, path: Path, fmt: str, coins: List[Dict], fetched_at: float):
+        """Appends the snapshot in the same encoding as the rolling auto-export."""
+        new_file = not path.exists() or path.stat().st_size == 0
+        try:
+            with open(path, "a", newline="", encoding="utf-8") as f:
+                f.write(encode_snapshot(coins, fetched_at, fmt, header=new_file))
+        except OSError as e:
+            print(f"Error writing {fmt.upper()} snapshot: {e}")
+
+
+class HeadlessPoller:
+    """Thread-based stand-in for the GUI's RefreshScheduler.
+
+    Tasks run sequentially on the calling thread; between runs it sleeps on an Event
+    so `stop()` (e.g. from a signal handler) ends the loop immediately.
+    """
+
+    def __init__(self, api: CoinGeckoAPI, volatility: Optional[VolatilityTracker] = None,
+                 policy: Optional[RefreshPolicy] = None):
+        self.api = api
+        self.volatility = volatility
+        self.policy = policy or RefreshPolicy()
+        self._tasks: Dict[str, Callable[[], None]] = {}
+        self._due: Dict[str, float] = {}
+        self._stop = threading.Event()
+
+    def add_task(self, name: str, callback: Callable[[], None]):
+        """Registers a periodic task; it first runs as soon as the loop starts."""
+        self._tasks[name] = callback
+        self._due[name] = 0.0
+
+    def next_interval(self, name: str) -> Optional[float]:
+        return self.policy.next_interval(
+            name,
+            online=self.api.monitor.online,
+            budget_fraction=self.api.budget.remaining_fraction(),
+            volatile=bool(self.volatility and self.volatility.is_volatile),
+        )
+
+    def run(self, cycles: Optional[int] = None):
+        """Runs until stopped, or until the first task has completed `cycles` runs."""
+        runs = 0
+        while not self._stop.is_set() and self._tasks:
+            name = min(self._due, key=self._due.get)
+            delay = self._due[name] - time.monotonic()
+            if delay > 0 and self._stop.wait(delay):
+                break
+
+            self._tasks[name]()
+            interval = self.next_interval(name)
+            # A paused task (None) is re-checked at the policy's ceiling
+            self._due[name] = time.monotonic() + (interval if interval is not None else self.policy.max_interval)
+
+            if name == next(iter(self._tasks)):
+                runs += 1
+                if cycles is not None and runs >= cycles:
+                    break
+
+    def stop(self):
+        self._stop.set()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.headless",
+                                     description="Poll CoinGecko without a GUI and record snapshots.")
+    parser.add_argument("--limit", type=int, default=50, help="number of coins per snapshot (default: 50)")
+    parser.add_argument("--interval", type=float, help="base markets interval in seconds (default: from config)")
+    parser.add_argument("--csv", type=Path, help="append every snapshot to this CSV file")
+    parser.add_argument("--jsonl", type=Path, help="append every snapshot to this JSON Lines file")
+    parser.add_argument("--no-store", action="store_true", help="do not record snapshots in the local store")
+    parser.add_argument("--once", action="store_true", help="fetch a single snapshot and exit")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    # Only the snapshot pipeline: no warm-start files (they belong to the desktop app on a
+    # shared data dir), no portfolio or alert rules, and no extra /simple/price request
+    controller = DataController(warm_start=False, quotes=False, alerts=False, portfolio=False)
+    if args.no_store:
+        controller.store = None  # never opened: the store is only created on first use
+    writer = SnapshotWriter(args.csv, args.jsonl)
+
+    policy = RefreshPolicy()
+    if args.interval:
+        policy.intervals["markets"] = args.interval
+        policy.min_interval = min(policy.min_interval, args.interval)
+
+    failures = []
+
+    def fetch_markets():
+        coins = controller.fetch_top_coins(args.limit)
+        if coins is None:
+            failures.append(time.time())
+            print("Snapshot failed; will retry", file=sys.stderr)
+            return
+        writer.write(coins, time.time())
+        print(f"{time.strftime('%Y-%m-%d %H:%M:%S')}  recorded {len(coins)} coins", file=sys.stderr)
+
+    poller = HeadlessPoller(controller.api, controller.volatility, policy)
+    poller.add_task("markets", fetch_markets)
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: poller.stop())
+
+    try:
+        poller.run(cycles=1 if args.once else None)
+    finally:
+        if controller.store is not None:
+            controller.store.close()
+        controller.history_files.close()
+    # With --once the exit status tells cron/systemd whether the snapshot was taken
+    return 1 if args.once and failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
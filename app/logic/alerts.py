@@ -0,0 +1,262 @@
+# app/logic/alerts.py
+import json
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from ..config import ALERTS_PATH, ALERT_HYSTERESIS, ALERT_COOLDOWN
+
+
+class AlertRule(NamedTuple):
+    """One alert condition, e.g. "BTC < 60k", "ETH/BTC > 0.05" or "top100 move > 10%"."""
+    text: str
+    metric: str          # "price", "ratio" or "move" (absolute 24h change in %)
+    subject: str         # coin id or symbol, "a/b" for ratios, "" for moves (any coin)
+    direction: str       # "above" or "below"
+    threshold: float
+    top_n: int = 0       # moves: only coins ranked <= top_n
+
+
+class Alert(NamedTuple):
+    rule: AlertRule
+    subject: str         # coin (or ratio) the rule fired for
+    value: float
+    message: str
+    ts: float
+
+
+_NUMBER = r"(-?[\d_,]*\.?\d+)\s*([kKmMbB]?)"
+_MOVE_RULE = re.compile(r"^top\s*(\d+)\s+moves?\s*>\s*" + _NUMBER + r"\s*%?$", re.IGNORECASE)
+_RATIO_RULE = re.compile(r"^([\w-]+)\s*/\s*([\w-]+)\s*([<>])\s*" + _NUMBER + "$")
+_PRICE_RULE = re.compile(r"^([\w-]+)\s*([<>])\s*" + _NUMBER + "$")
+_SUFFIXES = {"": 1, "k": 1e3, "m": 1e6, "b": 1e9}
+
+
+def _number(digits: str, suffix: str) -> float:
+    return float(digits.replace(",", "").replace("_", "")) * _SUFFIXES[suffix.lower()]
+
+
+def parse_rule(text: str) -> AlertRule:
+    """Parses a rule written as "BTC < 60k", "ETH/BTC > 0.05" or "top100 move > 10%"."""
+    text = " ".join(text.split())
+    match = _MOVE_RULE.match(text)
+    if match:
+        return AlertRule(text, "move", "", "above", abs(_number(*match.group(2, 3))), int(match.group(1)))
+    match = _RATIO_RULE.match(text)
+    if match:
+        base, quote, op = match.group(1, 2, 3)
+        return AlertRule(text, "ratio", f"{base.lower()}/{quote.lower()}", "above" if op == ">" else "below",
+                         _number(*match.group(4, 5)))
+    match = _PRICE_RULE.match(text)
+    if match:
+        return AlertRule(text, "price", match.group(1).lower(), "above" if match.group(2) == ">" else "below",
+                         _number(*match.group(3, 4)))
+    raise ValueError(f"Unrecognized alert rule: {text!r}")
+
+
+def load_rules(path: Path = ALERTS_PATH) -> List[AlertRule]:
+    """Reads rules from a JSON list of rule strings; invalid entries are reported and skipped."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        print(f"Could not read alert rules from {path}: {e}")
+        return []
+    rules = []
+    for entry in entries if isinstance(entries, list) else []:
+        try:
+            rules.append(parse_rule(str(entry)))
+        except ValueError as e:
+            print(e)
+    return rules
+
+
+def _rearm_bound(key: float, hysteresis: float) -> float:
+    """Inverse of k -> k - |k| * hysteresis (increasing, so rearm ranges stay contiguous)."""
+    return key / (1 - hysteresis) if key >= 0 else key / (1 + hysteresis)
+
+
+class _ThresholdIndex:
+    """Rules of one (metric, subject, direction), sorted by threshold.
+
+    "below" rules are stored negated, so both directions become "value rises above key"
+    and the rules affected by a value change are one bisected slice of the array.
+    """
+
+    def __init__(self, direction: str):
+        self.sign = 1.0 if direction == "above" else -1.0
+        self.keys: List[float] = []
+        self.rules: List[AlertRule] = []
+
+    def add(self, rule: AlertRule):
+        key = self.sign * rule.threshold
+        position = bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.rules.insert(position, rule)
+
+    def remove(self, rule: AlertRule):
+        position = self.rules.index(rule)
+        del self.keys[position]
+        del self.rules[position]
+
+    def crossed(self, previous: Optional[float], value: float) -> List[AlertRule]:
+        """Rules whose condition became true: previous <= key < value (in signed space)."""
+        value *= self.sign
+        low = 0 if previous is None else bisect_left(self.keys, self.sign * previous)
+        return self.rules[low:bisect_left(self.keys, value)]
+
+    def rearmed(self, previous: Optional[float], value: float, hysteresis: float) -> List[AlertRule]:
+        """Rules the value moved back past by more than the hysteresis band."""
+        if previous is None:
+            return []
+        value, previous = self.sign * value, self.sign * previous
+        if value >= previous:
+            return []
+        return self.rules[bisect_right(self.keys, _rearm_bound(value, hysteresis)):
+                          bisect_right(self.keys, _rearm_bound(previous, hysteresis))]
+
+
+class AlertEngine:
+    """Evaluates alert rules against every snapshot (and partial price update).
+
+    Rules are indexed per (metric, subject, direction) in sorted threshold arrays, so an
+    update only touches the rules whose threshold lies between the previous and the new
+    value. A rule fires when its condition becomes true, then stays quiet until the value
+    retreats past the threshold by the hysteresis fraction; crossings within the cooldown
+    of its last notification are swallowed to avoid flapping.
+    """
+
+    def __init__(self, rules: Iterable[AlertRule] = (), hysteresis: float = ALERT_HYSTERESIS,
+                 cooldown: float = ALERT_COOLDOWN):
+        self.hysteresis = hysteresis
+        self.cooldown = cooldown
+        self.listener: Optional[Callable[[List[Alert]], None]] = None  # called with each batch of alerts
+        self._index: Dict[Tuple[str, str, str], _ThresholdIndex] = {}
+        self._ratios: Set[str] = set()
+        self._fresh: List[AlertRule] = []       # added since the last evaluation
+        self._values: Dict[Tuple[str, str], float] = {}
+        self._names: Dict[str, str] = {}        # coin id / symbol -> display name
+        self._ranks: Dict[str, int] = {}
+        self._changes: Dict[str, float] = {}    # coin id -> signed 24h change, for messages
+        self._symbol_owner: Dict[str, str] = {}  # symbol -> id of the highest-ranked coin using it
+        self._disarmed: Set[Tuple[AlertRule, str]] = set()
+        self._last_fired: Dict[Tuple[AlertRule, str], float] = {}
+        self._lock = threading.Lock()
+        for rule in rules:
+            self.add_rule(rule)
+
+    @property
+    def rules(self) -> List[AlertRule]:
+        with self._lock:
+            return [rule for index in self._index.values() for rule in index.rules]
+
+    def add_rule(self, rule: AlertRule):
+        with self._lock:
+            key = (rule.metric, rule.subject, rule.direction)
+            self._index.setdefault(key, _ThresholdIndex(rule.direction)).add(rule)
+            if rule.metric == "ratio":
+                self._ratios.add(rule.subject)
+            self._fresh.append(rule)
+
+    def remove_rule(self, rule: AlertRule):
+        with self._lock:
+            key = (rule.metric, rule.subject, rule.direction)
+            index = self._index.get(key)
+            if index is None or rule not in index.rules:
+                return
+            index.remove(rule)
+            if not index.rules:
+                del self._index[key]
+                if rule.metric == "ratio" and not any(k[0] == "ratio" and k[1] == rule.subject for k in self._index):
+                    self._ratios.discard(rule.subject)
+            self._disarmed = {state for state in self._disarmed if state[0] != rule}
+            if rule in self._fresh:
+                self._fresh.remove(rule)
+
+    def evaluate(self, coins: List[Dict], complete: bool = True, now: Optional[float] = None) -> List[Alert]:
+        """Checks the rules against `coins`; `complete` is False for partial (tick) updates."""
+        if not self._index:
+            return []
+        now = time.time() if now is None else now
+        fired: List[Alert] = []
+        with self._lock:
+            if complete:
+                self._symbol_owner = {}
+                for coin in sorted(coins, key=lambda c: c.get("rank") or float("inf")):
+                    self._symbol_owner.setdefault(str(coin.get("symbol", "")).lower(), coin.get("id"))
+            for coin in coins:
+                self._observe_coin(coin, now, fired)
+            for ratio in self._ratios:
+                base, quote = (self._values.get(("price", part)) for part in ratio.split("/"))
+                if base is not None and quote:
+                    self._observe(("ratio", ratio), ratio, base / quote, now, fired)
+            self._check_fresh(now, fired)
+        if fired and self.listener:
+            self.listener(fired)
+        return fired
+
+    # ----- Evaluation -----
+    def _observe_coin(self, coin: Dict, now: float, fired: List[Alert]):
+        coin_id = coin.get("id")
+        price, change = coin.get("price"), coin.get("change_24h")
+        symbol = str(coin.get("symbol", "")).lower()
+        subjects = [coin_id] + ([symbol] if self._symbol_owner.get(symbol) == coin_id else [])
+        self._ranks[coin_id] = coin.get("rank") or 0
+        for subject in subjects:
+            self._names[subject] = coin.get("name") or subject
+            if isinstance(price, (int, float)):
+                self._observe(("price", subject), subject, price, now, fired)
+        if isinstance(change, (int, float)):
+            self._changes[coin_id] = change
+            self._observe(("move", coin_id), coin_id, abs(change), now, fired, index_subject="")
+
+    def _observe(self, key: Tuple[str, str], subject: str, value: float, now: float,
+                 fired: List[Alert], index_subject: Optional[str] = None):
+        previous = self._values.get(key)
+        self._values[key] = value
+        index_subject = subject if index_subject is None else index_subject
+        for direction in ("above", "below"):
+            index = self._index.get((key[0], index_subject, direction))
+            if index is None:
+                continue
+            for rule in index.rearmed(previous, value, self.hysteresis):
+                self._disarmed.discard((rule, subject))
+            for rule in index.crossed(previous, value):
+                self._fire(rule, subject, value, now, fired)
+
+    def _check_fresh(self, now: float, fired: List[Alert]):
+        """Rules added since the last evaluation fire if their condition already holds."""
+        if not self._fresh or not self._values:
+            return
+        for rule in self._fresh:
+            sign = 1.0 if rule.direction == "above" else -1.0
+            for (metric, subject), value in list(self._values.items()):
+                if metric != rule.metric or (rule.subject and subject != rule.subject):
+                    continue
+                if sign * value > sign * rule.threshold:
+                    self._fire(rule, subject, value, now, fired)
+        self._fresh = []
+
+    def _fire(self, rule: AlertRule, subject: str, value: float, now: float, fired: List[Alert]):
+        state = (rule, subject)
+        if state in self._disarmed:
+            return
+        if rule.metric == "move" and rule.top_n and not 0 < self._ranks.get(subject, 0) <= rule.top_n:
+            return
+        self._disarmed.add(state)
+        if now - self._last_fired.get(state, float("-inf")) < self.cooldown:
+            return  # debounced: the crossing is absorbed without a notification
+        self._last_fired[state] = now
+        fired.append(Alert(rule, subject, value, self._message(rule, subject, value), now))
+
+    def _message(self, rule: AlertRule, subject: str, value: float) -> str:
+        if rule.metric == "move":
+            change = self._changes.get(subject, value)
+            return f"{self._names.get(subject, subject)} moved {change:+.1f}% in 24h ({rule.text})"
+        if rule.metric == "ratio":
+            return f"{subject.upper()} is {value:.6g} ({rule.text})"
+        return f"{self._names.get(subject, subject)} is at {value:,.6g} ({rule.text})"
@@ -0,0 +1,41 @@
+# app/logic/candles.py
+import numpy as np
+
+# Candle array columns: timestamp (ms), open, high, low, close
+TS, OPEN, HIGH, LOW, CLOSE = range(5)
+
+HOUR_MS = 60 * 60 * 1000
+DAY_MS = 24 * HOUR_MS
+
+
+def to_candle_array(raw_ohlc) -> np.ndarray:
+    """Converts raw [[ts, o, h, l, c], ...] rows into a (n, 5) float64 array sorted by time."""
+    candles = np.asarray(raw_ohlc or [], dtype=np.float64)
+    if candles.ndim != 2 or candles.shape[1] != 5:
+        return np.empty((0, 5), dtype=np.float64)
+    return candles[np.argsort(candles[:, TS], kind="stable")]
+
+
+def aggregate_candles(candles: np.ndarray, bucket_ms: int) -> np.ndarray:
+    """Aggregates fine candles into coarser ones (e.g. 4h -> 1d) in a single vectorized pass.
+
+    CoinGecko stamps each candle with its *close* time, so a 4h candle closing exactly
+    at midnight belongs to the previous day; we shift by 1 ms before bucketing.
+    The resulting candles are stamped with the start of their bucket.
+    """
+    if len(candles) == 0:
+        return np.empty((0, 5), dtype=np.float64)
+
+    buckets = ((candles[:, TS] - 1) // bucket_ms).astype(np.int64)
+
+    # Index of the first candle of every bucket (input is sorted by time)
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    ends = np.concatenate((starts[1:], [len(candles)])) - 1
+
+    aggregated = np.empty((len(starts), 5), dtype=np.float64)
+    aggregated[:, TS] = buckets[starts] * bucket_ms
+    aggregated[:, OPEN] = candles[starts, OPEN]
+    aggregated[:, HIGH] = np.maximum.reduceat(candles[:, HIGH], starts)
+    aggregated[:, LOW] = np.minimum.reduceat(candles[:, LOW], starts)
+    aggregated[:, CLOSE] = candles[ends, CLOSE]
+    return aggregated
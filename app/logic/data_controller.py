@@ -1,28 +1,442 @@
 # app/logic/data_controller.py
-from typing import List, Dict, Optional
+import threading
+import time
+import datetime
+import statistics
+from typing import List, Dict, Optional, Any, Tuple, Iterable, NamedTuple, Set
 from ..api.coin_gecko import CoinGeckoAPI
-from ..utils.formatting import DataFormatter
+from ..utils.formatting import DataFormatter, TimestampLabels
+from ..config import HISTORY_CACHE_TTL, INDICATOR_PARAMS, HISTORY_DIR, AUTO_EXPORT_DIR, BASE_CURRENCY, CURRENCIES
+from .refresh_policy import VolatilityTracker
+from .alerts import AlertEngine, load_rules
+from .portfolio import Portfolio
+from ..storage.warm_start import WarmStartCache
+from ..utils.tracing import tracer
+
+# The snapshot store (sqlite3), history files, candles and indicators are imported
+# when first used, so creating the controller at startup stays cheap. numpy itself
+# stays on the startup path: the formatter and the table's sparklines need it.
+
+class Snapshot(NamedTuple):
+    """A fetched and formatted market snapshot, built off the GUI thread and applied on it."""
+    coins: Optional[List[Dict]]          # top N plus holdings; None if the top-N request failed
+    holdings: List[Dict]                 # holdings outside the previous top N
+    top_ids: Set[str]
+    quotes: Optional[Dict[str, Dict[str, Dict]]]  # None: keep the previous quotes
+    fx_rates: Optional[Dict[str, float]]
+
 
 class DataController:
     """Orchestrates data flow between the API, data formatting, and UI."""
-    
-    def __init__(self):
+
+    def __init__(self, warm_start: bool = True, quotes: bool = True, alerts: bool = True,
+                 portfolio: bool = True):
+        # The flags switch off parts only the GUI needs (headless mode runs without them):
+        # the persisted warm start, other-currency quotes, alert rules and the saved portfolio
         self.api = CoinGeckoAPI()
         self.formatter = DataFormatter()
         self.current_data: List[Dict] = []
-    
+        self._index: Dict[str, Dict] = {}  # coin id -> coin of current_data, for tick updates
+        self._index_source: Optional[List[Dict]] = None
+        # Bumped on every successful snapshot; keys derived render caches (e.g. sparklines)
+        self.data_version = 0
+        # Chart data cache: key -> (fetched_at, value). Holds the line history
+        # as well as raw and aggregated OHLC candles.
+        self.history_cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self._indicators = None
+        self.volatility = VolatilityTracker()
+        # Rules from ALERTS_PATH; the UI sets alerts.listener
+        self.alerts = AlertEngine(load_rules() if alerts else ())
+        self.portfolio = Portfolio() if portfolio else Portfolio(path=None)
+        self._top_ids = set()  # ids of the latest top-N list (holdings outside it are fetched separately)
+
+        # Local time-series store (every snapshot is appended so intraday charts build up
+        # locally) and per-coin binary history files; both are opened on first use
+        self._store = None
+        self._store_opened = False
+        self._history_files = None
+        self._open_lock = threading.Lock()  # first use may come from several worker threads
+
+        # Last good snapshot + chart, persisted after each fetch for an instant warm start
+        self.warm_start = WarmStartCache() if warm_start else None
+        self.warm_state = self.warm_start.load() if self.warm_start else {}
+
+        # Quotes in the other currencies (currency -> coin id -> quote) and converted
+        # snapshots built from them, cached until the snapshot or the quotes change
+        self.currency = self.warm_state.get("currency") if self.warm_state.get("currency") in CURRENCIES else BASE_CURRENCY
+        self.quotes: Dict[str, Dict[str, Dict]] = self.warm_state.get("quotes") or {}
+        self.fx_rates = self._fx_rates(self.warm_state.get("coins") or [], self.quotes)
+        self._quotes_enabled = quotes
+        self._views: Dict[str, Tuple] = {}  # currency -> (source snapshot, quotes, coins, coins by id)
+
+        # Optional continuous export of every snapshot to rotating files
+        self.auto_export = None
+        if AUTO_EXPORT_DIR:
+            from ..storage.rolling_export import RollingExportSink
+            try:
+                self.auto_export = RollingExportSink(AUTO_EXPORT_DIR)
+            except (OSError, ValueError) as e:
+                print(f"Auto-export disabled: {e}")
+
+    @property
+    def store(self):
+        """The local SnapshotStore, opened on first use (None if it is unavailable or disabled)."""
+        with self._open_lock:
+            if not self._store_opened:
+                self._store_opened = True
+                import sqlite3
+                from ..storage.snapshot_store import SnapshotStore
+                try:
+                    self._store = SnapshotStore()
+                except (sqlite3.Error, OSError) as e:
+                    print(f"Snapshot store unavailable: {e}")
+            return self._store
+
+    @store.setter
+    def store(self, store):
+        with self._open_lock:
+            self._store_opened = True
+            self._store = store
+
+    @property
+    def history_files(self):
+        """The HistoryStore of per-coin files, read back as zero-copy memory-mapped slices."""
+        with self._open_lock:
+            if self._history_files is None:
+                from ..storage.history_file import HistoryStore
+                self._history_files = HistoryStore(HISTORY_DIR)
+            return self._history_files
+
+    @property
+    def indicators(self):
+        """The memoizing IndicatorEngine, created when the first overlay is requested."""
+        if self._indicators is None:
+            from .indicators import IndicatorEngine
+            self._indicators = IndicatorEngine()
+        return self._indicators
+
     def fetch_top_coins(self, limit: int = 50) -> Optional[List[Dict]]:
-        """Fetches and formats top coins data from the API."""
-        raw_data = self.api.get_top_coins(limit)
-        if raw_data:
-            self.current_data = self.formatter.format_coin_data(raw_data)
+        """Fetches, formats and applies top coins data (for callers without a GUI thread)."""
+        return self.apply_snapshot(self.fetch_snapshot(limit))
+
+    def fetch_snapshot(self, limit: int = 50) -> Snapshot:
+        """Fetches, formats and persists a snapshot without touching the shared state.
+
+        Runs on a worker thread; the GUI thread publishes the result with `apply_snapshot`,
+        so price ticks never race with a refresh.
+        """
+        with tracer.refresh("controller.fetch_top_coins", "controller", limit=limit):
+            # Holdings go first, so they stay current even if the larger request is throttled
+            holdings = self._fetch_holdings()
+            raw_data = self.api.get_top_coins(limit, sparkline=True)
+            if not raw_data:
+                return Snapshot(None, holdings, self._top_ids, None, None)
+            with tracer.span("controller.format", "controller", coins=len(raw_data)):
+                coins = self.formatter.format_coin_data(raw_data)
+                top_ids = {coin["id"] for coin in coins}
+                coins += [coin for coin in holdings if coin["id"] not in top_ids]
+            with tracer.span("controller.quotes", "controller"):
+                quotes, fx_rates = self._fetch_quotes(coins)
+            with tracer.span("controller.persist", "controller"):
+                self._record_snapshot(coins)
+                if self.warm_start:
+                    self.warm_start.save_snapshot(coins, quotes=quotes)
+                if self.auto_export:
+                    self.auto_export.append(coins)
+            return Snapshot(coins, holdings, top_ids, quotes, fx_rates)
+
+    def apply_snapshot(self, snapshot: Optional[Snapshot]) -> Optional[List[Dict]]:
+        """Publishes a fetched snapshot (on the GUI thread); returns the new data, or None."""
+        if snapshot is None:
+            return None
+        if snapshot.coins is None:
+            self.portfolio.update_prices(snapshot.holdings)
+            return None
+        self.current_data = snapshot.coins
+        self._top_ids = snapshot.top_ids
+        self.data_version += 1
+        if snapshot.quotes is not None:
+            self.quotes, self.fx_rates = snapshot.quotes, snapshot.fx_rates
+        self.portfolio.update_prices(self.current_data)
+        self.volatility.observe(self.current_data)
+        with tracer.span("controller.alerts", "controller"):
+            self.alerts.evaluate(self.current_data)
+        return self.current_data
+
+    def _fetch_quotes(self, coins: List[Dict]) -> Tuple[Optional[Dict], Optional[Dict[str, float]]]:
+        """Quotes every coin in all non-base currencies with a single /simple/price call.
+
+        Returns (quotes, exchange rates), or (None, None) to keep the previous quotes.
+        """
+        currencies = [currency for currency in CURRENCIES if currency != BASE_CURRENCY]
+        if not self._quotes_enabled or not currencies or not coins:
+            return None, None
+        raw_quotes = self.api.get_simple_prices([coin["id"] for coin in coins], currencies)
+        if not raw_quotes:
+            return None, None  # conversions fall back to the previous exchange rates
+        quotes = self.formatter.format_quotes(raw_quotes, currencies)
+        return quotes, self._fx_rates(coins, quotes)
+
+    @staticmethod
+    def _fx_rates(coins: List[Dict], quotes: Dict[str, Dict[str, Dict]]) -> Dict[str, float]:
+        """Units of each currency per base unit (the median quote/base price ratio over all coins)."""
+        rates = {}
+        for currency, by_id in quotes.items():
+            ratios = [by_id[coin["id"]]["price"] / coin["price"] for coin in coins
+                      if coin["id"] in by_id and coin.get("price")]
+            if ratios:
+                rates[currency] = float(statistics.median(ratios))
+        return rates
+
+    def snapshot(self, currency: Optional[str] = None) -> Optional[List[Dict]]:
+        """The current snapshot in `currency` (None if there are no quotes for it yet).
+
+        Converted copies keep the base price as "base_price" and are cached, so switching
+        back and forth re-renders from memory.
+        """
+        currency = currency or self.currency
+        if currency == BASE_CURRENCY:
             return self.current_data
+        cached = self._views.get(currency)
+        if cached and cached[0] is self.current_data and cached[1] is self.quotes:
+            return cached[2]
+        rate = self.fx_rates.get(currency)
+        if rate is None:
+            return None
+        quotes = self.quotes.get(currency, {})
+        coins = [self._convert(coin, quotes.get(coin["id"]), rate) for coin in self.current_data]
+        self._views[currency] = (self.current_data, self.quotes, coins, {coin["id"]: coin for coin in coins})
+        return coins
+
+    @staticmethod
+    def _convert(coin: Dict, quote: Optional[Dict], rate: float) -> Dict:
+        base_price = coin.get("price") or 0
+        quote = quote or {}
+        price = quote.get("price")
+        market_cap = quote.get("market_cap")
+        change = quote.get("change_24h")
+        return dict(
+            coin,  # the sparkline is shared: it is drawn normalized, so the scale does not matter
+            price=price if price is not None else base_price * rate,
+            market_cap=market_cap if market_cap is not None else (coin.get("market_cap") or 0) * rate,
+            change_24h=change if change is not None else coin.get("change_24h"),
+            base_price=base_price,
+        )
+
+    def display_snapshot(self):
+        """(currency, coins) to show: the selected currency, or the base one until it is quoted."""
+        coins = self.snapshot(self.currency)
+        if coins is None:
+            return BASE_CURRENCY, self.current_data
+        return self.currency, coins
+
+    def set_currency(self, currency: str) -> Optional[List[Dict]]:
+        """Selects the display currency; returns its snapshot from memory (None if not quoted yet)."""
+        self.currency = currency
+        if self.warm_start:
+            self.warm_start.save_currency(currency)
+        return self.snapshot(currency)
+
+    def to_display(self, coins: List[Dict]) -> List[Dict]:
+        """Applies base-currency updates (price ticks) to the displayed converted coins in place.
+
+        Prices and market caps keep the coin's last quoted conversion factor; the 24h change
+        stays as quoted until the next snapshot.
+        """
+        if self.currency == BASE_CURRENCY:
+            return coins
+        cached = self._views.get(self.currency)
+        if not cached or cached[0] is not self.current_data:
+            return []
+        by_id = cached[3]
+        updated = []
+        for coin in coins:
+            converted = by_id.get(coin["id"])
+            if converted is None or not converted["base_price"]:
+                continue
+            factor = converted["price"] / converted["base_price"]
+            converted.update(price=coin["price"] * factor, market_cap=(coin.get("market_cap") or 0) * factor,
+                             base_price=coin["price"])
+            updated.append(converted)
+        return updated
+
+    def _fetch_holdings(self) -> List[Dict]:
+        """Formatted market data of portfolio coins that were not in the previous top-N list."""
+        missing = [coin_id for coin_id in self.portfolio.coin_ids if coin_id not in self._top_ids]
+        if not missing:
+            return []
+        raw_data = self.api.get_coins_by_ids(missing, sparkline=True)
+        return self.formatter.format_coin_data(raw_data) if raw_data else []
+
+    def get_coin_history(self, coin_id, days: int = 7, wait_for_budget: bool = False,
+                         cancelled: Optional[threading.Event] = None):
+        """Fetches and formats 7-day historical data for a specific coin.
+
+        Fetched points are merged into the coin's history file and the chart reads the
+        requested window of it; when the API is unreachable the stored history is used.
+        """
+        key = ("history", coin_id, days)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        raw_data = self.api.fetch_coin_history(coin_id, days=days, currency="usd",
+                                               wait_for_budget=wait_for_budget, cancelled=cancelled)
+        try:
+            history_file = self.history_files.get(coin_id)
+            if raw_data:
+                history_file.merge(self.formatter.history_to_records(raw_data))
+            records = history_file.records()
+        except (OSError, ValueError) as e:
+            print(f"History file error for {coin_id}: {e}")
+            if not raw_data:
+                return None
+            return self._cache_put(key, self.formatter.format_coin_history(raw_data))
+
+        if len(records) == 0:
+            return None
+        import numpy as np
+        from .candles import DAY_MS
+
+        # Last `days` days up to the newest stored point (so offline charts still render).
+        # Copied out of the memory map: later merges rewrite the file's tail in place, and
+        # the cached, displayed and exported series must not change underneath their users.
+        window = np.array(history_file.read(start_ms=records[-1, 0] - days * DAY_MS))
+        return self._cache_put(key, self.formatter.format_history_records(window))
+
+    def get_history_array(self, coin_id: str, days: int = 7, cancelled: Optional[threading.Event] = None):
+        """The coin's price history as an (n, 2) array of [timestamp ms, price] (None if unavailable).
+
+        Used by bulk history exports, which call it from several worker threads; each
+        fetch waits for room in the rate budget instead of running into 429 responses.
+        """
+        history = self.get_coin_history(coin_id, days=days, wait_for_budget=True, cancelled=cancelled)
+        timestamps = getattr(history["timestamps"], "timestamps_ms", None) if history else None
+        if timestamps is None:
+            return None
+        import numpy as np
+        return np.column_stack((timestamps, history["prices"]))
+
+    def apply_ticks(self, ticks: Iterable) -> List[Dict]:
+        """Applies price ticks (from a MarketDataSource) to the current snapshot in place.
+
+        Returns the coins whose fields actually changed, so views can update just those rows.
+        """
+        if self._index_source is not self.current_data:
+            self._index = {coin["id"]: coin for coin in self.current_data}
+            self._index_source = self.current_data
+
+        updated = []
+        for tick in ticks:
+            coin = self._index.get(tick.coin_id)
+            if coin is None:
+                continue
+            fields = tick.fields()
+            if any(coin.get(key) != value for key, value in fields.items()):
+                coin.update(fields)
+                updated.append(coin)
+        if updated:
+            self.volatility.observe(updated)
+            self.alerts.evaluate(updated, complete=False)
+            self.portfolio.update_prices(updated)
+        return updated
+
+    def load_warm_snapshot(self) -> Optional[List[Dict]]:
+        """Returns the snapshot persisted by the previous session (stale, but instant)."""
+        coins = self.warm_state.get("coins")
+        if not coins:
+            return None
+        if not self.current_data:
+            self.current_data = coins
+        return coins
+
+    def warm_chart(self) -> Optional[Dict[str, Any]]:
+        """The chart persisted by the previous session: {"coin", "timestamps", "prices"} (or None)."""
+        chart = self.warm_state.get("chart") or {}
+        coin, prices = chart.get("coin") or {}, chart.get("prices")
+        timestamps = chart.get("timestamps")
+        if "timestamps_ms" in chart:
+            timestamps = TimestampLabels(chart["timestamps_ms"])
+        if not coin.get("id") or not prices or timestamps is None or len(timestamps) != len(prices):
+            return None
+        return {"coin": coin, "timestamps": timestamps, "prices": prices}
+
+    def save_chart_state(self, coin: Dict, history: Dict[str, Any]):
+        """Persists a chart series so the next startup can show it immediately (blocks on disk I/O)."""
+        if self.warm_start:
+            self.warm_start.save_chart(coin, history["timestamps"], history["prices"])
+
+    def get_local_history(self, coin_id: str, since: Optional[datetime.datetime] = None) -> Optional[Dict[str, List]]:
+        """Returns the locally recorded price series for a coin (default: since local midnight)."""
+        store = self.store
+        if store is None:
+            return None
+        if since is None:
+            since = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        import sqlite3
+        try:
+            rows = store.get_price_series(coin_id, start_ts=since.timestamp())
+        except sqlite3.Error as e:
+            print(f"Snapshot store error reading {coin_id}: {e}")
+            return None
+        if len(rows) < 2:
+            return None
+        return self.formatter.format_local_history(rows)
+
+    def get_coin_ohlc(self, coin_id: str, days: int = 7, bucket_ms: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Fetches OHLC candles for a coin and aggregates them into `bucket_ms` wide candles (default: daily)."""
+        from .candles import to_candle_array, aggregate_candles, DAY_MS
+        bucket_ms = bucket_ms or DAY_MS
+        key = ("ohlc", coin_id, days, bucket_ms)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        # Raw candles are cached separately so other bucket sizes reuse one download
+        raw_key = ("ohlc_raw", coin_id, days)
+        candles = self._cache_get(raw_key)
+        if candles is None:
+            raw_data = self.api.fetch_coin_ohlc(coin_id, days=days, currency="usd")
+            candles = to_candle_array(raw_data)
+            if len(candles) == 0:
+                return None
+            self._cache_put(raw_key, candles)
+
+        aggregated = aggregate_candles(candles, bucket_ms)
+        return self._cache_put(key, self.formatter.format_coin_ohlc(aggregated))
+
+    def get_indicators(self, coin_id: str, history: Dict[str, Any], names: Iterable[str],
+                       range_key: str = "7d") -> Dict[str, Any]:
+        """Computes (memoized) indicator overlays for a formatted history series."""
+        # Millisecond timestamps let a re-fetched (slid) window reuse the previous results
+        timestamps = getattr(history["timestamps"], "timestamps_ms", None)
+        return {
+            name: self.indicators.compute(coin_id, range_key, name, INDICATOR_PARAMS[name], history["prices"],
+                                          timestamps=timestamps)
+            for name in names
+            if name in INDICATOR_PARAMS
+        }
+
+    def _record_snapshot(self, coins: List[Dict]):
+        """Appends a snapshot to the local store; storage errors never break a refresh."""
+        store = self.store
+        if store is None:
+            return
+        import sqlite3
+        try:
+            store.append_snapshot(coins)
+        except sqlite3.Error as e:
+            print(f"Snapshot store error: {e}")
+
+    def _cache_get(self, key: Tuple) -> Optional[Any]:
+        """Returns a cached chart value if it is still fresh."""
+        entry = self.history_cache.get(key)
+        if entry and time.time() - entry[0] < HISTORY_CACHE_TTL:
+            return entry[1]
         return None
-    
-    def get_coin_history(self, coin_id):
-        """Fetches and formats 7-day historical data for a specific coin."""
-        raw_data = self.api.fetch_coin_history(coin_id, days=7, currency="usd")
-        if not raw_data:
-            return None
-        
-        return self.formatter.format_coin_history(raw_data)
\ No newline at end of file
+
+    def _cache_put(self, key: Tuple, value: Any) -> Any:
+        """Stores a chart value in the cache and returns it."""
+        self.history_cache[key] = (time.time(), value)
+        return value
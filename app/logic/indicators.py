@@ -0,0 +1,255 @@
+# app/logic/indicators.py
+from collections import OrderedDict
+from typing import Tuple, Any, NamedTuple, Optional
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from ..config import INDICATOR_MEMO_SIZE
+
+
+# ----- Vectorized indicators (full series) -----
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average; the first `period - 1` entries are NaN."""
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        csum = np.cumsum(np.concatenate(([0.0], values)))
+        out[period - 1:] = (csum[period:] - csum[:-period]) / period
+    return out
+
+
+def rolling_std(values: np.ndarray, period: int) -> np.ndarray:
+    """Population standard deviation over a sliding window; leading entries are NaN."""
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        out[period - 1:] = sliding_window_view(values, period).std(axis=1)
+    return out
+
+
+def bollinger(values: np.ndarray, period: int, width: float) -> np.ndarray:
+    """Bollinger bands as a (n, 3) array of middle, upper and lower band."""
+    mid = sma(values, period)
+    std = rolling_std(values, period)
+    return np.column_stack((mid, mid + width * std, mid - width * std))
+
+
+# ----- Incremental indicator implementations -----
+class _Indicator:
+    """Base class: computes an indicator over a full series or extends a previous result.
+
+    `compute` returns (result, state); `extend` receives the full, longer series plus the
+    previous state and returns only the result rows for the new points.
+    """
+
+    def __init__(self, *params):
+        self.params = params
+
+    def compute(self, values: np.ndarray) -> Tuple[np.ndarray, Any]:
+        raise NotImplementedError
+
+    def extend(self, values: np.ndarray, old_length: int, state: Any) -> Tuple[np.ndarray, Any]:
+        raise NotImplementedError
+
+
+class SMA(_Indicator):
+    def compute(self, values):
+        return sma(values, self.params[0]), None
+
+    def extend(self, values, old_length, state):
+        # Only the last `period - 1` old points are needed to seed the new windows
+        period = self.params[0]
+        start = max(old_length - period + 1, 0)
+        return sma(values[start:], period)[old_length - start:], None
+
+
+class Bollinger(_Indicator):
+    def compute(self, values):
+        return bollinger(values, *self.params), None
+
+    def extend(self, values, old_length, state):
+        period = self.params[0]
+        start = max(old_length - period + 1, 0)
+        return bollinger(values[start:], *self.params)[old_length - start:], None
+
+
+class EMA(_Indicator):
+    """Exponential moving average seeded with the SMA of the first `period` points."""
+
+    def compute(self, values):
+        period = self.params[0]
+        out = np.full(len(values), np.nan)
+        if len(values) < period:
+            return out, None
+        out[period - 1] = values[:period].mean()
+        tail, last = self._run(values[period:], out[period - 1])
+        out[period:] = tail
+        return out, last
+
+    def extend(self, values, old_length, state):
+        if state is None:
+            # The previous series was shorter than the seed window
+            result, state = self.compute(values)
+            return result[old_length:], state
+        return self._run(values[old_length:], state)
+
+    def _run(self, values, last):
+        alpha = 2.0 / (self.params[0] + 1)
+        out = np.empty(len(values))
+        for i, value in enumerate(values):
+            last = last + alpha * (value - last)
+            out[i] = last
+        return out, last
+
+
+class RSI(_Indicator):
+    """Relative Strength Index with Wilder smoothing."""
+
+    def compute(self, values):
+        period = self.params[0]
+        out = np.full(len(values), np.nan)
+        if len(values) <= period:
+            return out, None
+        deltas = np.diff(values[:period + 1])
+        avg_gain = np.clip(deltas, 0, None).mean()
+        avg_loss = -np.clip(deltas, None, 0).mean()
+        out[period] = self._rsi(avg_gain, avg_loss)
+        tail, state = self._run(values[period:], (values[period], avg_gain, avg_loss))
+        out[period + 1:] = tail
+        return out, state
+
+    def extend(self, values, old_length, state):
+        if state is None:
+            result, state = self.compute(values)
+            return result[old_length:], state
+        return self._run(values[old_length - 1:], state)
+
+    def _run(self, values, state):
+        # `values[0]` is the last point already accounted for in `state`
+        period = self.params[0]
+        _, avg_gain, avg_loss = state
+        deltas = np.diff(values)
+        out = np.empty(len(deltas))
+        for i, delta in enumerate(deltas):
+            avg_gain = (avg_gain * (period - 1) + max(delta, 0.0)) / period
+            avg_loss = (avg_loss * (period - 1) + max(-delta, 0.0)) / period
+            out[i] = self._rsi(avg_gain, avg_loss)
+        return out, (values[-1], avg_gain, avg_loss)
+
+    @staticmethod
+    def _rsi(avg_gain: float, avg_loss: float) -> float:
+        if avg_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+INDICATOR_TYPES = {
+    "SMA": SMA,
+    "EMA": EMA,
+    "BB": Bollinger,
+    "RSI": RSI,
+}
+
+
+REVISABLE_TAIL = 2  # newest points a later fetch may still revise (the last one is provisional)
+
+
+class _Memo(NamedTuple):
+    timestamps: np.ndarray
+    values: np.ndarray
+    result: np.ndarray
+    checkpoint: int    # number of leading points `state` has consumed
+    state: Any
+
+
+def _advance(indicator: _Indicator, values: np.ndarray, start: int, state: Any) -> Tuple[np.ndarray, Any]:
+    """Result rows for values[start:] given the state after values[:start] (start 0: from scratch)."""
+    if start == 0:
+        return indicator.compute(values)
+    if start >= len(values):
+        return indicator.compute(values[:0])[0], state  # no new points: an empty result
+    return indicator.extend(values, start, state)
+
+
+class IndicatorEngine:
+    """Computes indicators over history series with memoization and incremental updates.
+
+    Results are memoized per (coin, range, indicator, params) and aligned on the series'
+    absolute timestamps, because a chart is a sliding window: every fetch drops points
+    from the front, revises the provisional last point and appends new ones. Only the
+    revised and new points are computed, resuming from the indicator state saved just
+    before the revisable tail; every point keeps the value computed over all points seen
+    before it. The memo holds copies of its inputs and keeps the `max_entries` most
+    recently used series.
+    """
+
+    def __init__(self, max_entries: int = INDICATOR_MEMO_SIZE):
+        self.max_entries = max_entries
+        self._memo: "OrderedDict[Tuple, _Memo]" = OrderedDict()
+
+    def compute(self, coin_id: str, range_key: str, name: str, params: Tuple, values,
+                timestamps=None) -> Optional[np.ndarray]:
+        """Returns the indicator `name` with `params` for the given price series.
+
+        `timestamps` (e.g. milliseconds) identify the points; without them, points are
+        matched by position, so only extending or revising the end is incremental.
+        """
+        indicator_type = INDICATOR_TYPES.get(name)
+        if indicator_type is None:
+            return None
+
+        values = np.asarray(values, dtype=np.float64)
+        timestamps = (np.arange(len(values), dtype=np.float64) if timestamps is None
+                      else np.asarray(timestamps, dtype=np.float64))
+        key = (coin_id, range_key, name, tuple(params))
+        indicator = indicator_type(*params)
+        memo = self._memo.get(key)
+        alignment = self._align(memo, timestamps, values) if memo is not None else None
+
+        if alignment is None:
+            offset, series, resume, state, head = 0, values, 0, None, None
+        else:
+            offset, unchanged = alignment
+            if offset == 0 and unchanged == len(values) == len(memo.values):
+                self._memo.move_to_end(key)
+                return memo.result
+            # The memoized points before the new window still seed it
+            series = np.concatenate((memo.values[:offset], values))
+            if memo.checkpoint <= unchanged:
+                resume, state, head = memo.checkpoint, memo.state, memo.result[:memo.checkpoint]
+            else:
+                resume, state, head = 0, None, None
+
+        checkpoint = max(len(series) - REVISABLE_TAIL, resume)
+        middle, state = _advance(indicator, series[:checkpoint], resume, state)
+        checkpoint_state = state
+        tail, _ = _advance(indicator, series, checkpoint, state)
+        parts = (middle, tail) if head is None else (head, middle, tail)
+        result = np.concatenate(parts)[offset:]
+
+        if checkpoint < offset:  # the whole saved state lies before the new window
+            checkpoint, checkpoint_state = offset, None
+        self._memo[key] = _Memo(timestamps.copy(), values.copy(), result,
+                                checkpoint - offset, checkpoint_state)
+        self._memo.move_to_end(key)
+        while len(self._memo) > self.max_entries:
+            self._memo.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _align(memo: _Memo, timestamps: np.ndarray, values: np.ndarray) -> Optional[Tuple[int, int]]:
+        """(position of the new series' first point in the memoized series, number of leading
+        points of the combined series that are unchanged), or None if the series do not line up."""
+        if len(timestamps) == 0:
+            return None
+        offset = int(np.searchsorted(memo.timestamps, timestamps[0]))
+        if offset >= len(memo.timestamps) or memo.timestamps[offset] != timestamps[0]:
+            return None
+        count = min(len(memo.timestamps) - offset, len(timestamps))
+        same = ((memo.timestamps[offset:offset + count] == timestamps[:count])
+                & (memo.values[offset:offset + count] == values[:count]))
+        return offset, offset + (count if same.all() else int(np.argmin(same)))
+
+    def clear(self, coin_id: Optional[str] = None):
+        """Drops memoized results (for one coin, or all of them)."""
+        if coin_id is None:
+            self._memo.clear()
+        else:
+            self._memo = OrderedDict((k, v) for k, v in self._memo.items() if k[0] != coin_id)
@@ -0,0 +1,158 @@
+# app/logic/portfolio.py
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from ..config import PORTFOLIO_PATH
+
+
+class Position:
+    """One holding (a watchlist entry is a position with quantity 0)."""
+
+    __slots__ = ("coin_id", "quantity", "cost_basis", "name", "symbol", "price", "value")
+
+    def __init__(self, coin_id: str, quantity: float = 0.0, cost_basis: float = 0.0):
+        self.coin_id = coin_id
+        self.quantity = quantity
+        self.cost_basis = cost_basis     # average purchase price per unit
+        self.name = coin_id
+        self.symbol = ""
+        self.price: Optional[float] = None
+        self.value = 0.0
+
+    @property
+    def cost(self) -> float:
+        return self.quantity * self.cost_basis
+
+    @property
+    def pnl(self) -> Optional[float]:
+        return None if self.price is None else self.value - self.cost
+
+    @property
+    def pnl_percent(self) -> Optional[float]:
+        cost = self.cost
+        return None if self.price is None or not cost else self.pnl / cost * 100
+
+    def to_json(self) -> Dict:
+        return {"coin_id": self.coin_id, "quantity": self.quantity, "cost_basis": self.cost_basis}
+
+
+class Portfolio:
+    """Persisted watchlist/portfolio with incrementally maintained valuation.
+
+    `update_prices` only touches positions whose price changed and adjusts the totals by
+    the difference, so a snapshot or tick costs O(changed positions). The ids of changed
+    positions accumulate until the UI collects them with `take_changes`.
+    """
+
+    def __init__(self, path: Optional[Path] = PORTFOLIO_PATH):
+        self.path = Path(path) if path is not None else None  # None: kept in memory only
+        self.positions: Dict[str, Position] = {}
+        self.total_value = 0.0
+        self.total_cost = 0.0   # cost of the positions that have a price
+        self._changed: Set[str] = set()
+        self._lock = threading.Lock()
+        self.load()
+
+    @property
+    def coin_ids(self) -> List[str]:
+        with self._lock:
+            return list(self.positions)
+
+    @property
+    def total_pnl(self) -> float:
+        return self.total_value - self.total_cost
+
+    def load(self):
+        if self.path is None:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f).get("positions", [])
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"Could not read portfolio {self.path}: {e}")
+            return
+        for entry in entries:
+            try:
+                position = Position(str(entry["coin_id"]), float(entry.get("quantity", 0)),
+                                    float(entry.get("cost_basis", 0)))
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.positions[position.coin_id] = position
+
+    def save(self):
+        """Rewrites the portfolio file atomically (temp file, fsync, rename)."""
+        with self._lock:
+            payload = json.dumps({"positions": [p.to_json() for p in self.positions.values()]}, indent=2)
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not write portfolio: {e}")
+
+    def set_position(self, coin_id: str, quantity: float, cost_basis: float, coin: Optional[Dict] = None):
+        """Adds or replaces a position (`coin` is its latest formatted snapshot entry, if known)."""
+        with self._lock:
+            self._discard(coin_id)
+            position = Position(coin_id, quantity, cost_basis)
+            self.positions[coin_id] = position
+            if coin:
+                self._apply(position, coin)
+            self._changed.add(coin_id)
+        self.save()
+
+    def remove(self, coin_id: str):
+        with self._lock:
+            if coin_id not in self.positions:
+                return
+            self._discard(coin_id)
+            self._changed.add(coin_id)
+        self.save()
+
+    def update_prices(self, coins: Iterable[Dict]) -> List[str]:
+        """Revalues the positions whose price changed; returns their coin ids."""
+        changed = []
+        with self._lock:
+            if not self.positions:
+                return changed
+            for coin in coins:
+                position = self.positions.get(coin.get("id"))
+                if position is None or coin.get("price") is None or coin["price"] == position.price:
+                    continue
+                self._apply(position, coin)
+                changed.append(position.coin_id)
+            self._changed.update(changed)
+        return changed
+
+    def take_changes(self) -> Set[str]:
+        """Ids of positions changed (or removed) since the last call."""
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        return changed
+
+    def _apply(self, position: Position, coin: Dict):
+        """Sets a new price and moves the totals by the position's difference."""
+        if position.price is None:
+            self.total_cost += position.cost
+        position.name = coin.get("name") or position.coin_id
+        position.symbol = coin.get("symbol") or ""
+        position.price = coin["price"]
+        value = position.quantity * position.price
+        self.total_value += value - position.value
+        position.value = value
+
+    def _discard(self, coin_id: str):
+        position = self.positions.pop(coin_id, None)
+        if position is not None and position.price is not None:
+            self.total_value -= position.value
+            self.total_cost -= position.cost
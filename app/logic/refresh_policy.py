@@ -0,0 +1,101 @@
+# app/logic/refresh_policy.py
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Iterable, Tuple
+from ..config import (REFRESH_INTERVALS, REFRESH_MIN_INTERVAL, REFRESH_MAX_INTERVAL,
+                      WATCHLIST, VOLATILITY_THRESHOLD, VOLATILITY_WINDOW)
+
+
+class VolatilityTracker:
+    """Measures how much watchlist coins move over a sliding time window.
+
+    The move is the largest high-low range (in % of the low) of any watchlist coin's
+    prices within the last `window` seconds. It does not depend on how updates are
+    batched: snapshots, tick batches and batches without watchlist coins (e.g. only
+    portfolio coins) all leave a steady reading, which decays once the window passes.
+    """
+
+    def __init__(self, watchlist: Iterable[str] = WATCHLIST, threshold: float = VOLATILITY_THRESHOLD,
+                 window: float = VOLATILITY_WINDOW):
+        self.watchlist = set(watchlist)
+        self.threshold = threshold
+        self.window = window
+        self.last_prices: Dict[str, float] = {}
+        self.last_move = 0.0  # largest % range within the window, as of the latest update
+        self._history: Dict[str, Deque[Tuple[float, float]]] = {}  # coin id -> (ts, price)
+
+    def observe(self, coins: List[Dict], now: Optional[float] = None) -> float:
+        """Feeds a snapshot (or partial price update); returns the current move in %."""
+        now = time.time() if now is None else now
+        for coin in coins:
+            coin_id = coin.get("id")
+            price = coin.get("price")
+            if coin_id not in self.watchlist or not isinstance(price, (int, float)) or price <= 0:
+                continue
+            self._history.setdefault(coin_id, deque()).append((now, price))
+            self.last_prices[coin_id] = price
+        return self.move(now)
+
+    def move(self, now: Optional[float] = None) -> float:
+        """Largest watchlist price range (%) within the window ending at `now`."""
+        now = time.time() if now is None else now
+        largest = 0.0
+        for points in self._history.values():
+            self._expire(points, now)
+            prices = [price for _, price in points]
+            low = min(prices)
+            largest = max(largest, (max(prices) - low) / low * 100)
+        self.last_move = largest
+        return largest
+
+    def _expire(self, points: Deque[Tuple[float, float]], now: float):
+        """Drops points that are older than the window, except the newest of them: the price
+        at the window's start, which later prices are measured against."""
+        while len(points) > 1 and now - points[1][0] > self.window:
+            points.popleft()
+
+    @property
+    def is_volatile(self) -> bool:
+        return self.move() >= self.threshold
+
+
+class RefreshPolicy:
+    """Decides how long each periodic task waits before its next run.
+
+    Pure logic with no Qt dependency, so it can drive timers inside and outside the GUI.
+    """
+
+    def __init__(self, intervals: Optional[Dict[str, float]] = None,
+                 min_interval: float = REFRESH_MIN_INTERVAL,
+                 max_interval: float = REFRESH_MAX_INTERVAL):
+        self.intervals = dict(intervals or REFRESH_INTERVALS)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+    def next_interval(self, task: str, visible: bool = True, on_battery: bool = False,
+                      online: Optional[bool] = True, budget_fraction: float = 1.0,
+                      volatile: bool = False) -> Optional[float]:
+        """Returns the delay in seconds before `task` runs again, or None to pause it."""
+        interval = self.intervals.get(task)
+        if interval is None:
+            return None
+
+        if not visible:
+            # Nobody is looking: keep the snapshot history ticking slowly, pause the rest
+            if task != "markets":
+                return None
+            interval *= 5
+        if on_battery:
+            interval *= 2
+        if online is False:
+            interval *= 2  # connectivity is probed separately; don't hammer a dead link
+
+        # Back off before the shared upstream rate limit is reached
+        if budget_fraction < 0.2:
+            interval *= 4
+        elif budget_fraction < 0.5:
+            interval *= 2
+        elif volatile and task == "prices" and visible:
+            interval /= 4  # watchlist moves fast: poll its prices more often
+
+        return min(max(interval, self.min_interval), self.max_interval)
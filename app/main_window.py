@@ -1,14 +1,22 @@
-from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout
+import threading
+from functools import partial
+from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QProgressDialog
 from PySide6.QtGui import QIcon
+from PySide6.QtCore import QEvent, Qt
 from .views.header_view import HeaderView
 from .views.table_view import TableView
 from .views.chart_view import ChartView
+from .views.portfolio_view import PortfolioView
 from app.views.status_bar_view import StatusBarView
 from .logic.data_controller import DataController
 from app.logic.search_algorithm import SearchAlgorithm
-from app.utils.dialog import ExportDialog
-from app.utils.file_saver import FileSaver
-from .config import LOGO_ICON
+from .utils.scheduler import RefreshScheduler
+from .utils.tick_coalescer import TickCoalescer
+from .utils.alert_notifier import AlertNotifier
+from .utils.worker import run_in_background, run_with_progress
+from .utils.theme import theme
+from .api.market_source import create_market_source
+from .config import LOGO_ICON, WATCHLIST
 
 class MainWindow(QMainWindow):
     """Main application window for the Blue Moon cryptocurrency dashboard."""
@@ -17,6 +25,7 @@ class MainWindow(QMainWindow):
     def __init__(self, style_sheet: str = ""):
         super().__init__()
         self.style_sheet = style_sheet # Store the stylesheet
+        theme.install(style_sheet)  # parsed once; theme toggles never re-apply it
 
         # Main window properties
         self.setWindowTitle("Crypto Dashboard")
@@ -28,6 +37,25 @@ class MainWindow(QMainWindow):
         self.data_controller = DataController()
         # Initialize UI components
         self.init_ui()
+        # Show the last session's chart immediately (the table restores its own snapshot)
+        self.chart.restore_warm_start()
+
+        # Live prices: ticks from the market source reach the UI at most once per frame
+        self.market_source = create_market_source(self.data_controller.api, coin_ids=self._polled_ids())
+        self.tick_coalescer = TickCoalescer(self)
+        self.tick_coalescer.flushed.connect(self.on_ticks)
+        self.market_source.start(self.tick_coalescer.push)
+        self._poll_task = None
+        self._export_task = None
+        self._export_progress = None
+
+        # All periodic work runs through one adaptive scheduler
+        self.scheduler = RefreshScheduler(self.data_controller, self)
+        self.scheduler.add_task("markets", self.table.refresh_data, run_now=True)
+        if not self.market_source.is_push:
+            self.scheduler.add_task("prices", self.poll_prices)
+        self.scheduler.add_task("chart", self.chart.revalidate)
+        self.header.refresh_requested.connect(lambda: self.scheduler.trigger("markets"))
         # Apply initial theme
         self.apply_theme()
 
@@ -54,26 +82,109 @@ class MainWindow(QMainWindow):
 
         self.table = TableView(self, self.data_controller)
         self.chart = ChartView(self)
+        self.portfolio_view = PortfolioView(self.data_controller)
+        side_layout = QVBoxLayout()
+        side_layout.setSpacing(10)
+        side_layout.addWidget(self.chart, 3)
+        side_layout.addWidget(self.portfolio_view, 2)
         content_layout.addWidget(self.table, 55)
-        content_layout.addWidget(self.chart, 45)
+        content_layout.addLayout(side_layout, 45)
 
         main_layout.addWidget(content_widget)
 
         # Status bar
-        self.status_bar = StatusBarView(self)
+        self.status_bar = StatusBarView(self, api=self.data_controller.api)
         self.setStatusBar(self.status_bar)
 
         # Connect signals and slots
-        self.header.refresh_requested.connect(self.table.refresh_data)
         self.table.status_update.connect(lambda msg, type: self.status_bar.show_message(msg, status_type=type))
         self.table.coin_selected.connect(self.chart.display_chart)
+        self.table.coin_selected.connect(self.portfolio_view.set_coin)
+        self.portfolio_view.status_update.connect(lambda msg, type: self.status_bar.show_message(msg, status_type=type))
+        self.portfolio_view.positions_changed.connect(self.on_positions_changed)
         self.chart.chart_status.connect(lambda msg, type: self.status_bar.show_message(msg, status_type=type))
         self.header.theme_toggled.connect(self.toggle_theme)
         self.header.search_changed.connect(self.on_search)
         self.header.export_requested.connect(self.export_csv)
+        self.header.currency_changed.connect(self.on_currency_changed)
+        self.header.set_currency(self.data_controller.currency)
         
         # Connect the new signal for data availability
         self.table.data_availability_changed.connect(self.header.enable_export_btn)
+        self.table.data_availability_changed.connect(lambda _: self._sync_portfolio_currency())
+
+        # Alerts are evaluated on every snapshot (in the refresh worker) and shown here
+        self.alert_notifier = AlertNotifier(self.status_bar, self.windowIcon(), self)
+        self.data_controller.alerts.listener = self.alert_notifier.notify
+
+    def poll_prices(self):
+        """Scheduled pull of watchlist prices (push sources deliver ticks on their own)."""
+        if self._poll_task is not None or not self.table.has_data():
+            return
+        self._poll_task = run_in_background(self.market_source.poll, self._on_poll_finished)
+
+    def _on_poll_finished(self, _count):
+        self._poll_task = None
+
+    def on_ticks(self, ticks):
+        """Applies a frame's worth of coalesced price ticks to the data, table and chart."""
+        updated = self.data_controller.apply_ticks(ticks)
+        if updated:
+            self.table.update_rows(self.data_controller.to_display(updated))
+            self.chart.apply_ticks(ticks)
+            self.portfolio_view.refresh_changed()
+
+    def on_currency_changed(self, currency: str):
+        """Re-renders the table in `currency` from memory; fetches quotes if there are none yet."""
+        data = self.data_controller.set_currency(currency)
+        if data is None:
+            self.status_bar.show_message(f"No {currency.upper()} quotes yet, refreshing…", status_type="warning")
+            self.scheduler.trigger("markets")
+            return
+        self.table.show_snapshot(currency, data)
+        if self.header.get_search_text():
+            self.on_search(self.header.get_search_text())
+        self._sync_portfolio_currency()
+
+    def _sync_portfolio_currency(self):
+        """Shows the portfolio in the table's currency at the latest exchange rate."""
+        currency = self.table.currency
+        rate = self.data_controller.fx_rates.get(currency, 1.0)
+        if (currency, rate) != (self.portfolio_view.currency, self.portfolio_view.rate):
+            self.portfolio_view.set_currency(currency, rate)
+        else:
+            self.portfolio_view.refresh_changed()
+
+    def _polled_ids(self):
+        """Coins whose prices are polled between snapshots: the watchlist plus the portfolio."""
+        return WATCHLIST + self.data_controller.portfolio.coin_ids
+
+    def on_positions_changed(self):
+        """Follow new holdings right away (they may be outside the top N)."""
+        self.market_source.set_coin_ids(self._polled_ids())
+        known = {coin["id"] for coin in self.data_controller.current_data}
+        if any(coin_id not in known for coin_id in self.data_controller.portfolio.coin_ids):
+            self.scheduler.trigger("markets")
+
+    def closeEvent(self, event):
+        self.market_source.stop()
+        super().closeEvent(event)
+
+    def changeEvent(self, event):
+        """Slow down periodic work while the window is minimized."""
+        if event.type() == QEvent.Type.WindowStateChange and hasattr(self, "scheduler"):
+            self.scheduler.set_visible(not self.isMinimized())
+        super().changeEvent(event)
+
+    def hideEvent(self, event):
+        if hasattr(self, "scheduler"):
+            self.scheduler.set_visible(False)
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        if hasattr(self, "scheduler"):
+            self.scheduler.set_visible(not self.isMinimized())
+        super().showEvent(event)
 
     def toggle_theme(self):
         """Toggles the application's theme between light and dark."""
@@ -87,17 +198,13 @@ class MainWindow(QMainWindow):
     def apply_theme(self):
         """Applies the current theme to the application."""
         self.header.update_theme_icon(self.is_dark)
-        
-        # Set a dynamic property on the main window for QSS to target
-        self.setProperty("darkMode", self.is_dark)
-
-        # Re-applying the stylesheet to the entire application ensures
-        # all widgets properly update their styles.
-        app = QApplication.instance()
-        if app:
-            app.setStyleSheet(self.style_sheet)
-        
-        # Tell chart to re-style itself if data is loaded
+
+        # Set the darkMode property QSS targets and re-polish only the widgets its dark rules match
+        theme.apply(self, self.is_dark)
+
+        # Tell table and chart to re-style themselves if data is loaded
+        if hasattr(self, "table"):
+            self.table.update_theme(self.is_dark)
         if hasattr(self, "chart"):
             self.chart.update_chart_style()
     
@@ -125,13 +232,81 @@ class MainWindow(QMainWindow):
             self.status_bar.show_message("No data to export", status_type="error")
             return
 
-        # Confirm export options    
-        dialog = ExportDialog(self)
-        if dialog.exec():
-            file_path, raw = dialog.get_options()
-            if file_path:
-                success = FileSaver.save_csv(file_path, self.table.all_data, raw=raw)
-                if success:
-                    self.status_bar.show_message(f"CSV exported to {file_path}", status_type="success")
-                else:
-                    self.status_bar.show_message("Export failed", status_type="error")
\ No newline at end of file
+        if self._export_task is not None:
+            self.status_bar.show_message("An export is already running", status_type="warning")
+            return
+
+        # Export utilities are rarely used, so they are only loaded on first export
+        from app.utils.dialog import ExportDialog, SCOPE_HISTORY
+        from app.utils import export_engine
+
+        # Confirm export options
+        selected = self.table.selected_coins()
+        dialog = ExportDialog(self, selected_count=len(selected))
+        if not dialog.exec():
+            return
+        file_path, fmt, scope, raw = dialog.get_options()
+        if not file_path:
+            return
+
+        # Export runs in the background; the progress dialog's Cancel stops it at the next chunk
+        cancelled = threading.Event()
+        if scope == SCOPE_HISTORY:
+            coin_ids = [coin["id"] for coin in (selected or self.table.current_data)]
+            fn = partial(export_engine.export_histories, file_path, coin_ids,
+                         partial(self.data_controller.get_history_array, cancelled=cancelled), fmt,
+                         cancelled=cancelled)
+        else:
+            fn = partial(export_engine.export_snapshot, file_path, list(self.table.all_data), fmt,
+                         raw=raw, cancelled=cancelled, currency=self.table.currency)
+
+        progress_dialog = QProgressDialog("Exporting…", "Cancel", 0, 0, self)
+        progress_dialog.setWindowTitle("Export Data")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(300)
+        progress_dialog.canceled.connect(cancelled.set)
+        self._export_progress = progress_dialog
+        self._export_task = run_with_progress(
+            self._run_export, partial(self._on_export_finished, file_path, cancelled),
+            self._on_export_progress, fn)
+
+    @staticmethod
+    def _run_export(fn, progress=None):
+        """Worker side of an export: returns ("ok", result), ("cancelled", None) or ("error", message)."""
+        from app.utils.export_engine import ExportCancelled
+        try:
+            return "ok", fn(progress=progress)
+        except ExportCancelled:
+            return "cancelled", None
+        except Exception as e:
+            print(f"❌ Error exporting: {e}")
+            return "error", str(e)
+
+    def _on_export_progress(self, done: int, total: int):
+        if self._export_progress is not None:
+            self._export_progress.setMaximum(total)
+            self._export_progress.setValue(done)
+
+    def _on_export_finished(self, file_path: str, cancelled: threading.Event, outcome):
+        self._export_task = None
+        if self._export_progress is not None:
+            self._export_progress.canceled.disconnect(cancelled.set)
+            self._export_progress.close()
+            self._export_progress = None
+
+        status, result = outcome if outcome else ("error", None)
+        if status == "cancelled":
+            self.status_bar.show_message("Export cancelled", status_type="warning")
+        elif status == "error":
+            self.status_bar.show_message("Export failed", status_type="error")
+        elif isinstance(result, tuple):  # history export: (coins written, failed coin ids)
+            written, failed = result
+            if failed:
+                shown = ", ".join(failed[:5]) + ("…" if len(failed) > 5 else "")
+                self.status_bar.show_message(f"Exported history of {written} coins to {file_path}; "
+                                             f"no data for {shown}", status_type="warning", timeout=10000)
+            else:
+                self.status_bar.show_message(f"Exported history of {written} coins to {file_path}",
+                                             status_type="success")
+        else:
+            self.status_bar.show_message(f"Exported {result} coins to {file_path}", status_type="success")
\ No newline at end of file
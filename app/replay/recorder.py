@@ -0,0 +1,102 @@
+# app/replay/recorder.py
+"""
+Captures real CoinGecko responses for offline replay.
+
+Either set BLUE_MOON_RECORD_DIR while using the app (every decoded API response is
+saved), or run a one-off capture sweep:
+
+    python -m app.replay.recorder recordings/ --coins 10
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+INDEX_FILE = "index.json"
+
+
+def request_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """Canonical form of a request, used to match replays to recordings."""
+    query = "&".join(f"{key}={params[key]}" for key in sorted(params))
+    return f"{endpoint}?{query}" if query else endpoint
+
+
+class ResponseRecorder:
+    """Writes each response body to its own JSON file and indexes it by request."""
+
+    def __init__(self, directory: os.PathLike):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.entries: List[Dict[str, Any]] = load_index(self.directory)
+
+    def record(self, endpoint: str, params: Dict[str, Any], data: Any) -> None:
+        """Saves one response (thread-safe); recording errors never break the caller."""
+        with self._lock:
+            name = f"{len(self.entries):05d}.json"
+            entry = {
+                "endpoint": endpoint,
+                "params": {key: str(value) for key, value in params.items()},
+                "file": name,
+                "recorded_at": time.time(),
+            }
+            try:
+                with open(self.directory / name, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                self.entries.append(entry)
+                self._write_index()
+            except OSError as e:
+                print(f"Could not record response for {endpoint}: {e}")
+
+    def _write_index(self):
+        tmp_path = self.directory / (INDEX_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(tmp_path, self.directory / INDEX_FILE)
+
+
+def load_index(directory: os.PathLike) -> List[Dict[str, Any]]:
+    """Returns the recording index of a directory (empty if there is none)."""
+    try:
+        with open(Path(directory) / INDEX_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def capture(directory: os.PathLike, coins: int = 10, limit: int = 250, days: int = 7) -> int:
+    """Records one markets page, simple prices and charts of the top `coins` coins."""
+    from ..api.coin_gecko import CoinGeckoAPI
+
+    api = CoinGeckoAPI()
+    api.recorder = ResponseRecorder(directory)
+    markets = api.get_top_coins(limit, sparkline=True)
+    if not markets:
+        return 1
+    api.get_top_coins(limit, sparkline=False)
+    top_ids = [coin["id"] for coin in markets[:coins]]
+    api.get_simple_prices(top_ids)
+    for coin_id in top_ids:
+        api.fetch_coin_history(coin_id, days=days)
+        api.fetch_coin_ohlc(coin_id, days=days)
+    print(f"Recorded {len(api.recorder.entries)} responses in {directory}", file=sys.stderr)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.replay.recorder",
+                                     description="Record real CoinGecko responses for offline replay.")
+    parser.add_argument("directory", type=Path, help="recording directory (appended to if it exists)")
+    parser.add_argument("--coins", type=int, default=10, help="coins whose charts are recorded (default: 10)")
+    parser.add_argument("--limit", type=int, default=250, help="coins in the markets snapshot (default: 250)")
+    parser.add_argument("--days", type=int, default=7, help="chart range in days (default: 7)")
+    args = parser.parse_args(argv)
+    return capture(args.directory, args.coins, args.limit, args.days)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
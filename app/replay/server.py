@@ -0,0 +1,259 @@
+# app/replay/server.py
+"""
+Offline CoinGecko stand-in: `python -m app.replay.server`.
+
+Serves either recorded responses (`--replay DIR`, see app.replay.recorder) or a
+generated universe (`--synthetic N`, 10k+ coins is fine) on CoinGecko's paths,
+with injectable latency, jitter and 429 responses for load and regression tests.
+Point the app at it with:
+
+    BLUE_MOON_API_BASE_URL=http://127.0.0.1:8766/api/v3 BLUE_MOON_API_MIN_INTERVAL=0 python main.py
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ..config import REPLAY_PORT, SERVER_HOST
+from ..server import API_PREFIX, GZIP_MIN_SIZE, Payload
+from .recorder import load_index, request_key
+from .synthetic import SyntheticMarket, convert_change, quote_rates
+
+COIN_PATH = re.compile(r"^/coins/([^/]+)/(market_chart|ohlc)$")
+
+
+class FaultProfile:
+    """Latency, jitter and rate-limit injection applied to every request."""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, retry_after: int = 60, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(self.latency_ms + jitter, 0.0) / 1000
+
+    def should_throttle(self) -> bool:
+        with self._lock:
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+
+class ReplayBackend:
+    """Answers requests from a recording directory, cycling through repeated recordings."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._recordings: Dict[str, List[str]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        for entry in load_index(self.directory):
+            key = request_key(entry["endpoint"], entry["params"])
+            self._recordings.setdefault(key, []).append(entry["file"])
+        self._largest_markets = max(
+            (key for key in self._recordings if key.startswith("/coins/markets?") and "sparkline=true" in key),
+            key=lambda key: self._per_page(key), default=None)
+
+    def __len__(self):
+        return sum(len(files) for files in self._recordings.values())
+
+    def get(self, endpoint: str, params: Dict[str, str]) -> Optional[Any]:
+        data = self._next(request_key(endpoint, params))
+        if data is not None:
+            return data
+        # Fallbacks derived from the largest recorded markets snapshot
+        if self._largest_markets is None:
+            return None
+        if endpoint == "/coins/markets":
+            coins = self._next(self._largest_markets, advance=False)
+            per_page, page = int(params.get("per_page", 100)), int(params.get("page", 1))
+            coins = coins[(page - 1) * per_page:page * per_page]
+            if params.get("sparkline") != "true":
+                coins = [{k: v for k, v in coin.items() if k != "sparkline_in_7d"} for coin in coins]
+            return coins
+        if endpoint == "/simple/price":
+            by_id = {coin["id"]: coin for coin in self._next(self._largest_markets, advance=False)}
+            bitcoin = by_id.get("bitcoin", {})
+            rates = quote_rates(params.get("vs_currencies", "usd").lower().split(","), bitcoin.get("current_price"),
+                                bitcoin.get("price_change_percentage_24h") or 0.0)
+            return {coin_id: self._quote(by_id[coin_id], rates)
+                    for coin_id in params.get("ids", "").split(",") if coin_id in by_id}
+        return None
+
+    @staticmethod
+    def _quote(coin: Dict, rates: Dict[str, tuple]) -> Dict[str, Any]:
+        """A /simple/price entry derived from a recorded (USD) markets entry."""
+        price, cap, change = coin.get("current_price"), coin.get("market_cap"), coin.get("price_change_percentage_24h")
+        quote = {}
+        for code, (rate, rate_change) in rates.items():
+            quote[code] = None if price is None else price * rate
+            quote[f"{code}_market_cap"] = None if cap is None else cap * rate
+            quote[f"{code}_24h_change"] = None if change is None else convert_change(change, rate_change)
+        return quote
+
+    def _next(self, key: str, advance: bool = True) -> Optional[Any]:
+        files = self._recordings.get(key)
+        if not files:
+            return None
+        with self._lock:
+            cursor = self._cursor.get(key, 0)
+            if advance:
+                self._cursor[key] = cursor + 1
+        with open(self.directory / files[cursor % len(files)], "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _per_page(key: str) -> int:
+        match = re.search(r"per_page=(\d+)", key)
+        return int(match.group(1)) if match else 0
+
+
+class SyntheticBackend:
+    """Answers requests from a SyntheticMarket."""
+
+    def __init__(self, market: SyntheticMarket):
+        self.market = market
+
+    def get(self, endpoint: str, params: Dict[str, str]) -> Optional[Any]:
+        if endpoint == "/coins/markets":
+            ids = [coin_id for coin_id in params["ids"].split(",") if coin_id] if params.get("ids") else None
+            return self.market.markets(int(params.get("per_page", 100)), int(params.get("page", 1)),
+                                       params.get("sparkline") == "true", ids=ids)
+        if endpoint == "/simple/price":
+            ids = [coin_id for coin_id in params.get("ids", "").split(",") if coin_id]
+            return self.market.simple_price(ids, params.get("vs_currencies", "usd"))
+        match = COIN_PATH.match(endpoint)
+        if match:
+            coin_id, kind = match.groups()
+            days = float(params.get("days", 7))
+            if kind == "market_chart":
+                return self.market.market_chart(coin_id, days)
+            return self.market.ohlc(coin_id, days)
+        return None
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """CoinGecko-compatible GET handler with fault injection."""
+
+    server_version = "BlueMoonReplay/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        faults: FaultProfile = self.server.faults
+        time.sleep(faults.delay())
+
+        url = urlsplit(self.path)
+        if not url.path.startswith(API_PREFIX):
+            return self._send_json(404, {"error": "not found"})
+        endpoint = url.path[len(API_PREFIX):]
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if faults.should_throttle():
+            self.server.stats["throttled"] += 1
+            return self._send_json(429, {"status": {"error_code": 429, "error_message": "rate limited"}},
+                                   {"Retry-After": str(faults.retry_after)})
+        if endpoint == "/ping":
+            return self._send_json(200, {"gecko_says": "(V3) To the Moon!"})
+
+        try:
+            data = self.server.backend.get(endpoint, params)
+        except (ValueError, OSError) as e:
+            return self._send_json(400, {"error": str(e)})
+        self.server.stats["served"] += 1
+        if data is None:
+            return self._send_json(404, {"error": f"no data for {endpoint}"})
+        self._send_json(200, data)
+
+    def _send_json(self, status: int, data: Any, headers: Optional[Dict[str, str]] = None):
+        payload = Payload(data)
+        body = payload.body
+        gzipped = len(body) >= GZIP_MIN_SIZE and "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            body = payload.gzipped()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the backend, fault profile and request counters."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], backend, faults: FaultProfile):
+        super().__init__(address, StandInHandler)
+        self.backend = backend
+        self.faults = faults
+        self.stats = {"served": 0, "throttled": 0}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.replay.server",
+                                     description="Serve recorded or synthetic CoinGecko data offline.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--replay", type=Path, metavar="DIR", help="serve responses recorded in DIR")
+    source.add_argument("--synthetic", type=int, default=10000, metavar="N",
+                        help="serve a generated universe of N coins (default)")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=REPLAY_PORT)
+    parser.add_argument("--seed", type=int, default=42, help="seed for synthetic data and faults")
+    parser.add_argument("--sparkline-points", type=int, default=168, help="points per sparkline (payload size)")
+    parser.add_argument("--history-points", type=int, default=8, help="market_chart points per day (payload size)")
+    parser.add_argument("--latency", type=float, default=0.0, help="added latency per request in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="uniform +/- latency jitter in ms")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=60, help="Retry-After seconds sent with 429s")
+    return parser
+
+
+def make_server(args: argparse.Namespace) -> StandInServer:
+    if args.replay:
+        backend = ReplayBackend(args.replay)
+        if not len(backend):
+            raise SystemExit(f"No recordings found in {args.replay}")
+    else:
+        backend = SyntheticBackend(SyntheticMarket(args.synthetic, seed=args.seed,
+                                                   sparkline_points=args.sparkline_points,
+                                                   history_points=args.history_points))
+    faults = FaultProfile(args.latency, args.jitter, args.rate_429, args.retry_after, seed=args.seed)
+    return StandInServer((args.host, args.port), backend, faults)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    server = make_server(args)
+    print(f"Serving {'replay of ' + str(args.replay) if args.replay else f'{args.synthetic} synthetic coins'} "
+          f"on http://{args.host}:{args.port}{API_PREFIX}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served {server.stats['served']} requests, throttled {server.stats['throttled']}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
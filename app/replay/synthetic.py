@@ -0,0 +1,196 @@
+# app/replay/synthetic.py
+import math
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+DAY_MS = 24 * 60 * 60 * 1000
+NAMED_COINS = [("bitcoin", "Bitcoin", "btc"), ("ethereum", "Ethereum", "eth"), ("tether", "Tether", "usdt")]
+FIAT_RATES = {"usd": 1.0, "eur": 0.92, "jpy": 150.0, "gbp": 0.79}  # fixed units per USD
+NOISE_SCALE = 0.002  # std of the per-tick log-price noise
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: maps uint64 counters to well-scrambled uint64 values."""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _unit_interval(x: np.ndarray) -> np.ndarray:
+    """The top 53 bits of `x` as floats in (0, 1]."""
+    return ((x >> np.uint64(11)).astype(np.float64) + 1.0) / float(1 << 53)
+
+
+def quote_rates(currencies: List[str], btc_price: Optional[float], btc_change: float = 0.0) -> Dict[str, tuple]:
+    """currency -> (units per USD, 24h change of that rate in %) for the quotable currencies.
+
+    Fiat rates are fixed; "btc" is quoted through the bitcoin price when it is known.
+    """
+    rates = {}
+    for currency in currencies:
+        if currency in FIAT_RATES:
+            rates[currency] = (FIAT_RATES[currency], 0.0)
+        elif currency == "btc" and btc_price:
+            rates[currency] = (1.0 / btc_price, (1.0 / (1 + btc_change / 100) - 1) * 100)
+    return rates
+
+
+def convert_change(change: float, rate_change: float) -> float:
+    """A 24h change in USD re-expressed in a currency whose rate moved by `rate_change` %."""
+    return ((1 + change / 100) * (1 + rate_change / 100) - 1) * 100
+
+
+class SyntheticMarket:
+    """A deterministic, arbitrarily large universe of coins in CoinGecko's response shapes.
+
+    Prices are a smooth function of time plus seeded noise, so every request for the
+    same instant returns the same numbers while prices still move between refreshes.
+    The first coins use real ids (bitcoin, ethereum, tether) so the default watchlist works.
+    """
+
+    def __init__(self, n_coins: int = 10000, seed: int = 42, sparkline_points: int = 168,
+                 history_points: int = 8, tick_seconds: float = 10.0):
+        self.n_coins = n_coins
+        self.seed = seed
+        self.sparkline_points = sparkline_points
+        self.history_points = history_points
+        self.tick_seconds = tick_seconds
+
+        rng = np.random.default_rng(seed)
+        self.ids = [NAMED_COINS[i][0] if i < len(NAMED_COINS) else f"coin-{i:05d}" for i in range(n_coins)]
+        self.names = [NAMED_COINS[i][1] if i < len(NAMED_COINS) else f"Coin {i}" for i in range(n_coins)]
+        self.symbols = [NAMED_COINS[i][2] if i < len(NAMED_COINS) else f"c{i}" for i in range(n_coins)]
+        self._index = {coin_id: i for i, coin_id in enumerate(self.ids)}
+
+        # Market caps fall off with rank; prices are log-uniform between $0.0001 and $50k
+        self.base_caps = 1.2e12 / np.arange(1, n_coins + 1) ** 1.3
+        self.base_prices = 10 ** rng.uniform(-4, 4.7, n_coins)
+        self.base_prices[:3] = [60000.0, 3000.0, 1.0]
+        self.volatility = rng.uniform(0.01, 0.08, n_coins)
+        self.volatility[2] = 0.0005  # stablecoin
+        self.phases = rng.uniform(0, 2 * math.pi, (2, n_coins))
+        self.supply = self.base_caps / self.base_prices
+
+    # ----- Price model -----
+    def prices_at(self, t: float, index=slice(None)) -> np.ndarray:
+        """Prices of the selected coins at unix time `t` (vectorized)."""
+        hours = t / 3600.0
+        wave = (np.sin(hours / 7.0 + self.phases[0][index]) + 0.5 * np.sin(hours / 1.3 + self.phases[1][index]))
+        step = int(t // self.tick_seconds)
+        return self.base_prices[index] * np.exp(self.volatility[index] * wave + self._noise(step, index))
+
+    def _noise(self, step: int, index) -> np.ndarray:
+        """Gaussian noise for the selected coins at a tick `step`, without drawing it for the others.
+
+        Counter-based: each (seed, step, coin) value is hashed independently (splitmix64 +
+        Box-Muller), so the cost follows the selection and a coin's noise does not depend
+        on which other coins are requested with it.
+        """
+        if isinstance(index, slice):
+            coins = np.arange(*index.indices(self.n_coins), dtype=np.uint64)
+        else:
+            coins = np.asarray(index, dtype=np.int64).astype(np.uint64)
+        key = _mix64(np.array([(self.seed & 0xFFFFFFFF) << 32 | step & 0xFFFFFFFF], dtype=np.uint64))
+        counters = key + coins * np.uint64(2) * _GOLDEN
+        u1 = _unit_interval(_mix64(counters))
+        u2 = _unit_interval(_mix64(counters + _GOLDEN))
+        return NOISE_SCALE * np.sqrt(-2.0 * np.log(u1)) * np.cos(2 * math.pi * u2)
+
+    def change_24h(self, t: float, index=slice(None)) -> np.ndarray:
+        now, before = self.prices_at(t, index), self.prices_at(t - 86400, index)
+        return (now - before) / before * 100
+
+    # ----- CoinGecko-shaped responses -----
+    def markets(self, per_page: int = 100, page: int = 1, sparkline: bool = False,
+                t: Optional[float] = None, ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """A /coins/markets page (ranked by market cap), optionally restricted to `ids`."""
+        t = t or time.time()
+        if ids is not None:
+            positions = sorted(self._index[coin_id] for coin_id in ids if coin_id in self._index)
+        else:
+            positions = range(max(page - 1, 0) * per_page, min(page * per_page, self.n_coins))
+        index = np.asarray(positions, dtype=np.int64)
+        prices = self.prices_at(t, index)
+        changes = self.change_24h(t, index)
+        caps = prices * self.supply[index]
+        ids = [self.ids[i] for i in index]
+
+        if sparkline and len(ids):
+            hours = t - np.arange(self.sparkline_points)[::-1] * 3600.0
+            lines = np.stack([self.prices_at(h, index) for h in hours], axis=1)
+
+        coins = []
+        for offset, coin_id in enumerate(ids):
+            i = int(index[offset])
+            coin = {
+                "id": coin_id,
+                "symbol": self.symbols[i],
+                "name": self.names[i],
+                "current_price": round(float(prices[offset]), 8),
+                "market_cap": round(float(caps[offset])),
+                "market_cap_rank": i + 1,
+                "price_change_percentage_24h": round(float(changes[offset]), 4),
+                "last_updated": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(t)),
+            }
+            if sparkline:
+                coin["sparkline_in_7d"] = {"price": lines[offset].round(8).tolist()}
+            coins.append(coin)
+        return coins
+
+    def simple_price(self, ids: List[str], currency: str = "usd", t: Optional[float] = None) -> Dict[str, Dict]:
+        """A /simple/price response for comma-separated `currency` (unknown ids are omitted, as upstream does)."""
+        t = t or time.time()
+        btc = slice(0, 1)
+        rates = quote_rates(currency.lower().split(","), float(self.prices_at(t, btc)[0]),
+                            float(self.change_24h(t, btc)[0]))
+        result = {}
+        for coin_id in ids:
+            i = self._index.get(coin_id)
+            if i is None:
+                continue
+            price = float(self.prices_at(t, slice(i, i + 1))[0])
+            change = float(self.change_24h(t, slice(i, i + 1))[0])
+            quote = {}
+            for code, (rate, rate_change) in rates.items():
+                quote[code] = round(price * rate, 10)
+                quote[f"{code}_market_cap"] = round(price * rate * float(self.supply[i]), 4)
+                quote[f"{code}_24h_change"] = round(convert_change(change, rate_change), 4)
+            result[coin_id] = quote
+        return result
+
+    def market_chart(self, coin_id: str, days: float = 7, t: Optional[float] = None) -> Optional[Dict[str, List]]:
+        """A /coins/{id}/market_chart response with `history_points` points per day."""
+        i = self._index.get(coin_id)
+        if i is None:
+            return None
+        t = t or time.time()
+        # Like CoinGecko: past points sit on a fixed grid (the same on every request), the
+        # last one is the provisional current price
+        count = max(int(days * self.history_points), 2)
+        step = 86400 / self.history_points
+        times = np.append((math.ceil(t / step) - 1 - np.arange(count - 1)[::-1]) * step, t)
+        prices = np.array([self.prices_at(s, slice(i, i + 1))[0] for s in times])
+        stamps = (times * 1000).astype(np.int64).tolist()
+        return {
+            "prices": [[ms, p] for ms, p in zip(stamps, prices.round(8).tolist())],
+            "market_caps": [[ms, p * float(self.supply[i])] for ms, p in zip(stamps, prices.tolist())],
+            "total_volumes": [[ms, p * float(self.supply[i]) * 0.05] for ms, p in zip(stamps, prices.tolist())],
+        }
+
+    def ohlc(self, coin_id: str, days: float = 7, t: Optional[float] = None) -> Optional[List[List[float]]]:
+        """A /coins/{id}/ohlc response using CoinGecko's candle granularity for `days`."""
+        i = self._index.get(coin_id)
+        if i is None:
+            return None
+        t = t or time.time()
+        candle = 1800 if days <= 2 else 4 * 3600 if days <= 30 else 4 * 86400
+        end = t - t % candle
+        starts = end - np.arange(int(days * 86400 // candle))[::-1] * candle
+        candles = []
+        for start in starts:
+            samples = np.array([self.prices_at(s, slice(i, i + 1))[0] for s in np.linspace(start - candle, start, 5)])
+            candles.append([int(start * 1000), *np.round([samples[0], samples.max(), samples.min(), samples[-1]], 8).tolist()])
+        return candles
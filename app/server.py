@@ -0,0 +1,354 @@
+# app/server.py
+"""
+Local fan-out server: `python -m app.server`.
+
+Polls CoinGecko once and serves the latest markets snapshot, cached chart data and
+derived simple prices to any number of Blue Moon clients over CoinGecko-compatible
+paths. Point clients at it with BLUE_MOON_API_BASE_URL=http://<host>:<port>/api/v3.
+
+Every response carries an ETag so unchanged data costs clients a 304, and
+`/api/v3/markets/delta?since=<version>` returns only the coins changed since a
+version the client already has. `/api/v3/stream` pushes the same deltas (price
+fields only) as Server-Sent Events whenever a new snapshot arrives.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .api.coin_gecko import CoinGeckoAPI
+from .config import HISTORY_CACHE_TTL, SERVER_HOST, SERVER_MARKETS_LIMIT, SERVER_PORT, UPSTREAM_API_URL
+from .headless import HeadlessPoller
+
+API_PREFIX = "/api/v3"
+GZIP_MIN_SIZE = 1024  # smaller bodies are not worth compressing
+STREAM_KEEPALIVE = 15  # seconds between SSE keep-alive comments
+TICK_FIELDS = ("id", "current_price", "price_change_percentage_24h", "market_cap", "last_updated")
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+class Payload:
+    """A serialized response body with its ETag (and a lazily gzipped copy)."""
+
+    def __init__(self, data: Any):
+        self.body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        self.etag = make_etag(self.body)
+        self._gzipped: Optional[bytes] = None
+
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=5)
+        return self._gzipped
+
+
+class SnapshotHub:
+    """The latest upstream markets snapshot, versioned per coin for delta responses."""
+
+    def __init__(self, currency: str = "usd"):
+        self.currency = currency
+        self._lock = threading.Lock()
+        self._published = threading.Condition(self._lock)  # wakes streaming clients
+        self.version = 0
+        self.updated_at = 0.0
+        self.coins: List[Dict] = []
+        self._by_id: Dict[str, Dict] = {}
+        self._changed_at: Dict[str, int] = {}  # coin id -> version of its last change
+        self._removed_at: Dict[str, int] = {}  # coin id -> version it left the snapshot
+        self._payloads: Dict[Tuple, Payload] = {}  # serialized views of the current version
+
+    def publish(self, coins: List[Dict]):
+        """Installs a fresh upstream snapshot, recording which coins changed."""
+        with self._lock:
+            version = self.version + 1
+            by_id = {coin.get("id"): coin for coin in coins}
+            for coin_id, coin in by_id.items():
+                if self._by_id.get(coin_id) != coin:
+                    self._changed_at[coin_id] = version
+                self._removed_at.pop(coin_id, None)
+            for coin_id in self._by_id.keys() - by_id.keys():
+                self._removed_at[coin_id] = version
+                self._changed_at.pop(coin_id, None)
+
+            self.coins, self._by_id = coins, by_id
+            self.version = version
+            self.updated_at = time.time()
+            self._payloads.clear()
+            self._published.notify_all()
+
+    def markets(self, per_page: int, page: int, sparkline: bool) -> Optional[Payload]:
+        """The /coins/markets page clients asked for, served from the snapshot."""
+        with self._lock:
+            if not self.version:
+                return None
+            key = ("markets", per_page, page, sparkline)
+            payload = self._payloads.get(key)
+            if payload is None:
+                start = (page - 1) * per_page
+                coins = self.coins[start:start + per_page]
+                payload = Payload(coins if sparkline else [self._without_sparkline(c) for c in coins])
+                self._payloads[key] = payload
+            return payload
+
+    def delta(self, since: int, sparkline: bool) -> Optional[Payload]:
+        """Coins changed (and ids removed) after version `since`; a full list if `since` is unknown."""
+        with self._lock:
+            if not self.version:
+                return None
+            full, changed, removed = self._changes_since(since)
+            return Payload({
+                "version": self.version,
+                "full": full,
+                "coins": changed if sparkline else [self._without_sparkline(c) for c in changed],
+                "removed": removed,
+            })
+
+    def wait_for_ticks(self, since: int, timeout: float) -> Tuple[int, List[Dict]]:
+        """Blocks until a version newer than `since` exists (or `timeout`); returns it with its ticks."""
+        with self._published:
+            self._published.wait_for(lambda: self.version > since, timeout)
+            if self.version <= since:
+                return since, []
+            _, changed, _ = self._changes_since(since)
+            return self.version, [{key: coin.get(key) for key in TICK_FIELDS} for coin in changed]
+
+    def _changes_since(self, since: int) -> Tuple[bool, List[Dict], List[str]]:
+        """(full, changed coins, removed ids) relative to version `since`; call with the lock held."""
+        full = since <= 0 or since > self.version  # client is new or predates a server restart
+        changed = [
+            coin for coin in self.coins
+            if full or self._changed_at.get(coin.get("id"), 0) > since
+        ]
+        removed = [] if full else [cid for cid, v in self._removed_at.items() if v > since]
+        return full, changed, removed
+
+    def simple_price(self, ids: List[str], currency: str, market_cap: bool, change: bool) -> Optional[Payload]:
+        """A /simple/price answer derived from the snapshot (None if a coin is not in it)."""
+        with self._lock:
+            if currency != self.currency or any(coin_id not in self._by_id for coin_id in ids):
+                return None
+            result = {}
+            for coin_id in ids:
+                coin = self._by_id[coin_id]
+                quote = {currency: coin.get("current_price")}
+                if market_cap:
+                    quote[f"{currency}_market_cap"] = coin.get("market_cap")
+                if change:
+                    quote[f"{currency}_24h_change"] = coin.get("price_change_percentage_24h")
+                result[coin_id] = quote
+            return Payload(result)
+
+    @staticmethod
+    def _without_sparkline(coin: Dict) -> Dict:
+        return {key: value for key, value in coin.items() if key != "sparkline_in_7d"}
+
+
+class ProxyCache:
+    """TTL cache of proxied upstream responses (charts, other currencies, ...).
+
+    Concurrent requests for the same resource wait for one upstream fetch.
+    """
+
+    def __init__(self, api: CoinGeckoAPI, ttl: float = HISTORY_CACHE_TTL):
+        self.api = api
+        self.ttl = ttl
+        self._entries: Dict[Tuple, Tuple[float, Payload]] = {}
+        self._locks: Dict[Tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._upstream_lock = threading.Lock()  # one upstream request at a time (rate limit)
+
+    def get(self, endpoint: str, params: Dict[str, str]) -> Optional[Payload]:
+        key = (endpoint, tuple(sorted(params.items())))
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self._entries.get(key)
+            if entry and time.time() - entry[0] < self.ttl:
+                return entry[1]
+            data = self.fetch(endpoint, params)
+            if data is None:
+                return entry[1] if entry else None  # serve stale data rather than nothing
+            payload = Payload(data)
+            self._entries[key] = (time.time(), payload)
+            return payload
+
+    def fetch(self, endpoint: str, params: Dict[str, Any], description: Optional[str] = None):
+        with self._upstream_lock:
+            return self.api.get_json(endpoint, params, description)
+
+
+class FanOutHandler(BaseHTTPRequestHandler):
+    """Serves CoinGecko-compatible GET requests from the hub and the proxy cache."""
+
+    server_version = "BlueMoonFanOut/1.0"
+    protocol_version = "HTTP/1.1"  # keep-alive for clients' pooled sessions
+
+    @property
+    def hub(self) -> SnapshotHub:
+        return self.server.hub
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        path = url.path[len(API_PREFIX):] if url.path.startswith(API_PREFIX) else None
+
+        try:
+            if path is None:
+                self._send_error(404, "not found")
+            elif path == "/ping":
+                self._send(Payload({"gecko_says": "(V3) To the Moon!", "version": self.hub.version}))
+            elif path == "/coins/markets":
+                self._markets(query)
+            elif path == "/markets/delta":
+                payload = self.hub.delta(int(query.get("since", 0)), query.get("sparkline") == "true")
+                self._send(payload) if payload else self._send_error(503, "no snapshot yet")
+            elif path == "/simple/price":
+                self._simple_price(path, query)
+            elif path == "/stream":
+                self._stream(int(self.headers.get("Last-Event-ID") or query.get("since", 0)))
+            else:
+                self._proxy(path, query)
+        except ValueError as e:
+            self._send_error(400, str(e))
+
+    def _markets(self, query: Dict[str, str]):
+        per_page, page = int(query.get("per_page", 100)), int(query.get("page", 1))
+        if (query.get("vs_currency", "usd") != self.hub.currency or query.get("ids")
+                or query.get("order", "market_cap_desc") != "market_cap_desc"):
+            return self._proxy("/coins/markets", query)
+        payload = self.hub.markets(per_page, page, query.get("sparkline") == "true")
+        self._send(payload) if payload else self._send_error(503, "no snapshot yet")
+
+    def _simple_price(self, path: str, query: Dict[str, str]):
+        ids = [coin_id for coin_id in query.get("ids", "").split(",") if coin_id]
+        currencies = query.get("vs_currencies", "")
+        payload = self.hub.simple_price(ids, currencies, query.get("include_market_cap") == "true",
+                                        query.get("include_24hr_change") == "true")
+        self._send(payload) if payload else self._proxy(path, query)
+
+    def _stream(self, since: int):
+        """Server-Sent Events: one `ticks` event per new snapshot version, until the client leaves."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            while True:
+                version, ticks = self.hub.wait_for_ticks(since, STREAM_KEEPALIVE)
+                if version == since:
+                    self.wfile.write(b": keep-alive\n\n")
+                else:
+                    data = json.dumps(ticks, separators=(",", ":"))
+                    self.wfile.write(f"id: {version}\nevent: ticks\ndata: {data}\n\n".encode("utf-8"))
+                    since = version
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client disconnected
+
+    def _proxy(self, path: str, query: Dict[str, str]):
+        payload = self.server.proxy.get(path, query)
+        self._send(payload) if payload else self._send_error(502, "upstream unavailable")
+
+    def _send(self, payload: Payload):
+        if payload.etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", payload.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = payload.body
+        use_gzip = len(body) >= GZIP_MIN_SIZE and "gzip" in self.headers.get("Accept-Encoding", "")
+        if use_gzip:
+            body = payload.gzipped()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", payload.etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("X-Snapshot-Version", str(self.hub.version))
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str):
+        body = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # one line per request is too noisy for a fan-out server
+
+
+class FanOutServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], hub: SnapshotHub, proxy: ProxyCache):
+        super().__init__(address, FanOutHandler)
+        self.hub = hub
+        self.proxy = proxy
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.server",
+                                     description="Poll CoinGecko once and serve many Blue Moon clients.")
+    parser.add_argument("--host", default=SERVER_HOST, help=f"address to bind (default: {SERVER_HOST})")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help=f"port (default: {SERVER_PORT})")
+    parser.add_argument("--limit", type=int, default=SERVER_MARKETS_LIMIT,
+                        help=f"coins polled upstream (default: {SERVER_MARKETS_LIMIT})")
+    parser.add_argument("--interval", type=float, help="markets poll interval in seconds (default: from config)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    # Always talk to the real API, even if BLUE_MOON_API_BASE_URL points clients at us
+    api = CoinGeckoAPI(base_url=UPSTREAM_API_URL)
+    hub = SnapshotHub()
+    proxy = ProxyCache(api)
+
+    def poll_markets():
+        coins = proxy.fetch("/coins/markets", {
+            "vs_currency": hub.currency, "order": "market_cap_desc",
+            "per_page": args.limit, "page": 1, "sparkline": "true",
+        }, "top coins")
+        if coins:
+            hub.publish(coins)
+            print(f"{time.strftime('%H:%M:%S')}  snapshot v{hub.version}: {len(coins)} coins", file=sys.stderr)
+
+    poller = HeadlessPoller(api)
+    if args.interval:
+        poller.policy.intervals["markets"] = args.interval
+        poller.policy.min_interval = min(poller.policy.min_interval, args.interval)
+    poller.add_task("markets", poll_markets)
+    threading.Thread(target=poller.run, name="upstream-poller", daemon=True).start()
+
+    server = FanOutServer((args.host, args.port), hub, proxy)
+    print(f"Serving on http://{args.host}:{args.port}{API_PREFIX}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        poller.stop()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+# app/storage/history_file.py
+import os
+import re
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+import numpy as np
+
+# File layout: a 64-byte header followed by fixed-width records of three
+# little-endian float64 columns (timestamp ms, price, volume).
+#
+#   magic (8s) | version (u32) | columns (u32) | committed records (u64) | reserved
+#
+# The committed record count is the commit point: records are written and fsynced
+# *before* the count is bumped, so a crash mid-append leaves a torn tail that is
+# simply ignored (and overwritten) the next time the file is opened.
+MAGIC = b"BMHIST01"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQ")
+HEADER_SIZE = 64
+COUNT_OFFSET = 16
+RECORD_DTYPE = np.dtype("<f8")
+COLUMNS = 3  # ts, price, volume
+RECORD_SIZE = COLUMNS * RECORD_DTYPE.itemsize
+
+
+class HistoryFile:
+    """A single coin's price history as a memory-mapped binary file of fixed-width records."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.RLock()  # merge reads the records while holding it
+        self._map: Optional[np.memmap] = None
+
+        if not self.path.exists() or self.path.stat().st_size < HEADER_SIZE:
+            self._create()
+        self._file = open(self.path, "r+b")
+
+        magic, version, columns, count = HEADER.unpack(self._file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION or columns != COLUMNS:
+            self._file.close()
+            raise ValueError(f"Not a Blue Moon history file: {self.path}")
+
+        # Never trust more records than the file physically holds
+        on_disk = (os.fstat(self._file.fileno()).st_size - HEADER_SIZE) // RECORD_SIZE
+        self.count = min(count, on_disk)
+
+    def _create(self):
+        """Writes an empty file with a fresh header (atomically via rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, COLUMNS, 0).ljust(HEADER_SIZE, b"\0"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def records(self) -> np.ndarray:
+        """Returns all committed records as a zero-copy (n, 3) view of the file."""
+        with self._lock:
+            if self.count == 0:
+                return np.empty((0, COLUMNS), dtype=RECORD_DTYPE)
+            if self._map is None or len(self._map) != self.count:
+                self._map = np.memmap(self.path, dtype=RECORD_DTYPE, mode="r",
+                                      offset=HEADER_SIZE, shape=(self.count, COLUMNS))
+            return self._map
+
+    def read(self, start_ms: Optional[float] = None, end_ms: Optional[float] = None) -> np.ndarray:
+        """Returns the records with start_ms <= ts <= end_ms as a zero-copy slice."""
+        records = self.records()
+        ts = records[:, 0]
+        lo = 0 if start_ms is None else int(np.searchsorted(ts, start_ms, side="left"))
+        hi = len(records) if end_ms is None else int(np.searchsorted(ts, end_ms, side="right"))
+        return records[lo:hi]
+
+    def merge(self, new_records: np.ndarray) -> None:
+        """Merges a freshly fetched, time-sorted series into the file.
+
+        Stored records at or after the first new timestamp are superseded by the new
+        data (the API's most recent point is provisional); older history is kept. The
+        tail is rewritten in place, so views from `records()`/`read()` can change: copy
+        a slice before handing it to code that keeps it.
+        """
+        if len(new_records) == 0:
+            return
+        new_records = np.ascontiguousarray(new_records, dtype=RECORD_DTYPE)
+
+        with self._lock:  # concurrent merges (e.g. bulk exports) must not interleave
+            keep = int(np.searchsorted(self.records()[:, 0], new_records[0, 0], side="left"))
+            if keep < self.count:
+                # Shrink the committed range first so a crash never exposes half-rewritten records
+                self._commit(keep)
+            self._write(HEADER_SIZE + keep * RECORD_SIZE, new_records.tobytes())
+            self._commit(keep + len(new_records))
+
+    def _commit(self, count: int) -> None:
+        """Publishes `count` records by rewriting the header's record count."""
+        self._write(COUNT_OFFSET, struct.pack("<Q", count))
+        self.count = count
+        self._map = None
+
+    def _write(self, offset: int, payload: bytes) -> None:
+        """Writes `payload` at `offset` and makes it durable before returning."""
+        self._file.seek(offset)
+        self._file.write(payload)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        """Closes the file handle; existing record views stay valid."""
+        with self._lock:
+            self._file.close()
+
+
+class HistoryStore:
+    """Directory of per-coin history files, opened on first use."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._files: Dict[str, HistoryFile] = {}
+        self._lock = threading.Lock()
+
+    def get(self, coin_id: str) -> HistoryFile:
+        """Returns (opening or creating) the history file for a coin."""
+        with self._lock:
+            history_file = self._files.get(coin_id)
+            if history_file is None:
+                safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", coin_id)
+                history_file = HistoryFile(self.directory / f"{safe_name}.bmh")
+                self._files[coin_id] = history_file
+            return history_file
+
+    def close(self):
+        """Closes every open history file."""
+        with self._lock:
+            for history_file in self._files.values():
+                history_file.close()
+            self._files.clear()
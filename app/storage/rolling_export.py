@@ -0,0 +1,154 @@
+# app/storage/rolling_export.py
+import atexit
+import csv
+import gzip
+import io
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from ..config import (AUTO_EXPORT_FORMAT, AUTO_EXPORT_ROTATE, AUTO_EXPORT_MAX_BYTES, AUTO_EXPORT_GZIP,
+                      AUTO_EXPORT_FSYNC_EVERY)
+
+EXPORT_FIELDS = ["fetched_at", "rank", "id", "symbol", "name", "price", "change_24h", "market_cap"]
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def encode_snapshot(coins: List[Dict], fetched_at: float, fmt: str, header: bool = False) -> str:
+    """Encodes one snapshot as CSV rows (plus the header row if `header`) or one JSON Lines record.
+
+    Shared by the rolling auto-export and the headless daemon's CSV/JSONL files.
+    """
+    fetched_at = round(fetched_at, 3)
+    if fmt == "jsonl":
+        rows = [{key: coin.get(key) for key in EXPORT_FIELDS[1:]} for coin in coins]
+        return json.dumps({"fetched_at": fetched_at, "coins": rows}) + "\n"
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows([fetched_at] + [coin.get(key) for key in EXPORT_FIELDS[1:]] for coin in coins)
+    return buffer.getvalue()
+
+
+class RollingExportSink:
+    """Appends every snapshot to rotating CSV or JSON Lines files.
+
+    Files rotate daily (`snapshots-YYYY-MM-DD.csv`) or once they reach `max_bytes`
+    (`snapshots-YYYY-MM-DD_HH-MM-SS-NNN.csv`, where the sequence number keeps files
+    rotated within the same second apart). Each snapshot is encoded once and appended
+    through a 1 MB buffer; the file is flushed and fsync'ed every `fsync_every`
+    snapshots and on close, so a crash loses at most that many snapshots. Compressed
+    files are gzip streams; appending after a restart starts a new gzip member, which
+    gzip readers concatenate transparently.
+    """
+
+    def __init__(self, directory: Path, fmt: str = AUTO_EXPORT_FORMAT, rotate: str = AUTO_EXPORT_ROTATE,
+                 max_bytes: int = AUTO_EXPORT_MAX_BYTES, compress: bool = AUTO_EXPORT_GZIP,
+                 fsync_every: int = AUTO_EXPORT_FSYNC_EVERY):
+        if fmt not in ("csv", "jsonl"):
+            raise ValueError(f"Unknown auto-export format: {fmt}")
+        if rotate not in ("day", "size"):
+            raise ValueError(f"Unknown auto-export rotation: {rotate}")
+        self.directory = Path(directory)
+        self.fmt = fmt
+        self.rotate = rotate
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.fsync_every = max(1, fsync_every)
+        self.path: Optional[Path] = None
+        self._raw = None          # buffered binary file
+        self._stream = None       # what rows are written to (the raw file or a GzipFile around it)
+        self._day = ""
+        self._needs_header = False
+        self._pending = 0         # snapshots written since the last fsync
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        atexit.register(self.close)
+
+    @property
+    def suffix(self) -> str:
+        return f".{self.fmt}" + (".gz" if self.compress else "")
+
+    def append(self, coins: List[Dict], fetched_at: Optional[float] = None) -> bool:
+        """Appends one snapshot; returns False if it could not be written."""
+        if not coins:
+            return False
+        fetched_at = fetched_at or time.time()
+        with self._lock:
+            try:
+                self._rotate_if_needed(fetched_at)
+                encoded = encode_snapshot(coins, fetched_at, self.fmt, header=self._needs_header)
+                self._stream.write(encoded.encode("utf-8"))
+                self._needs_header = False
+                self._pending += 1
+                if self._pending >= self.fsync_every:
+                    self._sync()
+                return True
+            except OSError as e:
+                print(f"Auto-export to {self.path} failed: {e}")
+                self._close_file()
+                return False
+
+    def close(self):
+        with self._lock:
+            try:
+                self._close_file()
+            except OSError as e:
+                print(f"Error closing auto-export file: {e}")
+
+    # ----- Rotation -----
+    def _rotate_if_needed(self, now: float):
+        day = time.strftime("%Y-%m-%d", time.localtime(now))
+        if self._raw is not None:
+            if self.rotate == "day" and day == self._day:
+                return
+            if self.rotate == "size" and self._raw.tell() < self.max_bytes:
+                return
+            self._close_file()
+        self._day = day
+        self._open(self._next_path(now))
+
+    def _next_path(self, now: float) -> Path:
+        if self.rotate == "day":
+            return self.directory / f"snapshots-{self._day}{self.suffix}"
+        # Size rotation: continue the newest file after a restart while it still has room
+        existing = sorted(self.directory.glob(f"snapshots-*_*{self.suffix}"))
+        if existing and self.path != existing[-1] and existing[-1].stat().st_size < self.max_bytes:
+            return existing[-1]
+        stamp = time.strftime("%Y-%m-%d_%H-%M-%S", time.localtime(now))
+        sequence = 0
+        while True:
+            path = self.directory / f"snapshots-{stamp}-{sequence:03d}{self.suffix}"
+            if not path.exists():
+                return path
+            sequence += 1
+
+    def _open(self, path: Path):
+        self.path = path
+        self._needs_header = not path.exists() or path.stat().st_size == 0
+        self._raw = open(path, "ab", buffering=WRITE_BUFFER_SIZE)
+        self._stream = gzip.GzipFile(fileobj=self._raw, mode="ab") if self.compress else self._raw
+
+    def _sync(self):
+        if self._stream is not self._raw:
+            self._stream.flush()  # zlib sync flush: everything so far is decodable
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._pending = 0
+
+    def _close_file(self):
+        if self._raw is None:
+            return
+        raw, stream = self._raw, self._stream
+        self._raw = self._stream = None
+        try:
+            if stream is not raw:
+                stream.close()  # writes the gzip trailer; leaves `raw` open
+            raw.flush()
+            os.fsync(raw.fileno())
+        finally:
+            raw.close()
+            self._pending = 0
@@ -0,0 +1,86 @@
+# app/storage/snapshot_store.py
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+from ..config import SNAPSHOT_DB_PATH
+
+
+class SnapshotStore:
+    """Append-only local time-series store of market snapshots (SQLite in WAL mode).
+
+    Every refresh is written as one batched transaction. Rows are clustered by
+    (coin_id, ts), so per-coin range queries for charts read contiguous pages.
+    """
+
+    def __init__(self, db_path: Path = SNAPSHOT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()  # one connection shared by GUI and worker threads
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # durable enough with WAL, far fewer fsyncs
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                coin_id    TEXT    NOT NULL,
+                ts         INTEGER NOT NULL,
+                rank       INTEGER,
+                price      REAL,
+                change_24h REAL,
+                market_cap REAL,
+                PRIMARY KEY (coin_id, ts)
+            ) WITHOUT ROWID
+        """)
+        # Secondary index for "whole snapshot at time T" queries
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_ts ON snapshots (ts)")
+        self._conn.commit()
+
+    def append_snapshot(self, coins: List[Dict], ts: Optional[int] = None) -> int:
+        """Appends one formatted snapshot in a single transaction. Returns rows written."""
+        ts = int(ts if ts is not None else time.time())
+        rows = [
+            (coin["id"], ts, coin.get("rank"), coin.get("price"),
+             coin.get("change_24h"), coin.get("market_cap"))
+            for coin in coins
+            if coin.get("id")
+        ]
+        if not rows:
+            return 0
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO snapshots (coin_id, ts, rank, price, change_24h, market_cap) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def get_price_series(self, coin_id: str, start_ts: Optional[int] = None,
+                         end_ts: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Returns (ts, price) rows for a coin within [start_ts, end_ts], oldest first."""
+        start_ts = 0 if start_ts is None else int(start_ts)
+        end_ts = 2 ** 62 if end_ts is None else int(end_ts)
+        with self._lock:
+            return self._conn.execute(
+                "SELECT ts, price FROM snapshots WHERE coin_id = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+                (coin_id, start_ts, end_ts)
+            ).fetchall()
+
+    def get_latest_snapshot(self) -> List[Dict]:
+        """Returns the most recent stored snapshot ordered by rank."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT coin_id, rank, price, change_24h, market_cap FROM snapshots "
+                "WHERE ts = (SELECT MAX(ts) FROM snapshots) ORDER BY rank"
+            ).fetchall()
+        return [
+            {"id": r[0], "rank": r[1], "price": r[2], "change_24h": r[3], "market_cap": r[4]}
+            for r in rows
+        ]
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,94 @@
+# app/storage/warm_start.py
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+from ..config import WARM_START_PATH, WARM_CHART_PATH
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_atomic(path: Path, payload: str) -> None:
+    """Replaces `path` with `payload` (temp file, fsync, rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class WarmStartCache:
+    """Persists the last good snapshot and chart series so the UI can render instantly on startup.
+
+    Files are always replaced atomically (write to a temp file, fsync, rename), so a
+    crash mid-write leaves the previous state intact. The chart series lives in its own
+    small file with its own lock, so saving it never rewrites (or waits for) the snapshot.
+    """
+
+    def __init__(self, path: Path = WARM_START_PATH, chart_path: Path = WARM_CHART_PATH):
+        self.path = Path(path)
+        self.chart_path = Path(chart_path)
+        self._lock = threading.Lock()
+        self._chart_lock = threading.Lock()
+        self._state: Dict[str, Any] = {}
+
+    def load(self) -> Dict[str, Any]:
+        """Reads the persisted state ({"coins", "fetched_at", "quotes", "currency", "chart"})."""
+        state = _read_json(self.path)
+        legacy_chart = state.pop("chart", None)  # older versions kept the chart in the snapshot file
+        with self._lock:
+            self._state = state
+        chart = _read_json(self.chart_path) or legacy_chart
+        return dict(state, chart=chart) if chart else dict(state)
+
+    def save_snapshot(self, coins: List[Dict], fetched_at: Optional[float] = None,
+                      quotes: Optional[Dict[str, Dict]] = None) -> None:
+        """Stores the latest formatted snapshot and, if given, its per-currency quotes
+        (so other currencies are available offline too)."""
+        changes = {"coins": coins, "fetched_at": fetched_at or time.time()}
+        if quotes is not None:
+            changes["quotes"] = quotes
+        self._update(changes)
+
+    def save_currency(self, currency: str) -> None:
+        self._update({"currency": currency})
+
+    def save_chart(self, coin: Dict, timestamps, prices) -> None:
+        """Stores the last displayed chart series with its coin (called off the GUI thread).
+
+        Series with millisecond timestamps (TimestampLabels) are stored as numbers, so no
+        label is formatted; other series keep their labels.
+        """
+        chart: Dict[str, Any] = {"coin": coin, "prices": [float(p) for p in prices]}
+        timestamps_ms = getattr(timestamps, "timestamps_ms", None)
+        if timestamps_ms is not None:
+            chart["timestamps_ms"] = [float(t) for t in timestamps_ms]
+        else:
+            chart["timestamps"] = [str(t) for t in timestamps]
+        payload = json.dumps(chart)
+        with self._chart_lock:
+            try:
+                _write_atomic(self.chart_path, payload)
+            except OSError as e:
+                print(f"Could not write warm start chart: {e}")
+
+    def _update(self, changes: Dict[str, Any]) -> None:
+        """Merges changes into the persisted state and rewrites the file atomically."""
+        with self._lock:
+            self._state.update(changes)
+            payload = json.dumps(self._state)
+            try:
+                _write_atomic(self.path, payload)
+            except OSError as e:
+                print(f"Could not write warm start cache: {e}")
@@ -0,0 +1,42 @@
+# app/utils/alert_notifier.py
+from typing import List
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QIcon
+from PySide6.QtWidgets import QSystemTrayIcon
+
+MAX_TRAY_LINES = 5
+
+
+class AlertNotifier(QObject):
+    """Shows fired alerts in the status bar and as a system tray notification.
+
+    `notify` may be called from any thread (alerts are evaluated in the refresh worker);
+    the alerts are delivered to the GUI thread through a queued signal.
+    """
+
+    triggered = Signal(list)  # List[Alert]
+
+    def __init__(self, status_bar, icon: QIcon, parent=None):
+        super().__init__(parent)
+        self.status_bar = status_bar
+        self.icon = icon
+        self.tray = None  # created on the first alert, and only where a tray exists
+        self.triggered.connect(self._show)
+
+    def notify(self, alerts: List) -> None:
+        self.triggered.emit(alerts)
+
+    def _show(self, alerts: List):
+        if not alerts:
+            return
+        self.status_bar.show_alerts([alert.message for alert in alerts])
+
+        if self.tray is None and QSystemTrayIcon.isSystemTrayAvailable():
+            self.tray = QSystemTrayIcon(self.icon, self)
+            self.tray.setToolTip("Blue Moon alerts")
+            self.tray.show()
+        if self.tray is not None and self.tray.supportsMessages():
+            lines = [alert.message for alert in alerts[:MAX_TRAY_LINES]]
+            if len(alerts) > MAX_TRAY_LINES:
+                lines.append(f"… and {len(alerts) - MAX_TRAY_LINES} more")
+            self.tray.showMessage("Blue Moon alert", "\n".join(lines), QSystemTrayIcon.MessageIcon.Warning, 10000)
@@ -1,16 +1,36 @@
 # app/utils/dialog.py
-from PySide6.QtWidgets import QFileDialog, QCheckBox, QVBoxLayout, QDialog, QDialogButtonBox
+from PySide6.QtWidgets import (QFileDialog, QCheckBox, QComboBox, QFormLayout, QVBoxLayout, QDialog,
+                               QDialogButtonBox)
 from PySide6.QtCore import QDateTime
+from .export_engine import EXPORT_FORMATS, available_formats
+
+SCOPE_SNAPSHOT = "snapshot"
+SCOPE_HISTORY = "history"
+
 
 class ExportDialog(QDialog):
     """Dialog for exporting data with options."""
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, selected_count: int = 0):
         super().__init__(parent)
         self.setWindowTitle("Export Data")
 
+        # Output format (Arrow only when pyarrow is installed)
+        self.format_combo = QComboBox()
+        for fmt in available_formats():
+            self.format_combo.addItem(EXPORT_FORMATS[fmt][0], fmt)
+
+        # What to export
+        self.scope_combo = QComboBox()
+        self.scope_combo.addItem("Current snapshot", SCOPE_SNAPSHOT)
+        coins = f"{selected_count} selected coins" if selected_count > 1 else (
+            "selected coin" if selected_count == 1 else "all listed coins")
+        self.scope_combo.addItem(f"Price history (7 days) of {coins}", SCOPE_HISTORY)
+
         # Checkbox for raw data export
         self.raw_checkbox = QCheckBox("Export raw data (no formatting)")
         self.raw_checkbox.setChecked(False)
+        self.format_combo.currentIndexChanged.connect(self._update_raw_checkbox)
+        self.scope_combo.currentIndexChanged.connect(self._update_raw_checkbox)
 
         # Buttons
         buttons = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
@@ -18,19 +38,35 @@ class ExportDialog(QDialog):
         buttons.rejected.connect(self.reject)
 
         # Layout
+        form = QFormLayout()
+        form.addRow("Export:", self.scope_combo)
+        form.addRow("Format:", self.format_combo)
         layout = QVBoxLayout(self)
+        layout.addLayout(form)
         layout.addWidget(self.raw_checkbox)
         layout.addWidget(buttons)
 
+    def _update_raw_checkbox(self):
+        """Formatting only applies to CSV snapshots; histories are always plain values."""
+        self.raw_checkbox.setEnabled(self.format_combo.currentData() == "csv"
+                                     and self.scope_combo.currentData() == SCOPE_SNAPSHOT)
+
     def get_options(self):
-        """Returns chosen file path + raw export flag."""
+        """Returns chosen file path, format, scope and raw export flag (path is empty if cancelled)."""
+        fmt = self.format_combo.currentData()
+        scope = self.scope_combo.currentData()
+        label, extension = EXPORT_FORMATS[fmt]
         timestamp = QDateTime.currentDateTime().toString("yyyy-MM-dd_HH-mm")
-        suggested_name = f"coins_{timestamp}.csv"
+        prefix = "history" if scope == SCOPE_HISTORY else "coins"
+        suggested_name = f"{prefix}_{timestamp}{extension}"
 
         file_path, _ = QFileDialog.getSaveFileName(
             self,
-            "Save CSV File",
+            f"Save {label} File",
             suggested_name,
-            "CSV Files (*.csv)"
+            f"{label} (*{extension})"
         )
-        return file_path, self.raw_checkbox.isChecked()
+        if file_path and not file_path.endswith(extension):
+            file_path += extension
+        raw = self.raw_checkbox.isChecked() and self.raw_checkbox.isEnabled()
+        return file_path, fmt, scope, raw
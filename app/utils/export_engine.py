@@ -0,0 +1,262 @@
+# app/utils/export_engine.py
+"""
+Streaming export of snapshots and price histories (no Qt; runs in any worker thread).
+
+Rows are written in chunks, and `progress(done, total)` is called after each chunk.
+Setting the `cancelled` event stops the export at the next chunk. Output goes to a
+temporary file that only replaces the target once the export completes, so a
+cancelled or failed export never leaves a truncated file behind.
+"""
+import csv
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from .formatting import DataFormatter
+
+ProgressCallback = Callable[[int, int], None]
+SNAPSHOT_FIELDS = ["id", "rank", "name", "symbol", "price", "change_24h", "market_cap"]
+CSV_HEADER = ["Rank", "Name (Symbol)", "Price", "24h %", "Market Cap"]
+
+# format key -> (label, file extension)
+EXPORT_FORMATS = {
+    "csv": ("CSV", ".csv"),
+    "jsonl": ("JSON Lines", ".jsonl"),
+    "npz": ("NumPy columns (.npz)", ".npz"),
+    "arrow": ("Arrow IPC", ".arrow"),
+}
+
+
+class ExportCancelled(Exception):
+    """Raised inside an export when its `cancelled` event is set."""
+
+
+def arrow_available() -> bool:
+    """True if pyarrow is installed (Arrow export is optional)."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_formats() -> List[str]:
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "arrow" or arrow_available()]
+
+
+def _chunks(total: int, size: int) -> Iterable[Tuple[int, int]]:
+    for start in range(0, total, size):
+        yield start, min(start + size, total)
+
+
+class _AtomicOutput:
+    """Context manager yielding a temp path that replaces `path` only on success."""
+
+    def __init__(self, path: os.PathLike):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + ".part")
+
+    def __enter__(self) -> Path:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return self.tmp_path
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+        else:
+            try:
+                os.remove(self.tmp_path)
+            except OSError:
+                pass
+        return False
+
+
+class _Progress:
+    """Chunk bookkeeping shared by the writers: progress reports and cancellation checks."""
+
+    def __init__(self, total: int, progress: Optional[ProgressCallback], cancelled: Optional[threading.Event]):
+        self.total = total
+        self.done = 0
+        self._progress = progress
+        self._cancelled = cancelled
+
+    def check(self):
+        if self._cancelled is not None and self._cancelled.is_set():
+            raise ExportCancelled()
+
+    def advance(self, count: int):
+        self.done += count
+        if self._progress is not None:
+            self._progress(self.done, self.total)
+        self.check()
+
+
+# ----- Snapshot export -----
+def _csv_rows(coins: Sequence[Dict], raw: bool, currency: str = "usd") -> List[Tuple]:
+    if raw:
+        return [(c.get("rank"), f"{c.get('name')} ({c.get('symbol')})", c.get("price"),
+                 c.get("change_24h"), c.get("market_cap")) for c in coins]
+    fmt = DataFormatter
+    return [(c.get("rank"), f"{c.get('name')} ({c.get('symbol')})", fmt.format_price(c["price"], currency),
+             fmt.format_percentage_change(c["change_24h"]), fmt.format_currency(c["market_cap"], currency))
+            for c in coins]
+
+
+def _snapshot_columns(coins: Sequence[Dict], tracker: _Progress, chunk_size: int) -> Dict[str, np.ndarray]:
+    """Builds one array per field, filling them chunk by chunk."""
+    n = len(coins)
+    columns = {
+        "rank": np.zeros(n, dtype=np.int64),
+        "price": np.full(n, np.nan),
+        "change_24h": np.full(n, np.nan),
+        "market_cap": np.full(n, np.nan),
+    }
+    text = {"id": [], "name": [], "symbol": []}
+    for start, end in _chunks(n, chunk_size):
+        chunk = coins[start:end]
+        columns["rank"][start:end] = [c.get("rank") or 0 for c in chunk]
+        for key in ("price", "change_24h", "market_cap"):
+            columns[key][start:end] = [np.nan if c.get(key) is None else c[key] for c in chunk]
+        for key, values in text.items():
+            values.extend(str(c.get(key, "")) for c in chunk)
+        tracker.advance(len(chunk))
+    columns.update({key: np.array(values, dtype=str) for key, values in text.items()})
+    return columns
+
+
+def export_snapshot(path: os.PathLike, coins: Sequence[Dict], fmt: str = "csv", raw: bool = False,
+                    chunk_size: int = 1000, progress: Optional[ProgressCallback] = None,
+                    cancelled: Optional[threading.Event] = None, currency: str = "usd") -> int:
+    """Writes a snapshot of formatted coins; returns the number of rows written.
+
+    `raw` and `currency` only affect CSV (the other formats always store plain values).
+    """
+    tracker = _Progress(len(coins), progress, cancelled)
+    tracker.check()
+    with _AtomicOutput(path) as tmp_path:
+        if fmt == "csv":
+            with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(CSV_HEADER)
+                for start, end in _chunks(len(coins), chunk_size):
+                    writer.writerows(_csv_rows(coins[start:end], raw, currency))
+                    tracker.advance(end - start)
+        elif fmt == "jsonl":
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for start, end in _chunks(len(coins), chunk_size):
+                    lines = (json.dumps({key: c.get(key) for key in SNAPSHOT_FIELDS}) for c in coins[start:end])
+                    f.write("\n".join(lines) + "\n")
+                    tracker.advance(end - start)
+        elif fmt == "npz":
+            columns = _snapshot_columns(coins, tracker, chunk_size)
+            with open(tmp_path, "wb") as f:
+                np.savez_compressed(f, **columns)
+        elif fmt == "arrow":
+            import pyarrow as pa
+            schema = pa.schema([("id", pa.string()), ("rank", pa.int64()), ("name", pa.string()),
+                                ("symbol", pa.string()), ("price", pa.float64()),
+                                ("change_24h", pa.float64()), ("market_cap", pa.float64())])
+            with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+                for start, end in _chunks(len(coins), chunk_size):
+                    chunk = coins[start:end]
+                    writer.write_batch(pa.record_batch(
+                        [[c.get(field) for c in chunk] for field in schema.names], schema=schema))
+                    tracker.advance(end - start)
+        else:
+            raise ValueError(f"Unknown export format: {fmt}")
+    return tracker.done
+
+
+# ----- Bulk history export -----
+HistoryFetcher = Callable[[str], Optional[np.ndarray]]  # coin id -> (n, 2) [ts_ms, price] or None
+
+
+class _HistoryWriter:
+    """Appends one coin's (ts_ms, price) rows at a time in long format."""
+
+    def __init__(self, tmp_path: Path, fmt: str):
+        self.fmt = fmt
+        self._parts: List[Tuple[str, np.ndarray]] = []
+        if fmt == "csv":
+            self._file = open(tmp_path, "w", newline="", encoding="utf-8")
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(["coin_id", "timestamp_ms", "price"])
+        elif fmt == "jsonl":
+            self._file = open(tmp_path, "w", encoding="utf-8")
+        elif fmt == "npz":
+            self._file = open(tmp_path, "wb")
+        elif fmt == "arrow":
+            import pyarrow as pa
+            self._schema = pa.schema([("coin_id", pa.string()), ("timestamp_ms", pa.int64()), ("price", pa.float64())])
+            self._file = pa.OSFile(str(tmp_path), "wb")
+            self._arrow = pa.ipc.new_file(self._file, self._schema)
+        else:
+            raise ValueError(f"Unknown export format: {fmt}")
+
+    def write(self, coin_id: str, series: np.ndarray):
+        ts = series[:, 0].astype(np.int64)
+        prices = series[:, 1]
+        if self.fmt == "csv":
+            self._csv.writerows(zip([coin_id] * len(ts), ts.tolist(), prices.tolist()))
+        elif self.fmt == "jsonl":
+            lines = (json.dumps({"coin_id": coin_id, "timestamp_ms": t, "price": p})
+                     for t, p in zip(ts.tolist(), prices.tolist()))
+            self._file.write("\n".join(lines) + "\n")
+        elif self.fmt == "npz":
+            self._parts.append((coin_id, np.column_stack((ts, prices))))
+        else:
+            import pyarrow as pa
+            self._arrow.write_batch(pa.record_batch([[coin_id] * len(ts), ts, prices], schema=self._schema))
+
+    def close(self):
+        if self.fmt == "npz":
+            ids = np.array([coin_id for coin_id, part in self._parts for _ in range(len(part))], dtype=str)
+            stacked = np.concatenate([part for _, part in self._parts]) if self._parts else np.empty((0, 2))
+            np.savez_compressed(self._file, coin_id=ids, timestamp_ms=stacked[:, 0].astype(np.int64),
+                                price=stacked[:, 1])
+        elif self.fmt == "arrow":
+            self._arrow.close()
+        self._file.close()
+
+
+def export_histories(path: os.PathLike, coin_ids: Sequence[str], fetch: HistoryFetcher, fmt: str = "csv",
+                     max_workers: int = 4, progress: Optional[ProgressCallback] = None,
+                     cancelled: Optional[threading.Event] = None) -> Tuple[int, List[str]]:
+    """Fetches the histories of `coin_ids` concurrently and writes them to one long-format file.
+
+    Fetches run on a small thread pool; rows are written by the calling thread as each
+    fetch completes. Returns (coins written, coin ids that could not be fetched).
+    """
+    tracker = _Progress(len(coin_ids), progress, cancelled)
+    tracker.check()
+    failed: List[str] = []
+    written = 0
+    with _AtomicOutput(path) as tmp_path:
+        writer = _HistoryWriter(tmp_path, fmt)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="history-export") as pool:
+                futures = {pool.submit(fetch, coin_id): coin_id for coin_id in coin_ids}
+                try:
+                    for future in as_completed(futures):
+                        coin_id = futures[future]
+                        try:
+                            series = future.result()
+                        except Exception as e:  # one failing coin must not abort the export
+                            print(f"History export failed for {coin_id}: {e}")
+                            series = None
+                        if series is None or len(series) == 0:
+                            failed.append(coin_id)
+                        else:
+                            writer.write(coin_id, series)
+                            written += 1
+                        tracker.advance(1)
+                except ExportCancelled:
+                    for future in futures:
+                        future.cancel()  # drop fetches that have not started yet
+                    raise
+        finally:
+            writer.close()
+    return written, failed
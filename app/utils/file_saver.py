@@ -1,7 +1,6 @@
 # app/utils/file_saver.py
-import csv
 from typing import List, Dict
-from app.utils.formatting import DataFormatter
+from app.utils.export_engine import export_snapshot
 
 class FileSaver:
     """Utility class for saving data to files."""
@@ -12,33 +11,7 @@ class FileSaver:
             return False
 
         try:
-            with open(file_path, mode="w", newline="", encoding="utf-8") as f:
-                """"Write CSV header and rows."""
-                fieldnames = ["Rank", "Name (Symbol)", "Price", "24h %", "Market Cap"]
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-
-                for coin in data:
-                    if raw:
-                        # Plain values for machine use
-                        formatted_coin = {
-                            "Rank": coin.get("rank"),
-                            "Name (Symbol)": f"{coin.get('name')} ({coin.get('symbol')})",
-                            "Price": coin.get("price"),
-                            "24h %": coin.get("change_24h"),
-                            "Market Cap": coin.get("market_cap"),
-                        }
-                    else:
-                        # Human-friendly formatting
-                        formatted_coin = {
-                            "Rank": coin.get("rank"),
-                            "Name (Symbol)": f"{coin.get('name')} ({coin.get('symbol')})",
-                            "Price": DataFormatter.format_price(coin["price"]),
-                            "24h %": DataFormatter.format_percentage_change(coin["change_24h"]),
-                            "Market Cap": DataFormatter.format_currency(coin["market_cap"]),
-                        }
-                    writer.writerow(formatted_coin)
-
+            export_snapshot(file_path, data, fmt="csv", raw=raw)
             return True
         except Exception as e:
             print(f"❌ Error saving CSV: {e}")
@@ -1,6 +1,59 @@
 # app/utils/formatting.py
-from typing import List, Dict, Any
+from typing import List, Dict, Any, NamedTuple, Sequence
 import datetime
+import numpy as np
+
+
+class CurrencyFormat(NamedTuple):
+    symbol: str
+    symbol_after: bool   # "1.234,56 €" rather than "$1,234.56"
+    thousands: str
+    decimal: str
+    decimals: int        # decimals for amounts >= 1
+
+
+# Locale conventions of the quote currencies' home markets
+CURRENCY_FORMATS = {
+    "usd": CurrencyFormat("$", False, ",", ".", 2),
+    "eur": CurrencyFormat("€", True, ".", ",", 2),
+    "jpy": CurrencyFormat("¥", False, ",", ".", 0),
+    "btc": CurrencyFormat("₿", False, ",", ".", 4),
+}
+
+
+def currency_format(currency: str) -> CurrencyFormat:
+    """Formatting conventions for `currency` (unknown codes are written after the amount)."""
+    return CURRENCY_FORMATS.get(currency) or CurrencyFormat(currency.upper(), True, ",", ".", 2)
+
+
+def _with_currency(amount: float, decimals: int, currency: str, suffix: str = "") -> str:
+    fmt = currency_format(currency)
+    text = f"{amount:,.{decimals}f}"
+    if fmt.thousands != "," or fmt.decimal != ".":
+        text = text.translate(str.maketrans({",": fmt.thousands, ".": fmt.decimal}))
+    text += suffix
+    return f"{text} {fmt.symbol}" if fmt.symbol_after else f"{fmt.symbol}{text}"
+
+
+class TimestampLabels(Sequence):
+    """Lazily formatted date labels over a millisecond timestamp array.
+
+    Charts only format the few labels (and tooltip) they actually draw, so long
+    memory-mapped histories are never converted into lists of strings.
+    """
+
+    def __init__(self, timestamps_ms: np.ndarray, fmt: str = "%b %d"):
+        self.timestamps_ms = timestamps_ms
+        self.fmt = fmt
+
+    def __len__(self) -> int:
+        return len(self.timestamps_ms)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TimestampLabels(self.timestamps_ms[index], self.fmt)
+        return datetime.datetime.fromtimestamp(self.timestamps_ms[index] / 1000).strftime(self.fmt)
+
 
 class DataFormatter:
     """A utility class for formatting cryptocurrency data."""
@@ -16,36 +69,71 @@ class DataFormatter:
                 "symbol": coin.get('symbol', '').upper(),
                 "price": coin.get('current_price', 0.0),
                 "change_24h": coin.get('price_change_percentage_24h', 0.0),
-                "market_cap": coin.get('market_cap', 0)
+                "market_cap": coin.get('market_cap', 0),
+                "sparkline": (coin.get('sparkline_in_7d') or {}).get('price', [])
             }
             for coin in raw_coins
         ]
 
     @staticmethod
-    def format_currency(value: float) -> str:
+    def format_quotes(raw_quotes: Dict[str, Dict], currencies: List[str]) -> Dict[str, Dict[str, Dict]]:
+        """Splits a multi-currency /simple/price response into currency -> coin id -> quote."""
+        quotes: Dict[str, Dict[str, Dict]] = {currency: {} for currency in currencies}
+        for coin_id, values in raw_quotes.items():
+            for currency in currencies:
+                price = values.get(currency)
+                if price is None:
+                    continue
+                quotes[currency][coin_id] = {
+                    "price": price,
+                    "market_cap": values.get(f"{currency}_market_cap"),
+                    "change_24h": values.get(f"{currency}_24h_change"),
+                }
+        return quotes
+
+    @staticmethod
+    def format_currency(value: float, currency: str = "usd") -> str:
         """Formats large numbers into human-readable strings with suffixes."""
         if not isinstance(value, (int, float)) or value <= 0:
             return "N/A"
         
         if value >= 1_000_000_000_000:
-            return f"${value/1_000_000_000_000:,.2f} T"
+            return _with_currency(value / 1_000_000_000_000, 2, currency, " T")
         if value >= 1_000_000_000:
-            return f"${value/1_000_000_000:,.2f} B"
+            return _with_currency(value / 1_000_000_000, 2, currency, " B")
         if value >= 1_000_000:
-            return f"${value/1_000_000:,.2f} M"
-        return f"${value:,.2f}"
+            return _with_currency(value / 1_000_000, 2, currency, " M")
+        return _with_currency(value, 2, currency)
 
     @staticmethod
-    def format_price(price: float) -> str:
+    def format_price(price: float, currency: str = "usd") -> str:
         """Formats price with appropriate decimal places based on magnitude."""
         if not isinstance(price, (int, float)) or price <= 0:
             return "N/A"
         
         if price >= 1.0:
-            return f"${price:,.2f}"
+            return _with_currency(price, currency_format(currency).decimals, currency)
         if price < 0.000001:
-            return f"${price:,.8f}" # Show more precision for very small values
-        return f"${price:,.6f}"
+            return _with_currency(price, 8 if price >= 1e-8 else 10, currency)  # Show more precision for very small values
+        return _with_currency(price, 6, currency)
+
+    @staticmethod
+    def format_amount(value: float, currency: str = "usd", signed: bool = False) -> str:
+        """Formats a money amount that may be zero or negative (holding values, P&L).
+
+        Precision follows `format_price`; with `signed`, positive amounts get a "+".
+        """
+        if not isinstance(value, (int, float)):
+            return "N/A"
+        magnitude = abs(value)
+        if magnitude >= 1.0 or magnitude == 0:
+            decimals = currency_format(currency).decimals
+        elif magnitude < 0.000001:
+            decimals = 8 if magnitude >= 1e-8 else 10
+        else:
+            decimals = 6
+        sign = "-" if value < 0 else ("+" if signed and value > 0 else "")
+        return sign + _with_currency(magnitude, decimals, currency)
 
     @staticmethod
     def format_percentage_change(change: float) -> str:
@@ -55,15 +143,39 @@ class DataFormatter:
         return f"{change:+.2f}%"
     
     @staticmethod
-    def format_coin_history(raw_history: Dict[str, Any]) -> Dict[str, List]:
+    def history_to_records(raw_history: Dict[str, Any]) -> np.ndarray:
+        """Convert a /market_chart response into an (n, 3) float64 array of ts (ms), price, volume."""
+        prices = np.asarray(raw_history.get("prices") or [], dtype=np.float64).reshape(-1, 2)
+        volumes = np.asarray(raw_history.get("total_volumes") or [], dtype=np.float64).reshape(-1, 2)
+
+        records = np.full((len(prices), 3), np.nan)
+        records[:, :2] = prices
+        if len(volumes) == len(prices):
+            records[:, 2] = volumes[:, 1]
+        return records[np.argsort(records[:, 0], kind="stable")]
+
+    @staticmethod
+    def format_history_records(records: np.ndarray) -> Dict[str, Any]:
+        """Format history records into lazy date labels and a zero-copy price column view."""
+        return {"timestamps": TimestampLabels(records[:, 0]), "prices": records[:, 1]}
+
+    @staticmethod
+    def format_coin_history(raw_history: Dict[str, Any]) -> Dict[str, Any]:
         """Format 7-day historical data into timestamps and prices."""
-        prices = raw_history.get("prices", [])
-        
-        # Extract timestamps (ms) and price
+        return DataFormatter.format_history_records(DataFormatter.history_to_records(raw_history))
+
+    @staticmethod
+    def format_local_history(rows: List) -> Dict[str, List]:
+        """Format (ts seconds, price) rows from the local snapshot store into timestamps and prices."""
         timestamps = [
-            datetime.datetime.fromtimestamp(p[0] / 1000).strftime("%b %d")
-            for p in prices
+            datetime.datetime.fromtimestamp(ts).strftime("%H:%M")
+            for ts, _ in rows
         ]
-        values = [p[1] for p in prices]
+        values = [price for _, price in rows]
+
+        return {"timestamps": timestamps, "prices": values}
 
-        return {"timestamps": timestamps, "prices": values}
\ No newline at end of file
+    @staticmethod
+    def format_coin_ohlc(candles) -> Dict[str, Any]:
+        """Format an (n, 5) OHLC candle array into date labels and the OHLC columns."""
+        return {"timestamps": TimestampLabels(candles[:, 0]), "ohlc": candles[:, 1:5]}
@@ -1,17 +1,24 @@
 from PySide6.QtWidgets import QWidget
-from PySide6.QtCore import Qt, QRectF, QPointF
-from PySide6.QtGui import QPainter, QColor, QPen, QFont, QBrush
-from typing import List, Tuple, Optional
+from PySide6.QtCore import Qt, QRectF, QPointF, QLineF
+from PySide6.QtGui import QPainter, QFont, QPolygonF
+from typing import List, Tuple, Optional, Dict, Sequence
+import numpy as np
+from .tracing import tracer
+from .theme import ThemePalette, theme
 
 
 class ChartWidget(QWidget):
     """A custom QWidget to display a 7-day price chart for a cryptocurrency.
-    Supports light/dark themes and hover tooltips."""
+    Supports line and candlestick modes, light/dark themes and hover tooltips."""
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.data: Optional[Tuple[List[str], List[float]]] = None
+        self.candles: Optional[np.ndarray] = None  # (n, 4) open/high/low/close, candle mode only
+        self.indicators: Dict[str, np.ndarray] = {}  # indicator overlays, line mode only
+        self.live_price: Optional[float] = None  # latest streamed/polled price, line mode only
         self.coin_name: str = ""
+        self.range_label: str = "7-Day"
         self.is_dark: bool = False
         self.setMinimumSize(400, 300)
         self.setMouseTracking(True)
@@ -31,18 +38,50 @@ class ChartWidget(QWidget):
             }
         """)
         
-    def set_chart_data(self, timestamps: List[str], prices: List[float], coin_name: str) -> None:
-        """Set the chart data to display."""
-        if not timestamps or not prices or len(timestamps) != len(prices):
+    def set_chart_data(self, timestamps: Sequence[str], prices: Sequence[float], coin_name: str) -> None:
+        """Set the chart data to display (lists or zero-copy NumPy views)."""
+        if len(timestamps) == 0 or len(prices) == 0 or len(timestamps) != len(prices):
             print("Invalid chart data received")
             return
             
         self.data = (timestamps, prices)
+        self.candles = None
+        self.indicators = {}
+        self.live_price = None
+        self.coin_name = coin_name
+        self.points = []
+        self.hover_index = -1
+        self.update()
+
+    def set_candle_data(self, timestamps: List[str], ohlc: np.ndarray, coin_name: str) -> None:
+        """Set OHLC candles (an (n, 4) open/high/low/close array) to display."""
+        if not timestamps or len(timestamps) != len(ohlc):
+            print("Invalid candle data received")
+            return
+
+        # Close prices double as the hover/tooltip series
+        self.data = (timestamps, ohlc[:, 3].tolist())
+        self.candles = ohlc
         self.coin_name = coin_name
         self.points = []
         self.hover_index = -1
         self.update()
         
+    def set_indicators(self, indicators: Dict[str, np.ndarray]) -> None:
+        """Set the indicator overlays (SMA/EMA/BB/RSI arrays aligned with the prices)."""
+        self.indicators = {
+            name: values for name, values in indicators.items()
+            if values is not None and len(values) == len(self.data[1] if self.data else [])
+        }
+        self.update()
+
+    def set_live_price(self, price: Optional[float]) -> None:
+        """Set the latest price, drawn as a dashed marker across the line chart."""
+        if price == self.live_price:
+            return
+        self.live_price = price if isinstance(price, (int, float)) and price > 0 else None
+        self.update()
+
     def set_theme(self, is_dark: bool) -> None:
         """Set the theme (light/dark mode)."""
         self.is_dark = is_dark
@@ -67,7 +106,12 @@ class ChartWidget(QWidget):
         if closest_index != -1 and min_dist < 400:
             self.hover_index = closest_index
             timestamps, prices = self.data
-            tooltip_text = f"Date: {timestamps[closest_index]}\nPrice: ${prices[closest_index]:.6f}"  # Show more decimals for stablecoins
+            if self.candles is not None:
+                o, h, l, c = self.candles[closest_index]
+                tooltip_text = (f"Date: {timestamps[closest_index]}\n"
+                                f"Open: ${o:.6f}\nHigh: ${h:.6f}\nLow: ${l:.6f}\nClose: ${c:.6f}")
+            else:
+                tooltip_text = f"Date: {timestamps[closest_index]}\nPrice: ${prices[closest_index]:.6f}"  # Show more decimals for stablecoins
             self.setToolTip(tooltip_text)
         else:
             self.hover_index = -1
@@ -91,30 +135,26 @@ class ChartWidget(QWidget):
         
         # Get data with validation
         timestamps, prices = self.data
-        if not timestamps or not prices or len(timestamps) != len(prices):
+        if len(timestamps) == 0 or len(prices) == 0 or len(timestamps) != len(prices):
             return
         
         # Draw the chart
-        self.points = self._draw_chart(painter, timestamps, prices)
+        with tracer.span("chart.paint", "view", points=len(prices)):
+            if self.candles is not None:
+                self.points = self._draw_candles(painter, timestamps, self.candles)
+            else:
+                self.points = self._draw_chart(painter, timestamps, prices)
         painter.end()
 
-    def _draw_chart(self, painter: QPainter, timestamps: List[str], prices: List[float]) -> List[QPointF]:
+    def _draw_chart(self, painter: QPainter, timestamps: Sequence[str], prices: Sequence[float]) -> List[QPointF]:
         """Internal method to draw the chart."""
-        # Setup colors based on theme
-        if self.is_dark:
-            bg_color = QColor("#1e293b")
-            text_color = QColor("#e2e8f0")
-            grid_color = QColor("#475569")
-            line_color = QColor("#60a5fa")
-            hover_color = QColor("#90cdf4")
-            stablecoin_line_color = QColor("#94a3b8")
-        else:
-            bg_color = QColor("#ffffff")
-            text_color = QColor("#1a2a3a")
-            grid_color = QColor("#adb5be")
-            line_color = QColor("#2c5bdc")
-            hover_color = QColor("#2563eb")
-            stablecoin_line_color = QColor("#64748b")
+        # Read list or memory-mapped series through one (zero-copy for arrays) float view
+        prices = np.asarray(prices, dtype=np.float64)
+        # Colors, brushes and pens come prebuilt from the theme's palette
+        palette = theme.palette(self.is_dark)
+        colors = palette.colors
+        bg_color = colors["bg"]
+        text_color = colors["text"]
         
         # Fill background
         painter.fillRect(0, 0, self.width(), self.height(), bg_color)
@@ -127,8 +167,8 @@ class ChartWidget(QWidget):
         # STABLECOIN DETECTION - Check if this is essentially a stablecoin
         is_stablecoin = False
         if len(prices) > 1:
-            price_range_val = max(prices) - min(prices)
-            avg_price = sum(prices) / len(prices)
+            price_range_val = float(prices.max() - prices.min())
+            avg_price = float(prices.mean())
             # If price moves less than 2% total and average is near $1, treat as stablecoin
             if price_range_val < 0.02 and 0.98 < avg_price < 1.02:
                 is_stablecoin = True
@@ -140,16 +180,22 @@ class ChartWidget(QWidget):
             price_range = max_price - min_price
             
             # Draw stablecoin indicator line at $1.00
-            dash_pen = QPen(stablecoin_line_color, 1, Qt.PenStyle.DashLine)
-            painter.setPen(dash_pen)
+            painter.setPen(palette.pen("stablecoin_line", 1, Qt.PenStyle.DashLine))
         else:
             # Normal price calculation
             try:
-                min_price = min(prices)
-                max_price = max(prices)
-                price_range = max(max_price - min_price, 0.001)  # Avoid division by zero
+                min_price = float(prices.min())
+                max_price = float(prices.max())
             except (ValueError, TypeError):
                 return []
+
+            # Make room for price overlays (e.g. Bollinger bands outside the price range)
+            for name in ("SMA", "EMA", "BB"):
+                overlay = self.indicators.get(name)
+                if overlay is not None and not np.all(np.isnan(overlay)):
+                    min_price = min(min_price, float(np.nanmin(overlay)))
+                    max_price = max(max_price, float(np.nanmax(overlay)))
+            price_range = max(max_price - min_price, 0.001)  # Avoid division by zero
         
         # Calculate maximum label width needed for Y-axis
         max_label_width = 0
@@ -168,6 +214,9 @@ class ChartWidget(QWidget):
         # Calculate chart area with dynamic margins
         margin_top = 50
         margin_bottom = 50
+        rsi_height = 70 if "RSI" in self.indicators else 0
+        if rsi_height:
+            margin_bottom += rsi_height + 30  # RSI panel below the date labels
         margin_left = y_axis_margin  # Dynamic left margin based on label width
         margin_right = 20
         
@@ -184,17 +233,19 @@ class ChartWidget(QWidget):
             painter.drawLine(chart_rect.left(), center_y, chart_rect.right(), center_y)
             
         # Draw grid
-        grid_pen = QPen(grid_color, 1, Qt.PenStyle.DotLine)
-        painter.setPen(grid_pen)
+        painter.setPen(palette.pen("grid", 1, Qt.PenStyle.DotLine))
         
         # Horizontal grid lines
         for i in range(5):
             y = chart_rect.bottom() - (i / 4) * chart_rect.height()
             painter.drawLine(chart_rect.left(), y, chart_rect.right(), y)
             
+        # Long (e.g. locally recorded intraday) series only get every n-th grid line and label
+        label_step = max(1, len(timestamps) // 8)
+
         # Vertical grid lines - only if we have reasonable data
         if len(timestamps) > 1:
-            for i in range(len(timestamps)):
+            for i in range(0, len(timestamps), label_step):
                 x = chart_rect.left() + (i / (len(timestamps) - 1)) * chart_rect.width()
                 painter.drawLine(x, chart_rect.top(), x, chart_rect.bottom())
         
@@ -219,45 +270,47 @@ class ChartWidget(QWidget):
                             label_text)
         
         # Draw date labels - with bounds checking
-        for i, date_str in enumerate(timestamps):
-            if i >= len(timestamps):  # Safety check
-                break
+        for i in range(0, len(timestamps), label_step):
+            date_str = timestamps[i]
             x = chart_rect.left() + (i / max(len(timestamps) - 1, 1)) * chart_rect.width()
             painter.drawText(QRectF(x - 25, chart_rect.bottom() + 5, 50, 20),
                             Qt.AlignmentFlag.AlignCenter,
                             str(date_str)[:10])  # Limit string length
         
         # Draw price line and store points for hover detection
-        line_pen = QPen(line_color, 2)
-        painter.setPen(line_pen)
+        painter.setPen(palette.pen("line", 2))
         
-        points = []
-        for i, price in enumerate(prices):
-            if i >= len(prices):  # Safety check
-                break
-            x = chart_rect.left() + (i / max(len(prices) - 1, 1)) * chart_rect.width()
-            y = chart_rect.bottom() - ((price - min_price) / price_range) * chart_rect.height()
-            point = QPointF(x, y)
-            points.append(point)
-            
-        # Draw the line with bounds checking
-        for i in range(len(points) - 1):
-            if i + 1 < len(points):
-                painter.drawLine(points[i], points[i + 1])
+        xs = chart_rect.left() + np.arange(len(prices)) / max(len(prices) - 1, 1) * chart_rect.width()
+        ys = chart_rect.bottom() - ((prices - min_price) / price_range) * chart_rect.height()
+        points = [QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+
+        # Draw the line in a single call
+        painter.drawPolyline(QPolygonF(points))
         
+        # Draw indicator overlays
+        if self.indicators:
+            self._draw_indicators(painter, chart_rect, min_price, price_range, rsi_height, palette)
+
+        # Live price marker (only when it falls inside the visible range)
+        if self.live_price is not None and min_price <= self.live_price <= min_price + price_range:
+            live_y = chart_rect.bottom() - ((self.live_price - min_price) / price_range) * chart_rect.height()
+            painter.setPen(palette.pen("hover", 1, Qt.PenStyle.DashLine))
+            painter.drawLine(QLineF(chart_rect.left(), live_y, chart_rect.right(), live_y))
+            painter.drawText(QRectF(chart_rect.right() - 120, live_y - 18, 118, 16),
+                             Qt.AlignmentFlag.AlignRight, f"${self.live_price:,.2f}")
+
         # Draw data points
-        point_pen = QPen(line_color, 2)
-        painter.setPen(point_pen)
+        painter.setPen(palette.pen("line", 2))
         
         for i, point in enumerate(points):
             if i >= len(points):  # Safety check
                 break
             # Draw larger point for hover
             if i == self.hover_index:
-                painter.setBrush(QBrush(hover_color))
+                painter.setBrush(palette.brushes["hover"])
                 painter.drawEllipse(point, 6, 6)
-            else:
-                painter.setBrush(QBrush(line_color))
+            elif len(points) <= 100:  # dense series only mark the hovered point
+                painter.setBrush(palette.brushes["line"])
                 painter.drawEllipse(point, 3, 3)
         
         # Draw title with stablecoin indicator if applicable
@@ -267,7 +320,7 @@ class ChartWidget(QWidget):
         painter.setPen(text_color)
 
         # Set title with stablecoin note if applicable
-        title = f"{self.coin_name} - 7-Day Price (USD)"
+        title = f"{self.coin_name} - {self.range_label} Price (USD)"
         if is_stablecoin:
             title += " (Stablecoin)"
             
@@ -276,4 +329,140 @@ class ChartWidget(QWidget):
                         Qt.AlignmentFlag.AlignCenter,
                         title)
         
-        return points
\ No newline at end of file
+        return points
+
+    def _draw_indicators(self, painter: QPainter, chart_rect: QRectF, min_price: float,
+                         price_range: float, rsi_height: int, palette: ThemePalette) -> None:
+        """Internal method to draw indicator overlays as one polyline per series."""
+        count = len(self.data[1])
+        xs = chart_rect.left() + np.arange(count) / max(count - 1, 1) * chart_rect.width()
+
+        def polyline(values: np.ndarray, to_y) -> None:
+            valid = ~np.isnan(values)
+            if valid.sum() > 1:
+                ys = to_y(values[valid])
+                painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs[valid], ys)]))
+
+        def price_y(values: np.ndarray) -> np.ndarray:
+            return chart_rect.bottom() - ((values - min_price) / price_range) * chart_rect.height()
+
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        for name in ("SMA", "EMA"):
+            if name in self.indicators:
+                painter.setPen(palette.pen(name, 1.5))
+                polyline(self.indicators[name], price_y)
+
+        if "BB" in self.indicators:
+            bands = self.indicators["BB"]
+            painter.setPen(palette.pen("BB", 1, Qt.PenStyle.DashLine))
+            polyline(bands[:, 1], price_y)
+            polyline(bands[:, 2], price_y)
+            painter.setPen(palette.pen("BB", 1))
+            polyline(bands[:, 0], price_y)
+
+        if rsi_height:
+            # RSI panel (0-100) with 30/70 guides under the date labels
+            panel = QRectF(chart_rect.left(), chart_rect.bottom() + 30, chart_rect.width(), rsi_height)
+
+            def rsi_y(values: np.ndarray) -> np.ndarray:
+                return panel.bottom() - (values / 100.0) * panel.height()
+
+            painter.setPen(palette.pen("grid", 1, Qt.PenStyle.DotLine))
+            painter.drawRect(panel)
+            for level in (30, 70):
+                y = float(rsi_y(np.array([level]))[0])
+                painter.drawLine(QPointF(panel.left(), y), QPointF(panel.right(), y))
+            painter.setPen(palette.colors["text"])
+            painter.drawText(QRectF(0, panel.top(), panel.left() - 5, 20),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                             "RSI")
+            painter.setPen(palette.pen("RSI", 1.5))
+            polyline(self.indicators["RSI"], rsi_y)
+
+    def _draw_candles(self, painter: QPainter, timestamps: List[str], ohlc: np.ndarray) -> List[QPointF]:
+        """Internal method to draw a candlestick chart.
+
+        Candle geometry is computed with NumPy and drawn in batches: one drawLines call
+        for the wicks and one drawRects call for the bodies of each direction.
+        """
+        palette = theme.palette(self.is_dark)
+        colors = palette.colors
+        painter.fillRect(0, 0, self.width(), self.height(), colors["bg"])
+
+        font = QFont()
+        font.setPointSize(8)
+        painter.setFont(font)
+
+        min_price = float(ohlc[:, 2].min())
+        max_price = float(ohlc[:, 1].max())
+        price_range = max(max_price - min_price, 0.001)  # Avoid division by zero
+
+        # Left margin sized to the widest Y-axis label
+        labels = [f"${min_price + (i / 4) * price_range:,.2f}" for i in range(5)]
+        margin_left = max(painter.fontMetrics().horizontalAdvance(t) for t in labels) + 20
+        chart_rect = QRectF(margin_left, 50,
+                            self.width() - margin_left - 20,
+                            self.height() - 100)
+        if chart_rect.width() <= 0 or chart_rect.height() <= 0:
+            return []
+
+        # Grid and Y-axis labels
+        painter.setPen(palette.pen("grid", 1, Qt.PenStyle.DotLine))
+        for i in range(5):
+            y = chart_rect.bottom() - (i / 4) * chart_rect.height()
+            painter.drawLine(QPointF(chart_rect.left(), y), QPointF(chart_rect.right(), y))
+        painter.setPen(colors["text"])
+        for i, label_text in enumerate(labels):
+            y = chart_rect.bottom() - (i / 4) * chart_rect.height()
+            painter.drawText(QRectF(0, y - 10, margin_left - 5, 20),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                             label_text)
+
+        # Candle geometry: each candle gets an equal slot along the X axis
+        count = len(ohlc)
+        slot = chart_rect.width() / count
+        xs = chart_rect.left() + (np.arange(count) + 0.5) * slot
+        ys = chart_rect.bottom() - ((ohlc - min_price) / price_range) * chart_rect.height()
+        open_y, high_y, low_y, close_y = ys[:, 0], ys[:, 1], ys[:, 2], ys[:, 3]
+        body_top = np.minimum(open_y, close_y)
+        body_height = np.maximum(np.abs(open_y - close_y), 1.0)
+        body_width = max(min(slot * 0.6, 24.0), 1.0)
+        rising = ohlc[:, 3] >= ohlc[:, 0]
+
+        # Date labels
+        painter.setPen(colors["text"])
+        for i, date_str in enumerate(timestamps):
+            painter.drawText(QRectF(xs[i] - 25, chart_rect.bottom() + 5, 50, 20),
+                             Qt.AlignmentFlag.AlignCenter,
+                             str(date_str)[:10])
+
+        for mask, role in ((rising, "up"), (~rising, "down")):
+            idx = np.flatnonzero(mask)
+            if not len(idx):
+                continue
+            painter.setPen(palette.pen(role, 1))
+            painter.setBrush(palette.brushes[role])
+            painter.drawLines([QLineF(xs[i], high_y[i], xs[i], low_y[i]) for i in idx])
+            painter.drawRects([QRectF(xs[i] - body_width / 2, body_top[i], body_width, body_height[i])
+                               for i in idx])
+
+        # Highlight the hovered candle
+        if 0 <= self.hover_index < count:
+            i = self.hover_index
+            painter.setPen(palette.pen("hover", 2))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawRect(QRectF(xs[i] - body_width / 2 - 2, high_y[i] - 2,
+                                    body_width + 4, low_y[i] - high_y[i] + 4))
+
+        # Title
+        font.setPointSize(12)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(colors["text"])
+        title = f"{self.coin_name} - {self.range_label} Candles (USD)"[:50]
+        painter.drawText(QRectF(0, 10, self.width(), 30),
+                         Qt.AlignmentFlag.AlignCenter,
+                         title)
+
+        # Close prices act as hover anchors
+        return [QPointF(x, y) for x, y in zip(xs, close_y)]
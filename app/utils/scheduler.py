@@ -0,0 +1,91 @@
+# app/utils/scheduler.py
+from typing import Callable, Dict, Optional
+from PySide6.QtCore import QObject, QTimer
+
+from ..logic.refresh_policy import RefreshPolicy
+
+
+def on_battery_power() -> bool:
+    """True when running on battery; psutil is optional and without it we assume mains power."""
+    try:
+        import psutil
+    except ImportError:
+        return False
+    battery = psutil.sensors_battery() if hasattr(psutil, "sensors_battery") else None
+    return bool(battery and not battery.power_plugged)
+
+
+class RefreshScheduler(QObject):
+    """Owns all periodic work of the GUI (markets refresh, price refresh, chart revalidation).
+
+    Each task runs on its own single-shot timer; after every run the RefreshPolicy picks
+    the next delay from window visibility, battery, connectivity, the shared rate budget
+    and watchlist volatility. Paused tasks resume as soon as conditions allow.
+    """
+
+    def __init__(self, data_controller, parent=None, policy: Optional[RefreshPolicy] = None):
+        super().__init__(parent)
+        self.data_controller = data_controller
+        self.policy = policy or RefreshPolicy()
+        self.visible = True
+        self._tasks: Dict[str, Callable[[], None]] = {}
+        self._timers: Dict[str, QTimer] = {}
+
+        # Paused tasks are re-evaluated periodically (e.g. after the window is restored)
+        self._wake_timer = QTimer(self)
+        self._wake_timer.timeout.connect(self._wake_paused)
+        self._wake_timer.start(30 * 1000)
+
+    def add_task(self, name: str, callback: Callable[[], None], run_now: bool = False):
+        """Registers a periodic task; its base interval comes from the policy."""
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self.trigger(name))
+        self._tasks[name] = callback
+        self._timers[name] = timer
+        if run_now:
+            self.trigger(name)
+        else:
+            self._schedule(name)
+
+    def trigger(self, name: str):
+        """Runs a task now (also used for manual refreshes) and schedules its next run."""
+        callback = self._tasks.get(name)
+        if callback is None:
+            return
+        callback()
+        self._schedule(name)
+
+    def next_interval(self, name: str) -> Optional[float]:
+        """Seconds until `name` should run again under current conditions (None = paused)."""
+        api = self.data_controller.api
+        return self.policy.next_interval(
+            name,
+            visible=self.visible,
+            on_battery=on_battery_power(),
+            online=api.monitor.online,
+            budget_fraction=api.budget.remaining_fraction(),
+            volatile=self.data_controller.volatility.is_volatile,
+        )
+
+    def set_visible(self, visible: bool):
+        """Called by the main window when it is minimized/hidden or shown again."""
+        if visible == self.visible:
+            return
+        self.visible = visible
+        # Re-plan: pause/slow down when hidden, bring overdue or paused tasks forward when shown
+        for name in self._tasks:
+            self._schedule(name, only_sooner=visible)
+
+    def _schedule(self, name: str, only_sooner: bool = False):
+        interval = self.next_interval(name)
+        timer = self._timers[name]
+        if interval is None:
+            timer.stop()
+        elif not only_sooner or not timer.isActive() or timer.remainingTime() > interval * 1000:
+            timer.start(int(interval * 1000))
+
+    def _wake_paused(self):
+        for name, timer in self._timers.items():
+            if not timer.isActive():
+                self._schedule(name)
@@ -0,0 +1,133 @@
+# app/utils/startup_profiler.py
+"""
+Startup profiling for `python main.py --profile-startup`.
+
+Times every module import (self and cumulative) and named startup milestones,
+then prints a report once the first data has been painted. Deliberately free of
+Qt imports so it can be enabled before anything else is loaded.
+"""
+import sys
+import time
+from importlib.abc import MetaPathFinder
+from typing import List, Tuple, Dict, Callable, Optional
+
+
+class _TimingFinder(MetaPathFinder):
+    """Meta path hook that wraps each module loader to time `exec_module`."""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self.profiler = profiler
+        self._stack: List[List[float]] = []  # [start, child time] per import in progress
+
+    def find_spec(self, fullname, path, target=None):
+        # Ask the remaining finders for the real spec, then wrap its loader
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                loader = spec.loader
+                if loader is not None and hasattr(loader, "exec_module"):
+                    spec.loader = _TimedLoader(loader, fullname, self)
+                return spec
+        return None
+
+
+class _TimedLoader:
+    """Loader proxy recording how long a module body took to execute."""
+
+    def __init__(self, loader, fullname: str, finder: _TimingFinder):
+        self._loader = loader
+        self._fullname = fullname
+        self._finder = finder
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        stack = self._finder._stack
+        frame = [time.perf_counter(), 0.0]
+        stack.append(frame)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            stack.pop()
+            total = time.perf_counter() - frame[0]
+            if stack:
+                stack[-1][1] += total
+            self._finder.profiler.imports[self._fullname] = (total - frame[1], total)
+
+
+class StartupProfiler:
+    """Collects import timings and startup milestones (no-op unless enabled)."""
+
+    def __init__(self):
+        self.enabled = False
+        self.start = time.perf_counter()
+        self.milestones: List[Tuple[str, float]] = []
+        self.imports: Dict[str, Tuple[float, float]] = {}  # module -> (self, cumulative) seconds
+        self._reported = False
+        self._finder: Optional[_TimingFinder] = None
+
+    def enable(self):
+        """Start timing imports and milestones from now on."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.start = time.perf_counter()
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def mark(self, name: str):
+        """Record a named milestone (first occurrence only)."""
+        if not self.enabled or any(m == name for m, _ in self.milestones):
+            return
+        self.milestones.append((name, time.perf_counter() - self.start))
+
+    def watch_first_paint(self, widget, has_data: Callable[[], bool], name: str = "first data painted"):
+        """Mark `name` and print the report when `widget` first paints while `has_data()` is true."""
+        if not self.enabled:
+            return
+        from PySide6.QtCore import QObject, QEvent, QTimer
+
+        profiler = self
+
+        class _PaintWatcher(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Type.Paint and has_data():
+                    # Report after this paint has actually completed
+                    QTimer.singleShot(0, lambda: (profiler.mark(name), profiler.report()))
+                    obj.removeEventFilter(self)
+                return False
+
+        self._paint_watcher = _PaintWatcher(widget)
+        widget.installEventFilter(self._paint_watcher)
+
+    def report(self, limit: int = 25, stream=None):
+        """Print milestones and the slowest imports (once)."""
+        if not self.enabled or self._reported:
+            return
+        self._reported = True
+        stream = stream or sys.stderr
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)  # later (lazy) imports run untimed
+
+        print("\n=== Blue Moon startup profile ===", file=stream)
+        print("Milestones (since profiling started):", file=stream)
+        for name, at in self.milestones:
+            print(f"  {at * 1000:9.1f} ms  {name}", file=stream)
+
+        total_imports = sum(own for own, _ in self.imports.values())
+        print(f"\nImports: {len(self.imports)} modules, {total_imports * 1000:.1f} ms total "
+              f"(top {limit} by self time)", file=stream)
+        print(f"  {'self ms':>9}  {'cumul ms':>9}  module", file=stream)
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        for module, (own, cumulative) in slowest:
+            print(f"  {own * 1000:9.1f}  {cumulative * 1000:9.1f}  {module}", file=stream)
+
+
+# Shared instance used by main.py
+profiler = StartupProfiler()
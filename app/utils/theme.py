@@ -0,0 +1,180 @@
+# app/utils/theme.py
+"""
+Theme engine: palettes and stylesheet switching built once, reused on every toggle.
+
+Both themes live in the one application stylesheet; dark rules are scoped with
+`QMainWindow[darkMode="true"]`. Re-applying the stylesheet on a toggle would make Qt
+re-parse it and re-polish every widget, so the engine parses the stylesheet once,
+remembers which widgets the dark rules can match, and on a toggle only flips the
+window property and re-polishes those widgets. Paint code takes its colors, brushes
+and pens from the prebuilt palette of the active theme instead of creating them.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QBrush, QColor, QPen
+from PySide6.QtWidgets import QApplication, QWidget
+from .tracing import tracer
+
+DARK_PROPERTY = "darkMode"
+
+# role -> color; chart roles plus the table's change colors (the same in both themes)
+THEME_COLORS = {
+    "light": {
+        "bg": "#ffffff",
+        "text": "#1a2a3a",
+        "grid": "#adb5be",
+        "line": "#2c5bdc",
+        "hover": "#2563eb",
+        "stablecoin_line": "#64748b",
+        "up": "#16a34a",
+        "down": "#dc2626",
+        "SMA": "#f59e0b",
+        "EMA": "#9333ea",
+        "BB": "#64748b",
+        "RSI": "#0d9488",
+        "gain": "#16a34a",
+        "loss": "#dc2626",
+        "neutral": "#64748b",
+    },
+    "dark": {
+        "bg": "#1e293b",
+        "text": "#e2e8f0",
+        "grid": "#475569",
+        "line": "#60a5fa",
+        "hover": "#90cdf4",
+        "stablecoin_line": "#94a3b8",
+        "up": "#22c55e",
+        "down": "#fb7185",
+        "SMA": "#fbbf24",
+        "EMA": "#c084fc",
+        "BB": "#94a3b8",
+        "RSI": "#2dd4bf",
+        "gain": "#16a34a",
+        "loss": "#dc2626",
+        "neutral": "#64748b",
+    },
+}
+
+
+class ThemePalette:
+    """The colors of one theme as ready-made QColor and QBrush objects (plus lazily cached pens)."""
+
+    def __init__(self, name: str, colors: Dict[str, str]):
+        self.name = name
+        self.is_dark = name == "dark"
+        self.colors: Dict[str, QColor] = {role: QColor(value) for role, value in colors.items()}
+        self.brushes: Dict[str, QBrush] = {role: QBrush(color) for role, color in self.colors.items()}
+        self._pens: Dict[Tuple, QPen] = {}
+
+    def pen(self, role: str, width: float = 1.0, style: Qt.PenStyle = Qt.PenStyle.SolidLine) -> QPen:
+        key = (role, width, style)
+        pen = self._pens.get(key)
+        if pen is None:
+            pen = self._pens[key] = QPen(self.colors[role], width, style)
+        return pen
+
+    def change_brush(self, change) -> QBrush:
+        """Foreground brush for a signed change (gain, loss or neutral)."""
+        if change and change > 0:
+            return self.brushes["gain"]
+        if change and change < 0:
+            return self.brushes["loss"]
+        return self.brushes["neutral"]
+
+
+# One compound selector: optional type, optional #id (pseudo-states and attributes dropped)
+_COMPOUND = re.compile(r"^([A-Za-z_]\w*)?(?:#([\w-]+))?")
+_DARK_SCOPE = re.compile(r'^\s*QMainWindow\[' + DARK_PROPERTY + r'="true"\]')
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_RULE = re.compile(r"([^{}]+)\{[^{}]*\}")
+
+Compound = Tuple[Optional[str], Optional[str]]  # (type name, object name)
+
+
+def _compound(text: str) -> Compound:
+    match = _COMPOUND.match(text)
+    return (match.group(1), match.group(2)) if match else (None, None)
+
+
+def compile_dark_selectors(style_sheet: str) -> List[Tuple[Compound, ...]]:
+    """The descendant chains (below the window) of every dark-scoped selector.
+
+    `QMainWindow[darkMode="true"] #cryptoTable QHeaderView::section` becomes
+    ((None, "cryptoTable"), ("QHeaderView", None)); the window's own rule becomes ().
+    """
+    chains = set()
+    for match in _RULE.finditer(_COMMENT.sub("", style_sheet)):
+        for selector in match.group(1).split(","):
+            scope = _DARK_SCOPE.match(selector)
+            if scope:
+                chains.add(tuple(_compound(part) for part in selector[scope.end():].split()))
+    return sorted(chains, key=len)
+
+
+def _matches(widget: QWidget, compound: Compound) -> bool:
+    type_name, object_name = compound
+    return ((type_name is None or widget.inherits(type_name))
+            and (object_name is None or widget.objectName() == object_name))
+
+
+def _matches_chain(widget: QWidget, chain: Tuple[Compound, ...], root: QWidget) -> bool:
+    """Descendant-selector match of `chain` against `widget` and its ancestors below `root`."""
+    if not _matches(widget, chain[-1]):
+        return False
+    remaining = list(chain[:-1])
+    parent = widget.parentWidget()
+    while remaining and parent is not None and parent is not root:
+        if _matches(parent, remaining[-1]):
+            remaining.pop()
+        parent = parent.parentWidget()
+    return not remaining
+
+
+class ThemeEngine:
+    """Holds the prebuilt palettes and switches a window's theme with targeted re-polishing."""
+
+    def __init__(self):
+        self.palettes = {name: ThemePalette(name, colors) for name, colors in THEME_COLORS.items()}
+        self.is_dark = False
+        self._style_sheet: Optional[str] = None
+        self._chains: List[Tuple[Compound, ...]] = []
+
+    def palette(self, is_dark: Optional[bool] = None) -> ThemePalette:
+        """The palette of the given theme (default: the active one)."""
+        return self.palettes["dark" if (self.is_dark if is_dark is None else is_dark) else "light"]
+
+    def install(self, style_sheet: str):
+        """Sets the application stylesheet (if it is not already set) and compiles its dark rules."""
+        app = QApplication.instance()
+        if app is not None and app.styleSheet() != style_sheet:
+            app.setStyleSheet(style_sheet)
+        if style_sheet != self._style_sheet:
+            self._style_sheet = style_sheet
+            self._chains = compile_dark_selectors(style_sheet)
+
+    def affected_widgets(self, window: QWidget) -> List[QWidget]:
+        """The window and the descendants that a dark-scoped rule can match."""
+        chains = [chain for chain in self._chains if chain]
+        widgets = [window] if () in self._chains else []
+        widgets += [widget for widget in window.findChildren(QWidget)
+                    if any(_matches_chain(widget, chain, window) for chain in chains)]
+        return widgets
+
+    def apply(self, window: QWidget, is_dark: bool) -> int:
+        """Switches `window` to the theme; returns the number of re-polished widgets."""
+        self.is_dark = is_dark
+        if window.property(DARK_PROPERTY) == is_dark:
+            return 0
+        with tracer.span("theme.apply", "view", dark=is_dark):
+            window.setProperty(DARK_PROPERTY, is_dark)
+            widgets = self.affected_widgets(window)
+            for widget in widgets:
+                style = widget.style()
+                style.unpolish(widget)
+                style.polish(widget)
+                widget.update()
+        return len(widgets)
+
+
+theme = ThemeEngine()
@@ -0,0 +1,45 @@
+# app/utils/tick_coalescer.py
+import threading
+from typing import Dict, List
+from PySide6.QtCore import QObject, QTimer, Signal
+
+
+class TickCoalescer(QObject):
+    """Collects price ticks from any thread and hands them to the GUI at most once per frame.
+
+    Only the newest tick per coin is kept, so a burst of updates for one coin costs a
+    single row update instead of one repaint per tick.
+    """
+
+    flushed = Signal(list)  # List[PriceTick], delivered on the GUI thread
+    _wake = Signal()
+
+    def __init__(self, parent=None, frame_ms: int = 16):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._pending: Dict[str, object] = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(frame_ms)
+        self._timer.timeout.connect(self._flush)
+        self._wake.connect(self._on_wake)  # queued when emitted from a worker thread
+
+    def push(self, ticks: List) -> None:
+        """Queues ticks (thread-safe); the first tick of a frame arms the flush timer."""
+        with self._lock:
+            was_empty = not self._pending
+            for tick in ticks:
+                self._pending[tick.coin_id] = tick
+        if was_empty and ticks:
+            self._wake.emit()
+
+    def _on_wake(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _flush(self):
+        with self._lock:
+            ticks = list(self._pending.values())
+            self._pending.clear()
+        if ticks:
+            self.flushed.emit(ticks)
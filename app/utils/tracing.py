@@ -0,0 +1,183 @@
+# app/utils/tracing.py
+"""
+Lightweight timing spans and counters for the fetch -> format -> render path.
+
+Disabled by default: `tracer.span()` then returns a shared no-op context manager,
+so instrumented code pays for little more than one method call. Enable with
+`python main.py --trace` (or BLUE_MOON_TRACE=1); the collected events are written
+as Chrome-trace JSON, which chrome://tracing and ui.perfetto.dev both open.
+"""
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+class _NullSpan:
+    """Context manager used while tracing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Records one complete ("X") event when the block exits."""
+
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer._finish(self, time.perf_counter_ns())
+        return False
+
+
+class _RefreshSpan(_Span):
+    """Root span of a refresh: spans finished inside it on the same thread become its stages."""
+
+    __slots__ = ("stages",)
+
+    def __enter__(self):
+        local = self.tracer._local
+        if getattr(local, "stages", None) is None:  # a nested root is timed as a plain span
+            self.stages = local.stages = {}
+            self.args = dict(self.args, refresh=next(self.tracer._refresh_ids))
+        else:
+            self.stages = None
+        return super().__enter__()
+
+    def __exit__(self, *exc):
+        super().__exit__(*exc)
+        if self.stages is not None:
+            self.tracer._local.stages = None
+            with self.tracer._lock:
+                self.tracer.last_refresh = self.stages
+                self.tracer.last_refresh_id = self.args["refresh"]
+        return False
+
+
+class _ResumedRefresh:
+    """Adds the spans of a `with` block to the stages of the last complete refresh."""
+
+    def __init__(self, tracer: "Tracer"):
+        self.tracer = tracer
+
+    def __enter__(self):
+        self.tracer._local.stages = self.tracer.last_refresh
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer._local.stages = None
+        return False
+
+
+class Tracer:
+    """Collects spans and counters in a bounded in-memory buffer (thread-safe)."""
+
+    def __init__(self, max_events: int = 200_000):
+        self.enabled = False
+        self._origin = time.perf_counter_ns()
+        self._events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+        self.counters: Dict[str, float] = {}
+        self.last_durations: Dict[str, float] = {}  # span name -> ms of its latest occurrence
+        # Stages of the last complete refresh: span name -> (total ms, occurrences)
+        self.last_refresh: Dict[str, Tuple[float, int]] = {}
+        self.last_refresh_id = 0
+        self._refresh_ids = itertools.count(1)
+        self._local = threading.local()
+
+    def enable(self):
+        self.enabled = True
+
+    def span(self, name: str, cat: str = "app", **args):
+        """Times a `with` block as a span named `name` (no-op while disabled)."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def refresh(self, name: str, cat: str = "app", **args):
+        """Like `span`, but groups the spans finished inside it (on this thread) as one refresh."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _RefreshSpan(self, name, cat, args)
+
+    def resume_refresh(self):
+        """Counts the spans of a `with` block (e.g. applying the result) towards the last refresh."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _ResumedRefresh(self)
+
+    def count(self, name: str, value: float = 1):
+        """Adds `value` to a counter (exported as a counter track)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            total = self.counters.get(name, 0) + value
+            self.counters[name] = total
+            self._events.append({
+                "name": name, "ph": "C", "ts": self._us(time.perf_counter_ns()),
+                "pid": os.getpid(), "tid": threading.get_ident(), "args": {"value": total},
+            })
+
+    def _finish(self, span: _Span, end_ns: int):
+        duration_ns = end_ns - span.start
+        event = {
+            "name": span.name, "cat": span.cat, "ph": "X",
+            "ts": self._us(span.start), "dur": duration_ns / 1000,
+            "pid": os.getpid(), "tid": threading.get_ident(),
+        }
+        if span.args:
+            event["args"] = span.args
+        stages = getattr(self._local, "stages", None)
+        with self._lock:
+            self._events.append(event)
+            self.last_durations[span.name] = duration_ns / 1e6
+            if stages is not None:
+                total, occurrences = stages.get(span.name, (0.0, 0))
+                stages[span.name] = (total + duration_ns / 1e6, occurrences + 1)
+
+    def _us(self, ns: int) -> float:
+        return (ns - self._origin) / 1000
+
+    def export_chrome_trace(self, path: os.PathLike) -> Optional[Path]:
+        """Writes the collected events as Chrome-trace JSON; returns the path (None on error)."""
+        with self._lock:
+            events = list(self._events)
+        thread_names = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": thread.ident, "args": {"name": thread.name}}
+            for thread in threading.enumerate()
+        ]
+        path = Path(path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": thread_names + events, "displayTimeUnit": "ms"}, f)
+        except OSError as e:
+            print(f"Could not write trace: {e}")
+            return None
+        return path
+
+
+# Shared instance used by the instrumented modules
+tracer = Tracer()
+if os.environ.get("BLUE_MOON_TRACE"):
+    tracer.enable()
@@ -0,0 +1,54 @@
+# app/utils/worker.py
+from typing import Callable, Any
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class _TaskSignals(QObject):
+    """Signals of a background task; they are delivered on the GUI thread."""
+    finished = Signal(object)
+    progress = Signal(int, int)  # done, total
+
+
+class BackgroundTask(QRunnable):
+    """Runs a blocking callable (e.g. an API fetch) on the global thread pool.
+
+    Connect to `signals.finished` to receive the return value on the GUI thread.
+    """
+
+    def __init__(self, fn: Callable[..., Any], *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _TaskSignals()
+
+    def report_progress(self, done: int, total: int):
+        """Thread-safe progress callback for long-running tasks."""
+        self.signals.progress.emit(done, total)
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:  # never let a worker exception escape into Qt
+            print(f"Background task failed: {e}")
+            result = None
+        self.signals.finished.emit(result)
+
+
+def run_in_background(fn: Callable[..., Any], on_finished: Callable[[Any], None], *args, **kwargs) -> BackgroundTask:
+    """Starts `fn(*args, **kwargs)` off the GUI thread and calls `on_finished(result)` when done."""
+    task = BackgroundTask(fn, *args, **kwargs)
+    task.signals.finished.connect(on_finished)
+    QThreadPool.globalInstance().start(task)
+    return task
+
+
+def run_with_progress(fn: Callable[..., Any], on_finished: Callable[[Any], None],
+                      on_progress: Callable[[int, int], None], *args, **kwargs) -> BackgroundTask:
+    """Like run_in_background, but passes `progress=<callback>` to `fn` and forwards it to `on_progress`."""
+    task = BackgroundTask(fn, *args, **kwargs)
+    task.kwargs["progress"] = task.report_progress
+    task.signals.finished.connect(on_finished)
+    task.signals.progress.connect(on_progress)
+    QThreadPool.globalInstance().start(task)
+    return task
@@ -1,8 +1,7 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QToolButton, QMenu, QComboBox
+from PySide6.QtCore import Qt, Signal, QEvent, QTimer
 
-from app.logic.data_controller import DataController
-from app.utils.graph_painter import ChartWidget
+from app.utils.worker import run_in_background
 
 
 class ChartView(QWidget):
@@ -17,6 +16,45 @@ class ChartView(QWidget):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
 
+        # Chart toolbar
+        toolbar = QHBoxLayout()
+        toolbar.setContentsMargins(10, 10, 10, 0)
+
+        # Range selector: API history or the locally recorded intraday series
+        self.range_combo = QComboBox()
+        self.range_combo.setObjectName("chartRangeCombo")
+        self.range_combo.addItem("7 Days", "7d")
+        self.range_combo.addItem("Today (local)", "local")
+        self.range_combo.setToolTip("Today's series is built from locally recorded snapshots")
+        self.range_combo.currentIndexChanged.connect(self.on_range_changed)
+        toolbar.addWidget(self.range_combo)
+        toolbar.addStretch()
+
+        # Indicator overlays menu (line mode)
+        self.indicator_button = QToolButton()
+        self.indicator_button.setText("Indicators")
+        self.indicator_button.setObjectName("chartToolButton")
+        self.indicator_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        indicator_menu = QMenu(self.indicator_button)
+        self.indicator_actions = {}
+        for name, label in (("SMA", "Simple Moving Average"), ("EMA", "Exponential Moving Average"),
+                            ("BB", "Bollinger Bands"), ("RSI", "Relative Strength Index")):
+            action = indicator_menu.addAction(label)
+            action.setCheckable(True)
+            action.toggled.connect(self.update_indicators)
+            self.indicator_actions[name] = action
+        self.indicator_button.setMenu(indicator_menu)
+        toolbar.addWidget(self.indicator_button)
+
+        # Line / candlestick toggle
+        self.mode_button = QPushButton("Candles")
+        self.mode_button.setObjectName("chartToolButton")
+        self.mode_button.setCheckable(True)
+        self.mode_button.setToolTip("Switch between line and candlestick chart")
+        self.mode_button.toggled.connect(self.on_mode_toggled)
+        toolbar.addWidget(self.mode_button)
+        layout.addLayout(toolbar)
+
         # Placeholder
         self.chart_placeholder = QLabel(
             "Price Chart Will Appear Here\n\n"
@@ -27,30 +65,89 @@ class ChartView(QWidget):
         self.chart_placeholder.setObjectName("chartPlaceholder")
         layout.addWidget(self.chart_placeholder)
 
-        # Custom chart widget (imported from graph_painter)
-        self.chart_widget = ChartWidget()
-        self.chart_widget.hide()
-        layout.addWidget(self.chart_widget)
+        # Custom chart widget (from graph_painter), created on first use
+        self._chart_widget = None
 
-        # Data controller
-        self.controller = DataController()
+        # Share the main window's data controller (and its chart cache)
+        self.controller = main_window.data_controller
 
         # Store chart data
         self._chart_data = None
         self._current_coin_id = None
         self._coin_name = None
+        self._coin_data = None
+        self.candle_mode = False
+        self.range_key = "7d"
+        self._revalidate_task = None
+        self._display_tasks = set()  # in-flight chart fetches (kept referenced until they finish)
+        self._warm_chart = None  # cached series restored at startup, drawn after the first paint
+        self._saved_coin_id = None  # coin of the persisted warm-start chart
+        self._save_tasks = set()
+
+    @property
+    def chart_widget(self):
+        """The chart painter widget; its module is only imported when a chart is first shown."""
+        if self._chart_widget is None:
+            from app.utils.graph_painter import ChartWidget
+            self._chart_widget = ChartWidget()
+            self._chart_widget.hide()
+            self.layout().addWidget(self._chart_widget)
+        return self._chart_widget
 
     def display_chart(self, coin_data: dict):
-        """Fetch and display the 7-day price chart for a coin."""
+        """Fetch (in the background) and display the 7-day price chart (line or candles) for a coin."""
         coin_id = coin_data.get("id")
         self._coin_name = coin_data.get("name") or coin_id
         if not coin_id:
             return
+        self._coin_data = coin_data
+        view_key = (self.range_key, self.candle_mode)
+        self.chart_status.emit(f"Loading chart for {self._coin_name}...", "info")
+
+        def on_fetched(history):
+            self._display_tasks.discard(task)
+            # Only the latest request is shown (the user may have clicked on meanwhile)
+            if coin_data is self._coin_data and view_key == (self.range_key, self.candle_mode):
+                self._show_history(coin_data, history)
+
+        task = run_in_background(self._fetch_history, on_fetched, coin_id, *view_key)
+        self._display_tasks.add(task)
+
+    def revalidate(self):
+        """Re-fetch the displayed chart in the background (periodic scheduler task)."""
+        if not self._current_coin_id or not self._coin_data or self._revalidate_task is not None:
+            return
+        coin_data = self._coin_data
+        view_key = (self.range_key, self.candle_mode)
+
+        def on_fetched(history):
+            self._revalidate_task = None
+            # Ignore the result if the user moved on to another coin or view meanwhile
+            if coin_data is self._coin_data and view_key == (self.range_key, self.candle_mode) and history:
+                self._show_history(coin_data, history, silent=True)
+
+        self._revalidate_task = run_in_background(self._fetch_history, on_fetched, coin_data["id"], *view_key)
+
+    def _fetch_history(self, coin_id: str, range_key: str, candle_mode: bool):
+        """Fetch the series for a range and mode (blocks on the network; runs on a worker thread)."""
+        if range_key == "local":
+            return self.controller.get_local_history(coin_id)
+        if candle_mode:
+            return self.controller.get_coin_ohlc(coin_id)
+        return self.controller.get_coin_history(coin_id)
+
+    def _show_history(self, coin_data: dict, history, silent: bool = False):
+        """Display a fetched series, or an error placeholder when there is none."""
+        coin_id = coin_data.get("id")
+        self._coin_name = coin_data.get("name") or coin_id
 
-        history = self.controller.get_coin_history(coin_id)
-        
         if not history:
             coin_name = self._coin_name
+            if self.range_key == "local":
+                self.show_error(f"Not enough locally recorded data for {coin_name} yet.\n\n"
+                                "Snapshots are recorded on every refresh.")
+                self.chart_status.emit(f"No local data for {coin_name} yet", "warning")
+                return
             self.show_error(f"⚠️ Failed to load chart data for {coin_name}")
             self.chart_status.emit(f"Failed to load chart for {coin_name}", "error")
             return
@@ -60,16 +157,92 @@ class ChartView(QWidget):
         self._current_coin_id = coin_id
         
         # Update chart
-        self.chart_widget.set_chart_data(history["timestamps"], history["prices"], self._coin_name)
+        self.chart_widget.range_label = "Today" if self.range_key == "local" else "7-Day"
+        if self.candle_mode and self.range_key != "local":
+            self.chart_widget.set_candle_data(history["timestamps"], history["ohlc"], self._coin_name)
+        else:
+            self.chart_widget.set_chart_data(history["timestamps"], history["prices"], self._coin_name)
+        self.update_indicators()
+        if self.range_key != "local":
+            # Charts are drawn in the base currency; converted coins carry their base price
+            self.chart_widget.set_live_price(coin_data.get("base_price", coin_data.get("price")))
         self.chart_widget.set_theme(self.main_window.is_dark)
         self.chart_widget.show()
         self.chart_placeholder.hide()
         
-        self.chart_status.emit(f"Chart loaded for {self._coin_name}", "success")
+        if not silent:
+            self.chart_status.emit(f"Chart loaded for {self._coin_name}", "success")
+        # Remember the 7-day line series for the next warm start: once per coin, written
+        # off the GUI thread (revalidations and local views never rewrite it)
+        if self.range_key != "local" and "prices" in history and coin_id != self._saved_coin_id:
+            self._saved_coin_id = coin_id
+            task = run_in_background(self.controller.save_chart_state,
+                                     lambda _: self._save_tasks.discard(task), dict(coin_data), history)
+            self._save_tasks.add(task)
+
+    def restore_warm_start(self):
+        """Show the chart persisted by the previous session without touching the network."""
+        chart = self.controller.warm_chart()
+        if chart is None:
+            return
+        coin = chart["coin"]
+
+        self._coin_data = coin
+        self._coin_name = coin.get("name") or coin["id"]
+        self._current_coin_id = self._saved_coin_id = coin["id"]
+        self._chart_data = {"timestamps": chart["timestamps"], "prices": chart["prices"]}
+
+        # Creating the chart widget imports graph_painter, so it waits until the window
+        # (placeholder included) has painted once instead of running during startup
+        self._warm_chart = self._chart_data
+        self.chart_placeholder.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self.chart_placeholder and event.type() == QEvent.Type.Paint:
+            obj.removeEventFilter(self)
+            QTimer.singleShot(0, self._draw_warm_start)
+        return super().eventFilter(obj, event)
+
+    def _draw_warm_start(self):
+        """Draw the cached chart restored by `restore_warm_start` (unless another chart replaced it)."""
+        history, self._warm_chart = self._warm_chart, None
+        if history is None or history is not self._chart_data:
+            return
+        self.chart_widget.range_label = "Cached"
+        self.chart_widget.set_chart_data(history["timestamps"], history["prices"], self._coin_name)
+        self.chart_widget.set_theme(self.main_window.is_dark)
+        self.chart_widget.show()
+        self.chart_placeholder.hide()
+
+    def update_indicators(self):
+        """Apply the enabled indicator overlays to the line chart (memoized per coin/params)."""
+        if not self._chart_data or "prices" not in self._chart_data or not self._current_coin_id:
+            return
+        enabled = [name for name, action in self.indicator_actions.items() if action.isChecked()]
+        overlays = self.controller.get_indicators(self._current_coin_id, self._chart_data, enabled,
+                                                  range_key=self.range_key)
+        self.chart_widget.set_indicators(overlays)
+
+    def on_range_changed(self, _index: int):
+        """Switch between the 7-day API history and today's locally recorded series."""
+        self.range_key = self.range_combo.currentData()
+        # Candles come from the OHLC endpoint, so they only exist for the API range
+        self.mode_button.setEnabled(self.range_key != "local")
+        self.indicator_button.setEnabled(self.range_key == "local" or not self.candle_mode)
+        if self._coin_data:
+            self.display_chart(self._coin_data)
+
+    def on_mode_toggled(self, checked: bool):
+        """Switch between line and candlestick mode and redraw the current coin."""
+        self.candle_mode = checked
+        self.mode_button.setText("Line" if checked else "Candles")
+        self.indicator_button.setEnabled(self.range_key == "local" or not checked)
+        if self._current_coin_id and self._coin_data:
+            self.display_chart(self._coin_data)
 
     def update_chart_style(self):
         """Update chart theme - called when theme changes"""
-        if self._chart_data:
+        if self._chart_data and self._chart_widget is not None:
             self.chart_widget.set_theme(self.main_window.is_dark)
             self.chart_widget.update()
 
@@ -78,7 +251,8 @@ class ChartView(QWidget):
         self._chart_data = None
         self._current_coin_id = None
         self._coin_name = None
-        self.chart_widget.hide()
+        if self._chart_widget is not None:
+            self._chart_widget.hide()
         self.chart_placeholder.show()
 
     def show_error(self, message: str):
@@ -86,10 +260,20 @@ class ChartView(QWidget):
         self._chart_data = None
         self._current_coin_id = None
         self._coin_name = None
-        self.chart_widget.hide()
+        if self._chart_widget is not None:
+            self._chart_widget.hide()
         self.chart_placeholder.setText(message)
         self.chart_placeholder.show()
 
+    def apply_ticks(self, ticks):
+        """Move the live price marker when the displayed coin ticks (called once per frame)."""
+        if self._chart_widget is None or self.range_key == "local" or not self._current_coin_id:
+            return
+        for tick in ticks:
+            if tick.coin_id == self._current_coin_id and tick.price is not None:
+                self._chart_widget.set_live_price(tick.price)
+                return
+
     def current_coin_id(self):
         """Return the coin_id of the currently displayed chart, or None."""
         return self._current_coin_id
\ No newline at end of file
@@ -2,25 +2,26 @@
 header_view.py
 
 Defines the HeaderView widget for the Blue Moon application.
-Displays the logo, title, theme toggle, refresh, search, and export buttons.
+Displays the logo, title, theme toggle, refresh, currency selector, search, and export buttons.
 """
 
 from PySide6.QtCore import Signal
-from PySide6.QtWidgets import QWidget, QHBoxLayout, QPushButton, QLineEdit, QLabel
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QPushButton, QLineEdit, QLabel, QComboBox
 from PySide6.QtGui import QIcon
 from ..config import (LIGHT_THEME_ICON, DARK_THEME_ICON,
-                      REFRESH_LIGHT_ICON, REFRESH_DARK_ICON, LOGO_ICON)
+                      REFRESH_LIGHT_ICON, REFRESH_DARK_ICON, LOGO_ICON, CURRENCIES)
 
 class HeaderView(QWidget):
     """
     HeaderView is a custom QWidget that displays the application's header,
-    including logo, title, theme toggle, refresh, search, and export buttons.
+    including logo, title, theme toggle, refresh, currency selector, search, and export buttons.
     """
     # Custom signals for header actions
     theme_toggled = Signal()
     refresh_requested = Signal()
     search_changed = Signal(str)
     export_requested = Signal()
+    currency_changed = Signal(str)
 
     def __init__(self, parent=None):
         """
@@ -51,6 +52,15 @@ class HeaderView(QWidget):
         self.refresh_button.setObjectName("headerButton")
         self.refresh_button.clicked.connect(self.refresh_requested.emit)
 
+        # Quote currency selector
+        self.currency_combo = QComboBox()
+        self.currency_combo.setObjectName("currencyCombo")
+        for currency in CURRENCIES:
+            self.currency_combo.addItem(currency.upper(), currency)
+        self.currency_combo.setToolTip("Quote currency")
+        self.currency_combo.currentIndexChanged.connect(
+            lambda _: self.currency_changed.emit(self.currency_combo.currentData()))
+
         # Search field
         self.search_field = QLineEdit()
         self.search_field.setPlaceholderText("🔍 Search cryptocurrencies...")
@@ -69,6 +79,7 @@ class HeaderView(QWidget):
         layout.addStretch()
         layout.addWidget(self.theme_button)
         layout.addWidget(self.refresh_button)
+        layout.addWidget(self.currency_combo)
         layout.addWidget(self.search_field)
         layout.addWidget(self.export_csv_button)
 
@@ -86,6 +97,14 @@ class HeaderView(QWidget):
             self.theme_button.setIcon(QIcon(DARK_THEME_ICON))
             self.refresh_button.setIcon(QIcon(REFRESH_LIGHT_ICON))
     
+    def set_currency(self, currency: str):
+        """Selects `currency` in the combo without emitting currency_changed."""
+        index = self.currency_combo.findData(currency)
+        if index >= 0:
+            self.currency_combo.blockSignals(True)
+            self.currency_combo.setCurrentIndex(index)
+            self.currency_combo.blockSignals(False)
+
     def get_search_text(self) -> str:
         """
         Returns the trimmed search text from the search field.
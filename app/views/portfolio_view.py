@@ -0,0 +1,190 @@
+# app/views/portfolio_view.py
+from typing import Dict, Optional
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QDoubleSpinBox, QPushButton,
+                               QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PySide6.QtCore import Qt, Signal
+from ..utils.formatting import DataFormatter, currency_format
+from ..utils.theme import theme
+from ..config import BASE_CURRENCY
+
+COLUMNS = ["Coin", "Quantity", "Price", "Value", "P&L", "P&L %"]
+
+
+class PortfolioView(QWidget):
+    """Holdings panel: quantity, price, value and P&L per position plus portfolio totals.
+
+    Rows are keyed by coin id and only the cells of changed positions are rewritten,
+    so frequent price updates stay cheap; the table is rebuilt only when positions are
+    added or removed. Positions are valued in the base currency (cost basis included)
+    and shown converted at the display currency's exchange rate.
+    """
+    status_update = Signal(str, str)
+    positions_changed = Signal()  # a position was added or removed
+
+    def __init__(self, data_controller, parent=None):
+        super().__init__(parent)
+        self.setObjectName("portfolioPanel")
+        self.data_controller = data_controller
+        self.portfolio = data_controller.portfolio
+        self._rows: Dict[str, int] = {}
+        self.currency = BASE_CURRENCY
+        self.rate = 1.0  # display currency units per base unit
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 6, 10, 6)
+
+        # Title + totals
+        title_row = QHBoxLayout()
+        title = QLabel("Portfolio")
+        title.setObjectName("portfolioTitle")
+        self.totals_label = QLabel("")
+        self.totals_label.setObjectName("portfolioTotals")
+        title_row.addWidget(title)
+        title_row.addStretch()
+        title_row.addWidget(self.totals_label)
+        layout.addLayout(title_row)
+
+        # Positions table (read-only)
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setObjectName("portfolioTable")
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.itemSelectionChanged.connect(self._on_row_selected)
+        layout.addWidget(self.table)
+
+        # Add / update / remove a position
+        form = QHBoxLayout()
+        self.coin_input = QLineEdit()
+        self.coin_input.setPlaceholderText("Coin id or symbol")
+        self.quantity_input = QDoubleSpinBox()
+        self.quantity_input.setDecimals(8)
+        self.quantity_input.setRange(0, 1e12)
+        self.quantity_input.setToolTip("Quantity held (0 = watch only)")
+        self.cost_input = QDoubleSpinBox()
+        self.cost_input.setDecimals(8)
+        self.cost_input.setRange(0, 1e12)
+        self.cost_input.setPrefix(currency_format(BASE_CURRENCY).symbol)
+        self.cost_input.setToolTip(f"Average cost per unit in {BASE_CURRENCY.upper()}")
+        self.save_button = QPushButton("Save")
+        self.save_button.clicked.connect(self.save_position)
+        self.remove_button = QPushButton("Remove")
+        self.remove_button.clicked.connect(self.remove_position)
+        for widget in (self.coin_input, self.quantity_input, self.cost_input, self.save_button, self.remove_button):
+            form.addWidget(widget)
+        layout.addLayout(form)
+
+        self.rebuild()
+
+    # ----- Updates -----
+    def set_currency(self, currency: str, rate: float):
+        """Shows values in `currency`, converted from the base currency at `rate`."""
+        self.currency, self.rate = currency, rate
+        self.rebuild()
+
+    def rebuild(self):
+        """Repopulates every row (after positions were added or removed)."""
+        positions = list(self.portfolio.positions.values())
+        self.portfolio.take_changes()
+        self.table.setRowCount(len(positions))
+        self._rows = {}
+        for row, position in enumerate(positions):
+            self._rows[position.coin_id] = row
+            for col in range(len(COLUMNS)):
+                item = QTableWidgetItem()
+                if col:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, col, item)
+            self._update_row(row, position)
+        self._update_totals()
+
+    def refresh_changed(self):
+        """Rewrites only the rows whose position changed since the last refresh."""
+        changed = self.portfolio.take_changes()
+        if not changed:
+            return
+        if any(coin_id not in self._rows or coin_id not in self.portfolio.positions for coin_id in changed):
+            self.rebuild()
+            return
+        for coin_id in changed:
+            self._update_row(self._rows[coin_id], self.portfolio.positions[coin_id])
+        self._update_totals()
+
+    def _update_row(self, row: int, position):
+        symbol = f" ({position.symbol.upper()})" if position.symbol else ""
+        pnl, pnl_percent = position.pnl, position.pnl_percent
+        priced = position.price is not None
+        rate, currency = self.rate, self.currency
+        values = [
+            f"{position.name}{symbol}",
+            f"{position.quantity:,.8g}",
+            DataFormatter.format_price(position.price * rate, currency) if priced else "—",
+            DataFormatter.format_amount(position.value * rate, currency) if priced else "—",
+            (DataFormatter.format_amount(pnl * rate, currency, signed=True) if priced else "—") if position.quantity else "",
+            DataFormatter.format_percentage_change(pnl_percent) if pnl_percent is not None else "",
+        ]
+        for col, text in enumerate(values):
+            self.table.item(row, col).setText(text)
+        brush = theme.palette().change_brush(pnl)
+        self.table.item(row, 4).setForeground(brush)
+        self.table.item(row, 5).setForeground(brush)
+
+    def _update_totals(self):
+        portfolio = self.portfolio
+        if not portfolio.positions:
+            self.totals_label.setText("Select a coin and save it to watch or track a holding")
+            return
+        pnl = portfolio.total_pnl
+        percent = f" ({pnl / portfolio.total_cost * 100:+.2f}%)" if portfolio.total_cost else ""
+        value = DataFormatter.format_amount(portfolio.total_value * self.rate, self.currency)
+        pnl_text = DataFormatter.format_amount(pnl * self.rate, self.currency, signed=True)
+        self.totals_label.setText(f"Value {value} · P&L {pnl_text}{percent}")
+
+    # ----- Editing -----
+    def set_coin(self, coin: Dict):
+        """Prefills the form with a coin (e.g. the one selected in the main table)."""
+        if not coin:
+            return
+        self.coin_input.setText(coin["id"])
+        position = self.portfolio.positions.get(coin["id"])
+        self.quantity_input.setValue(position.quantity if position else 0)
+        self.cost_input.setValue(position.cost_basis if position else coin.get("base_price", coin.get("price")) or 0)
+
+    def _on_row_selected(self):
+        row = self.table.currentRow()
+        coin_id = next((cid for cid, r in self._rows.items() if r == row), None)
+        position = self.portfolio.positions.get(coin_id) if coin_id else None
+        if position is not None:
+            self.coin_input.setText(position.coin_id)
+            self.quantity_input.setValue(position.quantity)
+            self.cost_input.setValue(position.cost_basis)
+
+    def _find_coin(self, text: str) -> Optional[Dict]:
+        text = text.strip().lower()
+        coins = self.data_controller.current_data
+        return (next((c for c in coins if c["id"] == text), None)
+                or next((c for c in coins if c.get("symbol", "").lower() == text), None))
+
+    def save_position(self):
+        text = self.coin_input.text().strip()
+        if not text:
+            return
+        coin = self._find_coin(text)
+        coin_id = coin["id"] if coin else text.lower()  # unknown ids are priced on the next refresh
+        self.portfolio.set_position(coin_id, self.quantity_input.value(), self.cost_input.value(), coin)
+        self.refresh_changed()
+        self.positions_changed.emit()
+        self.status_update.emit(f"Saved {coin_id} to portfolio", "success")
+
+    def remove_position(self):
+        coin = self._find_coin(self.coin_input.text())
+        coin_id = coin["id"] if coin else self.coin_input.text().strip().lower()
+        if coin_id not in self.portfolio.positions:
+            return
+        self.portfolio.remove(coin_id)
+        self.refresh_changed()
+        self.positions_changed.emit()
+        self.status_update.emit(f"Removed {coin_id} from portfolio", "info")
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from typing import Tuple
+import numpy as np
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle
+from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QPainter, QPixmap, QPolygonF
+
+from ..config import SPARKLINE_CACHE_SIZE
+from ..utils.theme import theme
+
+
+class SparklineDelegate(QStyledItemDelegate):
+    """Draws a 7-day sparkline from the series stored in the cell's UserRole data.
+
+    The cell data is a (coin_id, data_version, prices) tuple. Each rendered sparkline is
+    cached as a pixmap keyed by (coin id, data version, cell size, theme), so repaints
+    while scrolling only blit cached images.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.is_dark = False
+        self._cache: "OrderedDict[Tuple, QPixmap]" = OrderedDict()
+
+    def set_theme(self, is_dark: bool):
+        """Switch theme; pixmaps of the other theme stay cached for the next toggle."""
+        self.is_dark = is_dark
+
+    def paint(self, painter: QPainter, option, index):
+        # Let the style draw the selection/hover background first
+        self.initStyleOption(option, index)
+        option.text = ""
+        style = option.widget.style() if option.widget else None
+        if style:
+            style.drawControl(QStyle.ControlElement.CE_ItemViewItem, option, painter, option.widget)
+
+        cell = index.data(Qt.ItemDataRole.UserRole)
+        if not cell or len(cell[2]) < 2:
+            return
+
+        coin_id, version, prices = cell
+        rect = option.rect.adjusted(6, 6, -6, -6)
+        if rect.width() <= 0 or rect.height() <= 0:
+            return
+
+        ratio = painter.device().devicePixelRatioF() if painter.device() else 1.0
+        key = (coin_id, version, rect.width(), rect.height(), ratio, self.is_dark)
+        pixmap = self._cache.get(key)
+        if pixmap is None:
+            pixmap = self._render(prices, rect.width(), rect.height(), ratio)
+            self._cache[key] = pixmap
+            if len(self._cache) > SPARKLINE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+
+        painter.drawPixmap(rect.topLeft(), pixmap)
+
+    def _render(self, prices, width: int, height: int, ratio: float) -> QPixmap:
+        """Render a sparkline into a transparent pixmap."""
+        pixmap = QPixmap(int(width * ratio), int(height * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        values = np.asarray(prices, dtype=np.float64)
+        # Never draw more points than there are pixels
+        if len(values) > width:
+            values = values[np.linspace(0, len(values) - 1, width).astype(np.int64)]
+
+        low, high = values.min(), values.max()
+        span = high - low or 1.0
+        xs = np.linspace(0, width - 1, len(values))
+        ys = (height - 1) - (values - low) / span * (height - 1)
+
+        palette = theme.palette(self.is_dark)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(palette.pen("up" if values[-1] >= values[0] else "down", 1.5))
+        painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs, ys)]))
+        painter.end()
+        return pixmap
@@ -1,12 +1,31 @@
 # status_bar_view.py
 from PySide6.QtWidgets import QStatusBar, QLabel, QSizePolicy
 from PySide6.QtCore import QTimer, Qt
-import requests
-from requests import RequestException
+from ..api.network_monitor import network_monitor
+from ..utils.worker import run_in_background
+from ..utils.tracing import tracer
+
+ALERT_HISTORY = 10  # recent alerts listed in the alert label's tooltip
+
+# Stages shown by the developer overlay: label -> span name
+TRACE_STAGES = [
+    ("fetch", "controller.fetch_top_coins"),
+    ("wait", "api.rate_limit_sleep"),
+    ("http", "api.http"),
+    ("json", "api.json_decode"),
+    ("format", "controller.format"),
+    ("quotes", "controller.quotes"),
+    ("store", "controller.persist"),
+    ("alerts", "controller.alerts"),
+    ("table", "table.populate"),
+]
 
 class StatusBarView(QStatusBar):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, api=None):
         super().__init__(parent)
+        self.api = api  # used for off-thread probes when the app is idle
+        self.monitor = api.monitor if api is not None else network_monitor
+        self._probe_task = None
 
         # ----- Temporary message label (left/main) -----
         self.message_label = QLabel("Ready")
@@ -19,6 +38,25 @@ class StatusBarView(QStatusBar):
         self._clear_timer.setSingleShot(True)
         self._clear_timer.timeout.connect(self.clear_message)
 
+        # ----- Latest alert (kept until the next alert, unlike temporary messages) -----
+        self.alert_label = QLabel("")
+        self.alert_label.setObjectName("alertLabel")
+        self.alert_label.setVisible(False)
+        self._recent_alerts = []
+        self.addPermanentWidget(self.alert_label)
+
+        # ----- Permanent API latency label -----
+        self.latency_label = QLabel("")
+        self.latency_label.setObjectName("apiLatency")
+        self.latency_label.setToolTip("Rolling latency of recent CoinGecko requests")
+        self.addPermanentWidget(self.latency_label)
+
+        # ----- Developer overlay: last refresh breakdown (only while tracing) -----
+        self.trace_label = QLabel("")
+        self.trace_label.setObjectName("traceOverlay")
+        self.trace_label.setVisible(tracer.enabled)
+        self.addPermanentWidget(self.trace_label)
+
         # ----- Permanent network status label (far-right) -----
         self.network_label = QLabel("Checking…")
         self.network_label.setObjectName("networkStatus")
@@ -30,12 +68,13 @@ class StatusBarView(QStatusBar):
         # Add as permanent widget (no stretch) so it stays at the far-right
         self.addPermanentWidget(self.network_label)
 
-        # Timer to check network every 3 seconds
+        # Timer to refresh the network status every 3 seconds; this only reads the
+        # passively collected state, the network is touched by (rare) idle probes.
         self._network_timer = QTimer(self)
         self._network_timer.timeout.connect(self.update_network_status)
         self._network_timer.start(3000)  # check every 3 seconds
 
-        # Initial network check
+        # Initial network status
         self.update_network_status()
 
     # ----- Temporary messages -----
@@ -60,18 +99,69 @@ class StatusBarView(QStatusBar):
         # use timeout=0 so clear doesn't restart the timer
         self.show_message("Ready", status_type="success", timeout=0)
 
+    # ----- Alerts -----
+    def show_alerts(self, messages):
+        """Show the newest alert; the tooltip lists the recent ones."""
+        if not messages:
+            return
+        self._recent_alerts = (list(messages) + self._recent_alerts)[:ALERT_HISTORY]
+        extra = f" (+{len(messages) - 1})" if len(messages) > 1 else ""
+        self.alert_label.setText(f"🔔 {messages[0]}{extra}")
+        self.alert_label.setToolTip("Recent alerts\n" + "\n".join(self._recent_alerts))
+        self.alert_label.setVisible(True)
+
     # ----- Permanent network status -----
     def update_network_status(self):
-        """Check internet connectivity and update the network label."""
-        # Choose the host you prefer for the check; keep timeout very short.
-        try:
-            requests.get("https://www.google.com", timeout=2)
+        """Update the network and latency labels from passively observed API traffic."""
+        online = self.monitor.online
+        if online is None:
+            self.network_label.setText("Checking…")
+            self.network_label.setProperty("statusType", "info")
+        elif online:
             self.network_label.setText("Online")
             self.network_label.setProperty("statusType", "success")
-        except RequestException:
+        else:
             self.network_label.setText("Offline")
             self.network_label.setProperty("statusType", "error")
 
+        latency = self.monitor.latency_percentiles((50, 95))
+        if latency:
+            self.latency_label.setText(f"API p50 {latency[50]:.0f} ms · p95 {latency[95]:.0f} ms")
+        else:
+            self.latency_label.setText("")
+
+        if tracer.enabled:
+            self.update_trace_overlay()
+
         # force style refresh on the network label so the QSS [statusType=...] rules are applied immediately
         self.network_label.style().unpolish(self.network_label)
         self.network_label.style().polish(self.network_label)
+
+        # Probe actively (off the GUI thread) only when there was no real traffic lately
+        if self.api is not None and self.monitor.should_probe():
+            self.monitor.probe_started()
+            self._probe_task = run_in_background(self.api.ping, self._on_probe_finished)
+
+    def update_trace_overlay(self):
+        """Show the duration of each traced stage of the last complete refresh."""
+        stages = tracer.last_refresh
+        parts = []
+        for label, name in TRACE_STAGES:
+            if name in stages:
+                total, occurrences = stages[name]
+                parts.append(f"{label} {occurrences}×{total:.0f}" if occurrences > 1 else f"{label} {total:.0f}")
+        self.trace_label.setText(("⏱ " + " · ".join(parts) + " ms") if parts else "⏱ tracing")
+        lines = [f"Refresh #{tracer.last_refresh_id} breakdown" if stages else "No complete refresh yet"]
+        paint = tracer.last_durations.get("chart.paint")
+        if paint is not None:
+            lines.append(f"last chart paint {paint:.0f} ms")
+        counters = ", ".join(f"{name}={value:g}" for name, value in sorted(tracer.counters.items()))
+        if counters:
+            lines.append(counters)
+        self.trace_label.setToolTip("\n".join(lines))
+
+    def _on_probe_finished(self, _reachable):
+        """Schedule the next probe (backing off exponentially while offline)."""
+        self._probe_task = None
+        self.monitor.probe_finished()
+        self.update_network_status()
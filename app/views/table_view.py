@@ -1,10 +1,17 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView
-from PySide6.QtCore import Qt, Signal, QTimer
-from PySide6.QtGui import QColor, QBrush
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QBrush
 from typing import List, Dict
 from datetime import datetime
 from ..logic.data_controller import DataController
 from ..utils.formatting import DataFormatter
+from ..utils.worker import run_in_background
+from .sparkline_delegate import SparklineDelegate
+from ..utils.tracing import tracer
+from ..utils.theme import theme
+from ..config import BASE_CURRENCY
+
+SPARKLINE_COLUMN = 5
 
 
 class TableView(QWidget):
@@ -21,15 +28,19 @@ class TableView(QWidget):
 
         self.all_data: List[Dict] = []
         self.current_data: List[Dict] = []
+        self.currency = BASE_CURRENCY  # currency of the displayed values
 
         self.sort_column = 0
         self.sort_order = Qt.SortOrder.AscendingOrder
 
+        self.is_stale = False
+        self.stale_since = ""  # when the cached snapshot shown at startup was fetched
+        self._refresh_task = None  # in-flight background fetch, if any
+
         self.setup_ui()
-        self.refresh_data()
-        self.refresh_timer = QTimer(self)
-        self.refresh_timer.timeout.connect(self.refresh_data)
-        self.refresh_timer.start(2 * 60 * 1000)  # 2 minutes in milliseconds
+        # Render the last persisted snapshot right away, then refresh in the background
+        self.load_warm_start()
+        # Periodic refreshes are driven by the main window's RefreshScheduler
 
     def setup_ui(self):
         """Set up the table UI."""
@@ -38,8 +49,8 @@ class TableView(QWidget):
 
         self.table = QTableWidget()
         self.table.setObjectName("cryptoTable")
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["Rank", "Name (Symbol)", "Price", "24h %", "Market Cap"])
+        self.table.setColumnCount(6)
+        self._update_header_labels()
 
         header = self.table.horizontalHeader()
         # Set initial column widths with more space for Price and 24h %
@@ -48,11 +59,17 @@ class TableView(QWidget):
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.Interactive)  # Price - fixed width
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.Interactive)  # 24h % - fixed width
         header.setSectionResizeMode(4, QHeaderView.ResizeMode.Interactive)  # Market Cap - fixed width
+        header.setSectionResizeMode(SPARKLINE_COLUMN, QHeaderView.ResizeMode.Fixed)  # 7d sparkline
         
         # Set minimum widths to ensure content fits
         self.table.setColumnWidth(2, 120)  # Price column - wide enough for large values
         self.table.setColumnWidth(3, 80)   # 24h % column - wide enough for percentages like -10.00%
         self.table.setColumnWidth(4, 120)  # Market Cap column
+        self.table.setColumnWidth(SPARKLINE_COLUMN, 130)  # 7d sparkline column
+
+        # Sparklines are painted (and cached) by a delegate from the fetched series
+        self.sparkline_delegate = SparklineDelegate(self.table)
+        self.table.setItemDelegateForColumn(SPARKLINE_COLUMN, self.sparkline_delegate)
         
         header.sectionClicked.connect(self.on_header_clicked)
 
@@ -60,42 +77,101 @@ class TableView(QWidget):
         self.table.setAlternatingRowColors(True)
         self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.table.setSelectionMode(QTableWidget.SelectionMode.ExtendedSelection)
         self.table.itemSelectionChanged.connect(self.on_selection_changed)
 
         layout.addWidget(self.table)
 
+    def _update_header_labels(self):
+        code = self.currency.upper()
+        self.table.setHorizontalHeaderLabels(
+            ["Rank", "Name (Symbol)", f"Price ({code})", "24h %", f"Market Cap ({code})", "7d"])
+
+    def show_snapshot(self, currency: str, data: List[Dict]):
+        """Show `data` (already converted to `currency`) without refetching."""
+        if currency != self.currency:
+            self.currency = currency
+            self._update_header_labels()
+        self.all_data = data
+        self.current_data = list(self.all_data)
+        self.apply_sorting()
+
+    def load_warm_start(self):
+        """Show the snapshot persisted by the previous session, marked as stale."""
+        if not self.data_controller.load_warm_snapshot():
+            return
+        self.currency, data = self.data_controller.display_snapshot()
+        self._update_header_labels()
+        self.all_data = data
+        self.current_data = list(self.all_data)
+        self.is_stale = True
+        self.apply_sorting()
+        fetched_at = self.data_controller.warm_state.get("fetched_at")
+        self.stale_since = datetime.fromtimestamp(fetched_at).strftime("%H:%M") if fetched_at else "last session"
+        self.data_availability_changed.emit(True)
+
     def refresh_data(self):
-        """Fetch coins and emit status messages."""
+        """Fetch coins in the background and emit status messages."""
+        if self._refresh_task is not None:
+            return  # a refresh is already running
+
         self.clear_selection()
         self.main_window.header.clear_search()
-        self.status_update.emit("Fetching coin data...", "info")
-        
-        data = self.data_controller.fetch_top_coins()
+        if self.is_stale:
+            self.status_update.emit(f"Showing cached data from {self.stale_since} (stale) - refreshing...", "warning")
+        else:
+            self.status_update.emit("Fetching coin data...", "info")
+
+        self._refresh_task = run_in_background(self.data_controller.fetch_snapshot, self.on_refresh_finished)
+
+    def on_refresh_finished(self, snapshot):
+        """Apply the result of a background refresh (runs on the GUI thread)."""
+        self._refresh_task = None
+        with tracer.resume_refresh():
+            data = self.data_controller.apply_snapshot(snapshot)
+            if data:
+                self.show_snapshot(*self.data_controller.display_snapshot())
         if data:
-            self.all_data = data
-            self.current_data = list(self.all_data)
-            self.apply_sorting()
+            self.is_stale = False
             timestamp = datetime.now().strftime("%H:%M")
             self.status_update.emit(f"Coins fetched at {timestamp}", "success")
             self.data_availability_changed.emit(True)  # Emit data available
+        elif self.is_stale:
+            self.status_update.emit(f"Offline - showing cached data from {self.stale_since}", "warning")
         else:
             # Only show error message, don't disable export if we have existing data
             self.status_update.emit("Failed to fetch new data - using existing data", "warning")
 
+    def update_rows(self, coins: List[Dict]):
+        """Update the price cells of the rows showing `coins` in place (no table rebuild)."""
+        by_id = {coin["id"]: coin for coin in coins}
+        for row in range(self.table.rowCount()):
+            rank_item = self.table.item(row, 0)
+            row_coin = rank_item.data(Qt.ItemDataRole.UserRole) if rank_item else None
+            coin = by_id.get(row_coin["id"]) if row_coin else None
+            if coin is None:
+                continue
+            rank_item.setData(Qt.ItemDataRole.UserRole, coin)
+            self.table.item(row, 2).setText(DataFormatter.format_price(coin["price"], self.currency))
+            change_item = self.table.item(row, 3)
+            change_item.setText(DataFormatter.format_percentage_change(coin["change_24h"]))
+            change_item.setForeground(self._change_brush(coin.get("change_24h", 0)))
+            self.table.item(row, 4).setText(DataFormatter.format_currency(coin["market_cap"], self.currency))
+
     def populate_table(self, data: List[Dict]):
         """Populate the table with given coin data."""
 
-        # Clear selection before populating new data
-        self.table.clearSelection()
-        self.table.setRowCount(len(data))
-        
-        # Emit data availability status - check if we have ANY data (old or new)
-        has_any_data = len(self.all_data) > 0
-        self.data_availability_changed.emit(has_any_data)
-        
-        for row, coin in enumerate(data):
-            self.add_table_row(row, coin)
+        with tracer.span("table.populate", "view", rows=len(data)):
+            # Clear selection before populating new data
+            self.table.clearSelection()
+            self.table.setRowCount(len(data))
+
+            # Emit data availability status - check if we have ANY data (old or new)
+            has_any_data = len(self.all_data) > 0
+            self.data_availability_changed.emit(has_any_data)
+
+            for row, coin in enumerate(data):
+                self.add_table_row(row, coin)
 
     def add_table_row(self, row: int, coin: Dict):
         """Add a single row to the table for a coin."""
@@ -108,29 +184,40 @@ class TableView(QWidget):
         items = [
             rank_item,
             QTableWidgetItem(f"{coin['name']} ({coin['symbol']})"),
-            QTableWidgetItem(DataFormatter.format_price(coin["price"])),
+            QTableWidgetItem(DataFormatter.format_price(coin["price"], self.currency)),
             QTableWidgetItem(DataFormatter.format_percentage_change(coin["change_24h"])),
-            QTableWidgetItem(DataFormatter.format_currency(coin["market_cap"]))
+            QTableWidgetItem(DataFormatter.format_currency(coin["market_cap"], self.currency)),
+            QTableWidgetItem()
         ]
 
+        # Sparkline cell: the delegate keys its pixmap cache on (id, data version)
+        items[SPARKLINE_COLUMN].setData(
+            Qt.ItemDataRole.UserRole,
+            (coin["id"], self.data_controller.data_version, coin.get("sparkline") or [])
+        )
+
         # Numeric alignment
         items[2].setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
         items[3].setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
         items[4].setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
 
         # Color 24h change directly with QBrush
-        change = coin.get("change_24h", 0)
-        if change > 0:
-            items[3].setForeground(QBrush(QColor("#16a34a")))  # green
-        elif change < 0:
-            items[3].setForeground(QBrush(QColor("#dc2626")))  # red
-        else:
-            items[3].setForeground(QBrush(QColor("#64748b")))  # neutral gray
+        items[3].setForeground(self._change_brush(coin.get("change_24h", 0)))
 
         for col, item in enumerate(items):
             self.table.setItem(row, col, item)
 
+    @staticmethod
+    def _change_brush(change) -> QBrush:
+        """Foreground brush for a 24h change value (shared from the active theme's palette)."""
+        return theme.palette().change_brush(change)
+
     def on_header_clicked(self, column: int):
+        # The sparkline column is not sortable
+        if column == SPARKLINE_COLUMN:
+            self.table.horizontalHeader().setSortIndicator(self.sort_column, self.sort_order)
+            return
+
         # Clear selection when sorting
         self.table.clearSelection()
         
@@ -161,11 +248,21 @@ class TableView(QWidget):
             self.table.horizontalHeader().setSortIndicator(self.sort_column, self.sort_order)
 
     def on_selection_changed(self):
-        """Emit signal with selected coin data."""
-        selected_items = self.table.selectedItems()
-        if selected_items:
-            coin_data = selected_items[0].data(Qt.ItemDataRole.UserRole)
-            self.coin_selected.emit(coin_data)
+        """Emit signal with the coin of the current row (the chart follows the last clicked row)."""
+        row = self.table.currentRow()
+        rank_item = self.table.item(row, 0) if row >= 0 and self.table.selectedItems() else None
+        if rank_item is not None:
+            self.coin_selected.emit(rank_item.data(Qt.ItemDataRole.UserRole))
+
+    def selected_coins(self) -> List[Dict]:
+        """Coins of all selected rows, in table order."""
+        rows = sorted(index.row() for index in self.table.selectionModel().selectedRows())
+        return [self.table.item(row, 0).data(Qt.ItemDataRole.UserRole) for row in rows if self.table.item(row, 0)]
+
+    def update_theme(self, is_dark: bool):
+        """Switch the sparkline theme and repaint the visible cells."""
+        self.sparkline_delegate.set_theme(is_dark)
+        self.table.viewport().update()
 
     def clear_selection(self):
         """Public method to clear table selection (for search, refresh, etc.)"""
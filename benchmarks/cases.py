@@ -0,0 +1,108 @@
+# benchmarks/cases.py
+"""
+Benchmark cases and their synthetic datasets.
+
+Each case is a function `case(size) -> callable`: the setup (dataset generation,
+widget creation) runs once and is not timed; the returned callable is the timed
+operation.
+"""
+from functools import lru_cache
+from typing import Callable, Dict, List
+
+import numpy as np
+
+COIN_SIZES = [50, 1_000, 10_000, 100_000]
+SERIES_SIZES = [10, 100, 1_000, 10_000, 100_000]
+
+
+@lru_cache(maxsize=None)
+def raw_coins(n: int) -> List[Dict]:
+    """CoinGecko-shaped /coins/markets entries (short sparklines keep 100k coins in memory)."""
+    from app.replay.synthetic import SyntheticMarket
+    return SyntheticMarket(n, seed=7, sparkline_points=24).markets(per_page=n, sparkline=True, t=1.7e9)
+
+
+@lru_cache(maxsize=None)
+def formatted_coins(n: int) -> List[Dict]:
+    from app.utils.formatting import DataFormatter
+    return DataFormatter.format_coin_data(raw_coins(n))
+
+
+@lru_cache(maxsize=None)
+def price_series(n: int):
+    """A random-walk price series with lazily formatted daily labels."""
+    from app.utils.formatting import TimestampLabels
+    rng = np.random.default_rng(n)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    timestamps = 1.7e12 + np.arange(n) * 3_600_000.0
+    return TimestampLabels(timestamps), prices
+
+
+# ----- Pure Python / NumPy cases -----
+def format_coin_data(size: int) -> Callable[[], object]:
+    from app.utils.formatting import DataFormatter
+    raw = raw_coins(size)
+    return lambda: DataFormatter.format_coin_data(raw)
+
+
+def search(size: int) -> Callable[[], object]:
+    from app.logic.search_algorithm import SearchAlgorithm
+    algorithm = SearchAlgorithm(formatted_coins(size))
+    return lambda: algorithm.search("coin 1")
+
+
+# ----- Qt cases (offscreen) -----
+@lru_cache(maxsize=None)
+def _table_view():
+    from app.logic.data_controller import DataController
+    from app.views.table_view import TableView
+    table = TableView(None, DataController())
+    table.resize(900, 700)
+    return table
+
+
+def populate_table(size: int) -> Callable[[], object]:
+    table = _table_view()
+    coins = formatted_coins(size)
+    return lambda: table.populate_table(coins)
+
+
+def apply_sorting(size: int) -> Callable[[], object]:
+    from PySide6.QtCore import Qt
+    table = _table_view()
+    coins = formatted_coins(size)
+
+    def run():
+        # Price descending: a different order than the rank order the data arrives in
+        table.all_data = coins
+        table.current_data = list(coins)
+        table.sort_column, table.sort_order = 2, Qt.SortOrder.DescendingOrder
+        table.apply_sorting()
+    return run
+
+
+def draw_chart(size: int) -> Callable[[], object]:
+    from PySide6.QtGui import QImage, QPainter
+    from app.utils.graph_painter import ChartWidget
+    widget = ChartWidget()
+    widget.resize(800, 500)
+    timestamps, prices = price_series(size)
+    widget.set_chart_data(timestamps, prices, "Benchmark")
+    image = QImage(800, 500, QImage.Format.Format_ARGB32_Premultiplied)
+
+    def run():
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        widget._draw_chart(painter, timestamps, prices)
+        painter.end()
+    return run
+
+
+# name -> (case factory, sizes, needs Qt)
+CASES = {
+    "format_coin_data": (format_coin_data, COIN_SIZES, False),
+    "search": (search, COIN_SIZES, False),
+    "populate_table": (populate_table, COIN_SIZES, True),
+    "apply_sorting": (apply_sorting, COIN_SIZES, True),
+    "draw_chart": (draw_chart, SERIES_SIZES, True),
+}
@@ -0,0 +1,163 @@
+# benchmarks/run.py
+"""
+Benchmark harness: `python -m benchmarks.run`.
+
+Times formatting, search, sort, table population and chart painting over synthetic
+datasets (50-100k coins, 10-100k point series) with offscreen Qt, writes the
+results as JSON and optionally compares them against a saved baseline:
+
+    python -m benchmarks.run --save-baseline          # record benchmarks/baseline.json
+    python -m benchmarks.run --compare                # exit 1 on regressions
+    python -m benchmarks.run -k chart --quick         # subset, sizes up to 10k
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Must be set before Qt (or anything reading the data directory) is imported
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("BLUE_MOON_DATA_DIR", tempfile.mkdtemp(prefix="blue_moon_bench_"))
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+RESULTS_DIR = BENCH_DIR / "results"
+
+
+def measure(fn, min_time: float = 0.2, max_runs: int = 50) -> Dict[str, float]:
+    """Runs `fn` until `min_time` has elapsed (at least 3 runs, 1 if a run is very slow)."""
+    fn()  # warm-up (caches, lazy imports)
+    timings: List[float] = []
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(timings) < max_runs:
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+            elapsed = sum(timings)
+            if elapsed >= min_time and (len(timings) >= 3 or elapsed >= 3 * min_time):
+                break
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+        "mean_ms": statistics.fmean(timings) * 1000,
+        "runs": len(timings),
+    }
+
+
+def run_benchmarks(pattern: Optional[str] = None, quick: bool = False, min_time: float = 0.2) -> Dict[str, Dict]:
+    from benchmarks.cases import CASES
+
+    results: Dict[str, Dict] = {}
+    app = None
+    for name, (factory, sizes, needs_qt) in CASES.items():
+        if pattern and pattern not in name:
+            continue
+        if needs_qt and app is None:
+            from PySide6.QtWidgets import QApplication
+            app = QApplication.instance() or QApplication(sys.argv[:1])
+        for size in sizes:
+            if quick and size > 10_000:
+                continue
+            key = f"{name}[{size}]"
+            result = measure(factory(size), min_time=min_time)
+            results[key] = result
+            print(f"  {key:<28} {result['median_ms']:>10.3f} ms  (min {result['min_ms']:.3f}, {result['runs']} runs)",
+                  file=sys.stderr)
+    return results
+
+
+def metadata() -> Dict[str, str]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True,
+                                text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    try:
+        import PySide6
+        qt = PySide6.__version__
+    except ImportError:
+        qt = ""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pyside6": qt,
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float, noise_ms: float) -> List[str]:
+    """Prints a comparison table and returns the keys that regressed beyond the threshold."""
+    regressions = []
+    print(f"\n{'benchmark':<28} {'baseline':>10} {'current':>10} {'change':>8}", file=sys.stderr)
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:<28} {'-':>10} {result['median_ms']:>10.3f}      new", file=sys.stderr)
+            continue
+        before, after = base["median_ms"], result["median_ms"]
+        change = (after - before) / before if before else 0.0
+        regressed = change > threshold and after - before > noise_ms
+        flag = "  REGRESSION" if regressed else ("  faster" if change < -threshold else "")
+        print(f"{key:<28} {before:>10.3f} {after:>10.3f} {change:>+7.1%}{flag}", file=sys.stderr)
+        if regressed:
+            regressions.append(key)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Run Blue Moon benchmarks.")
+    parser.add_argument("-k", dest="pattern", help="only run cases whose name contains PATTERN")
+    parser.add_argument("--quick", action="store_true", help="skip datasets larger than 10k")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds to spend per benchmark (default: 0.2)")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="also store the results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="compare against the baseline; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="relative slowdown counted as a regression (default: 0.15)")
+    parser.add_argument("--noise-ms", type=float, default=0.05,
+                        help="absolute slowdowns below this are ignored (default: 0.05 ms)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.pattern, args.quick, args.min_time)
+    report = {"meta": metadata(), "results": results}
+
+    output = args.output or RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults written to {output}", file=sys.stderr)
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}", file=sys.stderr)
+
+    if args.compare:
+        try:
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Cannot read baseline {args.baseline}: {e}", file=sys.stderr)
+            return 2
+        regressions = compare(results, baseline, args.threshold, args.noise_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,17 +3,46 @@ main.py
 
 Entry point for the Blue Moon application.
 Initializes the QApplication, loads the stylesheet, and launches the main window.
+
+Run with `--profile-startup` to print per-module import times and startup milestones,
+and with `--trace` to record timing spans and write a Chrome-trace JSON file on exit.
 """
 
 import sys
+from app.utils.startup_profiler import profiler
+from app.utils.tracing import tracer
+
+if "--profile-startup" in sys.argv:
+    sys.argv.remove("--profile-startup")
+    profiler.enable()
+
+if "--trace" in sys.argv:
+    sys.argv.remove("--trace")
+    tracer.enable()
+
+# Imported only once the profiler is enabled, so their import times are recorded
 from PySide6.QtWidgets import QApplication
 from app.main_window import MainWindow
 from app.config import STYLESHEET_PATH
 
+
+def export_trace():
+    """Write the collected spans next to the other local data (path overridable via BLUE_MOON_TRACE_FILE)."""
+    import os
+    import time
+    from app.config import DATA_DIR
+
+    default = DATA_DIR / "traces" / f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    path = tracer.export_chrome_trace(os.environ.get("BLUE_MOON_TRACE_FILE") or default)
+    if path:
+        print(f"Trace written to {path} (open in chrome://tracing or ui.perfetto.dev)")
+
+
 if __name__ == "__main__":
     # Create the Qt application
     app = QApplication(sys.argv)
     app.setStyle("Fusion")  # Set the Fusion style for consistency
+    profiler.mark("QApplication created")
 
     # Load stylesheet content
     style_sheet = ""
@@ -24,8 +53,17 @@ if __name__ == "__main__":
             app.setStyleSheet(style_sheet)
     except FileNotFoundError:
         print(f"Stylesheet not found at: {STYLESHEET_PATH}")
+    profiler.mark("stylesheet applied")
 
     # Instantiate and show the main window, passing the stylesheet
     main_window = MainWindow(style_sheet=style_sheet)
+    profiler.mark("main window created")
     main_window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    profiler.mark("window shown")
+
+    # Report once the table first paints with data (or at exit if it never does)
+    profiler.watch_first_paint(main_window.table.table.viewport(), main_window.table.has_data)
+    app.aboutToQuit.connect(profiler.report)
+    if tracer.enabled:
+        app.aboutToQuit.connect(export_trace)
+    sys.exit(app.exec())
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from app.logic.alerts import AlertEngine, AlertRule, parse_rule
+
+
+def _coin(coin_id, price, change=0.0, rank=1, symbol=None):
+    return {"id": coin_id, "symbol": symbol or coin_id[:3], "name": coin_id.title(), "rank": rank,
+            "price": price, "change_24h": change}
+
+
+def _fired(engine, price, now):
+    return sorted(alert.rule.text for alert in engine.evaluate([_coin("bitcoin", price)], now=now))
+
+
+def test_parse_rule_forms():
+    assert parse_rule("BTC < 60k") == AlertRule("BTC < 60k", "price", "btc", "below", 60000.0)
+    assert parse_rule("ETH/BTC > 0.05") == AlertRule("ETH/BTC > 0.05", "ratio", "eth/btc", "above", 0.05)
+    assert parse_rule("top100  move > 10%") == AlertRule("top100 move > 10%", "move", "", "above", 10.0, 100)
+    with pytest.raises(ValueError):
+        parse_rule("bitcoin ~ 5")
+
+
+def _reference(rules, prices, hysteresis):
+    """Brute force: each rule fires when its condition becomes true, and re-arms once the
+    value retreats past the threshold by the hysteresis fraction."""
+    disarmed, previous, fired = set(), None, []
+    for price in prices:
+        step = []
+        for rule in rules:
+            sign = 1.0 if rule.direction == "above" else -1.0
+            key, value = sign * rule.threshold, sign * price
+            rearm_level = key - abs(key) * hysteresis
+            if previous is not None and value < rearm_level <= sign * previous:
+                disarmed.discard(rule)
+            if (previous is None or sign * previous <= key) and key < value and rule not in disarmed:
+                disarmed.add(rule)
+                step.append(rule.text)
+        fired.append(sorted(step))
+        previous = price
+    return fired
+
+
+@pytest.mark.parametrize("hysteresis", [0.0, 0.01, 0.05])
+def test_index_crossings_match_brute_force(hysteresis):
+    rng = np.random.default_rng(7)
+    thresholds = np.round(rng.uniform(90, 110, 40), 2)
+    rules = [parse_rule(f"bitcoin {'>' if i % 2 else '<'} {threshold}") for i, threshold in enumerate(thresholds)]
+    prices = 100 + np.cumsum(rng.normal(0, 1.5, 300))
+    engine = AlertEngine(rules, hysteresis=hysteresis, cooldown=0)
+    fired = [_fired(engine, float(price), now=step) for step, price in enumerate(prices)]
+    assert fired == _reference(rules, prices.tolist(), hysteresis)
+
+
+def test_rearms_only_after_retreating_past_the_hysteresis_band():
+    engine = AlertEngine([parse_rule("bitcoin > 100")], hysteresis=0.05, cooldown=0)
+    assert _fired(engine, 90, now=0) == []
+    assert _fired(engine, 101, now=1) == ["bitcoin > 100"]
+    assert _fired(engine, 96, now=2) == []   # inside the band: still disarmed
+    assert _fired(engine, 102, now=3) == []
+    assert _fired(engine, 94, now=4) == []   # retreated past 95: re-armed
+    assert _fired(engine, 101, now=5) == ["bitcoin > 100"]
+
+
+def test_cooldown_swallows_repeated_crossings():
+    engine = AlertEngine([parse_rule("bitcoin < 50")], hysteresis=0.0, cooldown=60)
+    assert _fired(engine, 49, now=0) == ["bitcoin < 50"]
+    _fired(engine, 51, now=10)
+    assert _fired(engine, 49, now=20) == []  # re-armed, but within the cooldown
+    _fired(engine, 51, now=70)
+    assert _fired(engine, 49, now=80) == ["bitcoin < 50"]
+
+
+def test_symbol_ratio_and_move_rules():
+    rules = [parse_rule("BTC > 100"), parse_rule("eth/btc > 0.05"), parse_rule("top2 move > 10%")]
+    engine = AlertEngine(rules, hysteresis=0.0, cooldown=0)
+    snapshot = [_coin("bitcoin", 90, rank=1, symbol="btc"), _coin("ethereum", 4, change=-12, rank=2, symbol="eth"),
+                _coin("dogecoin", 1, change=30, rank=3, symbol="doge")]
+    fired = engine.evaluate(snapshot, now=0)
+    assert [(alert.rule.metric, alert.subject) for alert in fired] == [("move", "ethereum")]
+    assert "-12.0%" in fired[0].message
+
+    # A partial tick batch: bitcoin crosses, which also moves the ETH/BTC ratio over 0.05
+    ticks = [_coin("bitcoin", 101, rank=1, symbol="btc"), _coin("ethereum", 6, rank=2, symbol="eth")]
+    fired = engine.evaluate(ticks, complete=False, now=1)
+    assert sorted((alert.rule.text, alert.subject) for alert in fired) == [("BTC > 100", "btc"),
+                                                                         ("eth/btc > 0.05", "eth/btc")]
+
+
+def test_new_rule_fires_if_already_true_and_removed_rule_stops():
+    engine = AlertEngine([parse_rule("bitcoin > 200")], hysteresis=0.0, cooldown=0)
+    engine.evaluate([_coin("bitcoin", 150)], now=0)
+    rule = parse_rule("bitcoin > 100")
+    engine.add_rule(rule)
+    assert _fired(engine, 150, now=1) == ["bitcoin > 100"]
+    engine.remove_rule(rule)
+    _fired(engine, 50, now=2)
+    assert _fired(engine, 150, now=3) == []
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from app.logic.candles import CLOSE, DAY_MS, HIGH, HOUR_MS, LOW, OPEN, TS, aggregate_candles, to_candle_array
+
+
+def _four_hour_candles(days, start_ms=10 * DAY_MS, seed=3):
+    """CoinGecko-style 4h candles stamped with their close time."""
+    rng = np.random.default_rng(seed)
+    closes = start_ms + np.arange(1, days * 6 + 1) * 4 * HOUR_MS
+    opens = 100 + rng.normal(0, 1, len(closes))
+    shuts = 100 + rng.normal(0, 1, len(closes))
+    highs = np.maximum(opens, shuts) + rng.uniform(0, 1, len(closes))
+    lows = np.minimum(opens, shuts) - rng.uniform(0, 1, len(closes))
+    return np.column_stack((closes, opens, highs, lows, shuts))
+
+
+def _naive_aggregate(candles, bucket_ms):
+    """Reference: group candle by candle, by the bucket containing the close time minus 1 ms."""
+    groups = {}
+    for row in candles:
+        groups.setdefault(int((row[TS] - 1) // bucket_ms), []).append(row)
+    return np.array([[bucket * bucket_ms, rows[0][OPEN], max(r[HIGH] for r in rows),
+                      min(r[LOW] for r in rows), rows[-1][CLOSE]] for bucket, rows in sorted(groups.items())])
+
+
+def test_to_candle_array_sorts_and_rejects_bad_shapes():
+    candles = to_candle_array([[3000, 1, 2, 0, 1], [1000, 5, 6, 4, 5]])
+    assert candles[:, TS].tolist() == [1000, 3000]
+    assert to_candle_array(None).shape == (0, 5)
+    assert to_candle_array([[1, 2, 3]]).shape == (0, 5)
+
+
+def test_candle_closing_at_midnight_belongs_to_the_previous_day():
+    candles = to_candle_array([[DAY_MS - 4 * HOUR_MS, 1, 2, 0.5, 1.5],
+                               [DAY_MS, 1.5, 3, 1, 2],
+                               [DAY_MS + 4 * HOUR_MS, 2, 2.5, 1.8, 2.2]])
+    daily = aggregate_candles(candles, DAY_MS)
+    assert daily.tolist() == [[0, 1, 3, 0.5, 2], [DAY_MS, 2, 2.5, 1.8, 2.2]]
+
+
+@pytest.mark.parametrize("bucket_ms", [4 * HOUR_MS, 12 * HOUR_MS, DAY_MS, 7 * DAY_MS])
+def test_aggregate_matches_naive_grouping(bucket_ms):
+    candles = _four_hour_candles(days=9)
+    np.testing.assert_array_equal(aggregate_candles(candles, bucket_ms), _naive_aggregate(candles, bucket_ms))
+    # Gaps in the feed (missing candles, empty buckets) are skipped, not filled
+    gappy = np.delete(candles, np.r_[5:14, 30], axis=0)
+    np.testing.assert_array_equal(aggregate_candles(gappy, bucket_ms), _naive_aggregate(gappy, bucket_ms))
+
+
+def test_aggregate_empty():
+    assert aggregate_candles(np.empty((0, 5)), DAY_MS).shape == (0, 5)
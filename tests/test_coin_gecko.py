@@ -0,0 +1,22 @@
+import threading
+import time
+
+from app.api.coin_gecko import CoinGeckoAPI
+
+
+def test_rate_limit_spaces_concurrent_callers():
+    api = CoinGeckoAPI(base_url="http://127.0.0.1:9")
+    api.min_request_interval = 0.05
+    stamps = []
+
+    def call():
+        api._rate_limit()
+        stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stamps.sort()
+    assert all(b - a >= 0.04 for a, b in zip(stamps, stamps[1:]))
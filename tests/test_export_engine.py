@@ -0,0 +1,27 @@
+import csv
+import json
+
+import numpy as np
+
+from app.utils.export_engine import export_histories
+
+SERIES = {
+    "bitcoin": np.array([[1000.0, 50.0], [2000.0, 51.5]]),
+    "ethereum": np.array([[1000.0, 3.0]]),
+}
+
+
+def test_history_jsonl_has_one_object_per_row_like_csv(tmp_path):
+    for fmt in ("csv", "jsonl"):
+        written, failed = export_histories(tmp_path / f"history.{fmt}", ["bitcoin", "ethereum", "missing"],
+                                           SERIES.get, fmt, max_workers=1)
+        assert (written, failed) == (2, ["missing"])
+
+    with open(tmp_path / "history.csv", newline="", encoding="utf-8") as f:
+        csv_rows = [(row["coin_id"], int(row["timestamp_ms"]), float(row["price"])) for row in csv.DictReader(f)]
+    with open(tmp_path / "history.jsonl", encoding="utf-8") as f:
+        jsonl_rows = [json.loads(line) for line in f]
+
+    assert all(set(row) == {"coin_id", "timestamp_ms", "price"} for row in jsonl_rows)
+    assert sorted((row["coin_id"], row["timestamp_ms"], row["price"]) for row in jsonl_rows) == sorted(csv_rows)
+    assert len(jsonl_rows) == 3
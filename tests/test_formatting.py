@@ -0,0 +1,16 @@
+from app.utils.formatting import DataFormatter
+
+
+def test_format_amount_handles_zero_and_sign():
+    assert DataFormatter.format_amount(0) == "$0.00"
+    assert DataFormatter.format_amount(0, signed=True) == "$0.00"
+    assert DataFormatter.format_amount(1234.5, signed=True) == "+$1,234.50"
+    assert DataFormatter.format_amount(-1234.5) == "-$1,234.50"
+    assert DataFormatter.format_amount(-0.5, signed=True) == "-$0.500000"
+    assert DataFormatter.format_amount(-1234.5, "eur") == "-1.234,50 €"
+    assert DataFormatter.format_amount(None) == "N/A"
+
+
+def test_format_price_keeps_na_for_missing_prices():
+    assert DataFormatter.format_price(0) == "N/A"
+    assert DataFormatter.format_price(61234.567, "jpy") == "¥61,235"
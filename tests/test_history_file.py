@@ -0,0 +1,112 @@
+import threading
+
+import numpy as np
+import pytest
+
+from app.storage.history_file import HEADER_SIZE, RECORD_SIZE, HistoryFile, HistoryStore
+
+
+def _records(start, stop, price=100.0):
+    ts = np.arange(start, stop, dtype=np.float64) * 1000
+    return np.column_stack((ts, np.full(len(ts), price), np.zeros(len(ts))))
+
+
+def test_merge_appends_and_supersedes_the_overlap(tmp_path):
+    history = HistoryFile(tmp_path / "btc.bmh")
+    history.merge(_records(0, 10, price=1.0))
+    history.merge(_records(10, 12, price=2.0))
+    history.merge(_records(8, 15, price=3.0))  # the tail from ts 8 on is re-fetched
+
+    records = history.records()
+    assert records[:, 0].tolist() == (np.arange(15) * 1000).tolist()
+    assert records[:, 1].tolist() == [1.0] * 8 + [3.0] * 7
+    history.merge(np.empty((0, 3)))
+    assert len(history.records()) == 15
+    history.close()
+
+
+def test_read_range_is_inclusive(tmp_path):
+    history = HistoryFile(tmp_path / "btc.bmh")
+    history.merge(_records(0, 10))
+    assert history.read(start_ms=2000, end_ms=5000)[:, 0].tolist() == [2000, 3000, 4000, 5000]
+    assert len(history.read(start_ms=20_000)) == 0
+    history.close()
+
+
+def test_records_survive_reopen_and_torn_tails_are_ignored(tmp_path):
+    path = tmp_path / "btc.bmh"
+    history = HistoryFile(path)
+    history.merge(_records(0, 5))
+    history.close()
+
+    # A crash after writing records but before committing the count leaves a torn tail
+    with open(path, "ab") as f:
+        f.write(b"\xff" * (RECORD_SIZE + 7))
+    reopened = HistoryFile(path)
+    assert reopened.count == 5
+    reopened.merge(_records(5, 7))
+    assert reopened.records()[:, 0].tolist() == (np.arange(7) * 1000).tolist()
+    reopened.close()
+
+    # A count larger than the file holds is clamped to the complete records
+    with open(path, "r+b") as f:
+        f.truncate(HEADER_SIZE + 3 * RECORD_SIZE + 5)
+    assert HistoryFile(path).count == 3
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "other.bmh"
+    path.write_bytes(b"NOTAHIST" + bytes(HEADER_SIZE))
+    with pytest.raises(ValueError):
+        HistoryFile(path)
+
+
+def test_concurrent_merges_do_not_interleave(tmp_path):
+    history = HistoryFile(tmp_path / "btc.bmh")
+    history.merge(_records(0, 100))
+    barrier = threading.Barrier(8)
+
+    def refetch(worker):
+        barrier.wait()
+        for _ in range(20):
+            history.merge(_records(90, 100 + worker, price=float(worker)))
+
+    threads = [threading.Thread(target=refetch, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    records = np.asarray(history.records())
+    last = records[-1, 1]  # the tail is exactly one worker's series
+    assert records[:, 0].tolist() == (np.arange(100 + int(last)) * 1000).tolist()
+    assert (records[90:, 1] == last).all()
+    history.close()
+
+
+def test_store_sanitizes_file_names_and_reuses_handles(tmp_path):
+    store = HistoryStore(tmp_path)
+    history = store.get("weird/coin id")
+    assert store.get("weird/coin id") is history
+    assert history.path == tmp_path / "weird_coin_id.bmh"
+    store.close()
+
+
+def test_cached_chart_history_is_not_changed_by_later_merges(tmp_path):
+    from types import SimpleNamespace
+
+    from app.logic.data_controller import DataController
+
+    now_ms = 1_700_000_000_000
+    raw = {"prices": [[now_ms - (9 - i) * 3_600_000, 100.0 + i] for i in range(10)]}
+    controller = DataController()
+    controller._history_files = HistoryStore(tmp_path)
+    controller.api = SimpleNamespace(fetch_coin_history=lambda *args, **kwargs: raw)
+    history = controller.get_coin_history("bitcoin")
+    prices = history["prices"].tolist()
+
+    # A background fetch (or bulk export) replaces the provisional last point in place
+    controller.history_files.get("bitcoin").merge(np.array([[now_ms, 500.0, 0.0]]))
+    assert history["prices"].tolist() == prices
+    assert controller.get_coin_history("bitcoin") is history  # still cached, still unchanged
+    controller.history_files.close()
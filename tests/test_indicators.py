@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from app.logic.indicators import INDICATOR_TYPES, IndicatorEngine
+from app.storage.history_file import HistoryFile
+
+PARAMS = {"SMA": (5,), "EMA": (5,), "BB": (5, 2.0), "RSI": (5,)}
+
+
+def _prices(n, seed=1):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+
+
+@pytest.mark.parametrize("name", sorted(INDICATOR_TYPES))
+@pytest.mark.parametrize("split", [1, 3, 5, 6, 40])
+def test_incremental_matches_full_recompute(name, split):
+    values = _prices(60)
+    engine = IndicatorEngine()
+    engine.compute("btc", "7", name, PARAMS[name], values[:split])
+    incremental = engine.compute("btc", "7", name, PARAMS[name], values)
+    full = IndicatorEngine().compute("btc", "7", name, PARAMS[name], values)
+    np.testing.assert_allclose(incremental, full, equal_nan=True)
+
+
+def test_changed_prefix_recomputes():
+    values = _prices(30)
+    engine = IndicatorEngine()
+    engine.compute("btc", "7", "SMA", (5,), values)
+    changed = values.copy()
+    changed[-1] = 500.0
+    np.testing.assert_allclose(engine.compute("btc", "7", "SMA", (5,), changed)[-1], changed[-5:].mean())
+
+
+def test_memo_survives_in_place_history_merge(tmp_path):
+    history = HistoryFile(tmp_path / "btc.bin")
+    ts = np.arange(20, dtype=np.float64) * 1000
+    history.merge(np.column_stack((ts, np.full(20, 100.0), np.zeros(20))))
+    engine = IndicatorEngine()
+    engine.compute("btc", "7", "SMA", (5,), history.records()[:, 1])
+
+    # The provisional last point is rewritten in place in the memory-mapped file
+    history.merge(np.array([[ts[-1], 500.0, 0.0]]))
+    result = engine.compute("btc", "7", "SMA", (5,), history.records()[:, 1])
+    assert result[-1] == pytest.approx((4 * 100.0 + 500.0) / 5)
+    history.close()
+
+
+@pytest.mark.parametrize("name", sorted(INDICATOR_TYPES))
+def test_sliding_window_with_revised_tail_is_incremental(name, monkeypatch):
+    indicator_type = INDICATOR_TYPES[name]
+    prices = _prices(200)
+    ts = np.arange(200, dtype=np.float64) * 3_600_000
+    engine = IndicatorEngine()
+    engine.compute("btc", "7d", name, PARAMS[name], prices[:168], timestamps=ts[:168])
+
+    # Next fetch: 3 hours later, the window slid by 3 points and the provisional point was revised
+    seen = prices[:171].copy()
+    seen[167] *= 1.01
+    window = slice(3, 171)
+
+    lengths = []
+    full_compute = indicator_type.compute
+    monkeypatch.setattr(indicator_type, "compute", lambda self, values: (lengths.append(len(values)),
+                                                                          full_compute(self, values))[1])
+    result = engine.compute("btc", "7d", name, PARAMS[name], seen[window], timestamps=ts[window])
+    assert all(length == 0 for length in lengths)  # no full pass over the series
+
+    # Every point keeps the value computed over all points seen before it
+    expected = full_compute(indicator_type(*PARAMS[name]), seen)[0][window]
+    np.testing.assert_allclose(result, expected, equal_nan=True)
+
+
+def test_unaligned_series_are_recomputed():
+    engine = IndicatorEngine()
+    prices = _prices(40)
+    engine.compute("btc", "7d", "EMA", (5,), prices, timestamps=np.arange(40) * 1000.0)
+    shifted = engine.compute("btc", "7d", "EMA", (5,), prices, timestamps=np.arange(40) * 1000.0 + 500)
+    np.testing.assert_allclose(shifted, IndicatorEngine().compute("eth", "7d", "EMA", (5,), prices))
+
+
+def test_memo_is_bounded_and_least_recently_used_goes_first():
+    engine = IndicatorEngine(max_entries=3)
+    values = _prices(30)
+    for coin in ("a", "b", "c"):
+        engine.compute(coin, "7d", "SMA", (5,), values)
+    engine.compute("a", "7d", "SMA", (5,), values)
+    engine.compute("d", "7d", "SMA", (5,), values)
+    assert [key[0] for key in engine._memo] == ["c", "a", "d"]
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from app.logic.portfolio import Portfolio
+
+
+def _coin(coin_id, price):
+    return {"id": coin_id, "name": coin_id.title(), "symbol": coin_id[:3], "price": price}
+
+
+@pytest.fixture
+def portfolio(tmp_path):
+    return Portfolio(tmp_path / "portfolio.json")
+
+
+def _recomputed(portfolio):
+    priced = [p for p in portfolio.positions.values() if p.price is not None]
+    return sum(p.value for p in priced), sum(p.cost for p in priced)
+
+
+def test_incremental_totals_match_recomputation(portfolio):
+    portfolio.set_position("bitcoin", 0.5, 50000)
+    portfolio.set_position("ethereum", 2, 2000)
+    portfolio.set_position("tether", 0, 0)  # watch only
+    portfolio.update_prices([_coin("bitcoin", 60000), _coin("ethereum", 1500), _coin("tether", 1.0)])
+    portfolio.update_prices([_coin("bitcoin", 61000)])
+    portfolio.remove("ethereum")
+    portfolio.set_position("bitcoin", 1, 40000, _coin("bitcoin", 62000))
+
+    value, cost = _recomputed(portfolio)
+    assert portfolio.total_value == pytest.approx(value) == pytest.approx(62000)
+    assert portfolio.total_cost == pytest.approx(cost) == pytest.approx(40000)
+    assert portfolio.total_pnl == pytest.approx(22000)
+
+
+def test_update_prices_reports_only_changed_positions(portfolio):
+    portfolio.set_position("bitcoin", 1, 100)
+    portfolio.take_changes()
+    assert portfolio.update_prices([_coin("bitcoin", 110), _coin("ethereum", 5)]) == ["bitcoin"]
+    assert portfolio.update_prices([_coin("bitcoin", 110)]) == []
+    assert portfolio.take_changes() == {"bitcoin"}
+    assert portfolio.positions["bitcoin"].pnl == pytest.approx(10)
+    assert portfolio.positions["bitcoin"].pnl_percent == pytest.approx(10)
+
+
+def test_unpriced_positions_stay_out_of_totals(portfolio):
+    portfolio.set_position("bitcoin", 1, 100)
+    assert portfolio.positions["bitcoin"].pnl is None
+    assert portfolio.total_cost == 0
+
+
+def test_positions_persist(portfolio, tmp_path):
+    portfolio.set_position("bitcoin", 0.25, 30000)
+    stored = json.loads((tmp_path / "portfolio.json").read_text())
+    assert stored == {"positions": [{"coin_id": "bitcoin", "quantity": 0.25, "cost_basis": 30000}]}
+    assert Portfolio(tmp_path / "portfolio.json").positions["bitcoin"].quantity == 0.25
@@ -0,0 +1,56 @@
+import pytest
+
+from app.logic.data_controller import DataController
+from app.replay.synthetic import FIAT_RATES, SyntheticMarket
+from app.utils.formatting import DataFormatter
+
+T = 1_700_000_000.0
+
+
+def test_format_quotes_splits_by_currency():
+    raw = {
+        "bitcoin": {"eur": 55000.0, "eur_market_cap": 1.1e12, "eur_24h_change": 1.5, "jpy": 9e6},
+        "newcoin": {"jpy": 12.0, "jpy_24h_change": -3.0},
+    }
+    quotes = DataFormatter.format_quotes(raw, ["eur", "jpy", "gbp"])
+    assert quotes == {
+        "eur": {"bitcoin": {"price": 55000.0, "market_cap": 1.1e12, "change_24h": 1.5}},
+        "jpy": {"bitcoin": {"price": 9e6, "market_cap": None, "change_24h": None},
+                "newcoin": {"price": 12.0, "market_cap": None, "change_24h": -3.0}},
+        "gbp": {},
+    }
+
+
+def test_quotes_from_a_multi_currency_response_give_fx_rates():
+    market = SyntheticMarket(50)
+    coins = [{"id": raw["id"], "price": raw["current_price"]} for raw in market.markets(per_page=50, t=T)]
+    raw_quotes = market.simple_price([coin["id"] for coin in coins], "eur,gbp,btc", t=T)
+    quotes = DataFormatter.format_quotes(raw_quotes, ["eur", "gbp", "btc"])
+
+    assert all(len(quotes[currency]) == 50 for currency in ("eur", "gbp", "btc"))
+    rates = DataController._fx_rates(coins, quotes)
+    assert rates["eur"] == pytest.approx(FIAT_RATES["eur"], rel=1e-6)
+    assert rates["gbp"] == pytest.approx(FIAT_RATES["gbp"], rel=1e-6)
+    assert rates["btc"] == pytest.approx(1 / coins[0]["price"], rel=1e-6)
+
+
+def test_convert_falls_back_to_the_rate_for_missing_quote_fields():
+    coin = {"id": "newcoin", "price": 2.0, "market_cap": 1000.0, "change_24h": 4.0, "sparkline": [1, 2]}
+    converted = DataController._convert(coin, {"price": 1.9, "market_cap": None, "change_24h": None}, 0.9)
+    assert converted == dict(coin, price=1.9, market_cap=900.0, change_24h=4.0, base_price=2.0)
+    assert DataController._convert(coin, None, 0.5)["price"] == 1.0
+
+
+def test_headless_controller_skips_quotes_and_gui_state():
+    market = SyntheticMarket(20)
+    controller = DataController(warm_start=False, quotes=False, alerts=False, portfolio=False)
+    controller.store = None
+    calls = []
+    controller.api.get_top_coins = lambda limit, sparkline=False: market.markets(per_page=limit, t=T)
+    controller.api.get_simple_prices = lambda *args: calls.append(args)
+
+    coins = controller.fetch_top_coins(20)
+    assert len(coins) == 20
+    assert calls == []
+    assert controller.warm_start is None and controller.warm_state == {}
+    assert controller.portfolio.path is None and controller.alerts.rules == []
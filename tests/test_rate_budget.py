@@ -0,0 +1,115 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from app.api import rate_budget as rate_budget_module
+from app.api.coin_gecko import CoinGeckoAPI
+from app.api.rate_budget import RateBudget
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the budget's clock with a manually advanced one."""
+    now = [1000.0]
+    monkeypatch.setattr(rate_budget_module, "time", SimpleNamespace(time=lambda: now[0], sleep=time.sleep))
+    return now
+
+
+def test_record_counts_within_a_sliding_minute(clock):
+    budget = RateBudget(4)
+    budget.record()
+    clock[0] += 30
+    budget.record()
+    budget.record()
+    assert budget.remaining() == 1
+    assert budget.remaining_fraction() == 0.25
+    clock[0] += 30  # the first request leaves the window
+    assert budget.remaining() == 2
+    clock[0] += 30
+    assert budget.remaining() == 4
+
+
+def test_exhaust_blocks_until_retry_after(clock):
+    budget = RateBudget(10)
+    budget.record()
+    budget.exhaust(retry_after=20)
+    budget.exhaust(retry_after=5)  # a shorter Retry-After never shortens the block
+    assert budget.remaining() == 0
+    clock[0] += 19.9
+    assert budget.remaining_fraction() == 0.0
+    clock[0] += 0.2
+    assert budget.remaining() == 9
+
+
+def test_unlimited_budget_reports_full_fraction():
+    assert RateBudget(0).remaining_fraction() == 1.0
+
+
+def test_acquire_counts_against_budget():
+    budget = RateBudget(3)
+    assert all(budget.acquire() for _ in range(3))
+    assert budget.remaining() == 0
+
+
+def test_acquire_waits_for_window_and_can_be_cancelled():
+    budget = RateBudget(1)
+    budget.acquire()
+    cancelled = threading.Event()
+    threading.Timer(0.05, cancelled.set).start()
+    started = time.monotonic()
+    assert budget.acquire(cancelled) is False
+    assert time.monotonic() - started < 1.5
+    assert budget.remaining() == 0
+
+
+def test_concurrent_acquires_never_overshoot():
+    budget = RateBudget(5)
+    granted = []
+    cancelled = threading.Event()
+
+    def worker():
+        if budget.acquire(cancelled):
+            granted.append(1)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)
+    cancelled.set()
+    for thread in threads:
+        thread.join()
+    assert len(granted) == 5
+
+
+class _FakeSession:
+    def __init__(self, status, headers=None):
+        self.status, self.headers, self.calls = status, headers or {}, 0
+
+    def get(self, url, params=None, timeout=None, headers=None):
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = self.status
+        response.headers.update(self.headers)
+        response.url = url
+        response._content = b"[]"
+        return response
+
+
+def test_client_counts_each_request_once_and_exhausts_on_429():
+    api = CoinGeckoAPI(base_url="http://127.0.0.1:9")
+    api.budget = RateBudget(10)
+    api.monitor = SimpleNamespace(record_response=lambda *args, **kwargs: None, record_unreachable=lambda: None)
+    api._local.session = _FakeSession(200)
+
+    api._get(api.base_url + "/ping", {}, 1, "ping")
+    assert api.budget.remaining() == 9
+    assert api.budget.acquire()  # bulk exports reserve their slot first...
+    api._get(api.base_url + "/ping", {}, 1, "ping", reserved=True)
+    assert api.budget.remaining() == 8  # ...and the request does not count twice
+
+    api._local.session = _FakeSession(429, {"Retry-After": "30"})
+    assert api._get(api.base_url + "/ping", {}, 1, "ping") is None
+    assert api.budget.remaining() == 0
@@ -0,0 +1,41 @@
+import pytest
+
+from app.logic.refresh_policy import RefreshPolicy, VolatilityTracker
+
+
+def _coin(coin_id, price):
+    return {"id": coin_id, "price": price}
+
+
+def test_move_holds_across_batches_without_watchlist_coins():
+    tracker = VolatilityTracker(watchlist=["bitcoin"], threshold=1.0, window=300)
+    tracker.observe([_coin("bitcoin", 100.0)], now=0)
+    assert tracker.observe([_coin("bitcoin", 102.0)], now=10) == pytest.approx(2.0)
+    # Portfolio-only or empty tick batches must not reset the reading
+    assert tracker.observe([_coin("some-holding", 5.0)], now=20) == pytest.approx(2.0)
+    assert tracker.observe([], now=30) == pytest.approx(2.0)
+
+
+def test_move_does_not_depend_on_tick_granularity():
+    coarse = VolatilityTracker(watchlist=["bitcoin"], window=300)
+    fine = VolatilityTracker(watchlist=["bitcoin"], window=300)
+    coarse.observe([_coin("bitcoin", 100.0)], now=0)
+    coarse.observe([_coin("bitcoin", 103.0)], now=60)
+    for step in range(61):
+        fine.observe([_coin("bitcoin", 100.0 + step * 0.05)], now=step)
+    assert fine.move(now=60) == pytest.approx(coarse.move(now=60))
+
+
+def test_move_decays_after_the_window():
+    tracker = VolatilityTracker(watchlist=["bitcoin"], window=300)
+    tracker.observe([_coin("bitcoin", 100.0)], now=0)
+    tracker.observe([_coin("bitcoin", 105.0)], now=10)
+    assert tracker.move(now=200) == pytest.approx(5.0)
+    assert tracker.move(now=400) == 0.0
+    assert tracker.observe([_coin("bitcoin", 105.5)], now=401) == pytest.approx(0.5 / 105 * 100)
+
+
+def test_volatile_watchlist_polls_faster():
+    policy = RefreshPolicy({"prices": 60}, min_interval=1, max_interval=600)
+    assert policy.next_interval("prices", volatile=True) == 15
+    assert policy.next_interval("prices", volatile=False) == 60
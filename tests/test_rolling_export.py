@@ -0,0 +1,38 @@
+import json
+
+from app.headless import SnapshotWriter
+from app.storage.rolling_export import RollingExportSink
+
+COINS = [
+    {"rank": 1, "id": "bitcoin", "symbol": "BTC", "name": "Bitcoin", "price": 65000.5, "change_24h": 1.5,
+     "market_cap": 1.2e12, "sparkline": [1, 2, 3]},
+    {"rank": 2, "id": "ethereum", "symbol": "ETH", "name": "Ethereum", "price": None, "change_24h": -0.5,
+     "market_cap": None},
+]
+
+
+def test_size_rotation_within_one_second_keeps_every_file(tmp_path):
+    sink = RollingExportSink(tmp_path, fmt="jsonl", rotate="size", max_bytes=1, compress=False)
+    for _ in range(3):
+        assert sink.append(COINS, fetched_at=1_700_000_000.0)
+    sink.close()
+    files = sorted(tmp_path.glob("snapshots-*.jsonl"))
+    assert len(files) == 3
+    assert all(len(path.read_text().splitlines()) == 1 for path in files)
+
+
+def test_headless_files_match_the_auto_export(tmp_path):
+    for fmt in ("csv", "jsonl"):
+        sink = RollingExportSink(tmp_path / "auto", fmt=fmt, rotate="day", compress=False)
+        sink.append(COINS, fetched_at=1_700_000_000.1234)
+        sink.append(COINS, fetched_at=1_700_000_060.0)
+        sink.close()
+        writer = SnapshotWriter(**{f"{fmt}_path": tmp_path / f"headless.{fmt}"})
+        writer.write(COINS, 1_700_000_000.1234)
+        writer.write(COINS, 1_700_000_060.0)
+        assert (tmp_path / f"headless.{fmt}").read_bytes() == sink.path.read_bytes()
+
+    record = json.loads((tmp_path / "headless.jsonl").read_text().splitlines()[0])
+    assert record["fetched_at"] == 1_700_000_000.123
+    assert record["coins"][0] == {"rank": 1, "id": "bitcoin", "symbol": "BTC", "name": "Bitcoin",
+                                  "price": 65000.5, "change_24h": 1.5, "market_cap": 1.2e12}
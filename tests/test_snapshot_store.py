@@ -0,0 +1,51 @@
+import datetime
+
+from app.logic.data_controller import DataController
+from app.storage.snapshot_store import SnapshotStore
+
+T = 1_700_000_000
+
+
+def _coins(btc, eth):
+    return [{"id": "ethereum", "rank": 2, "price": eth, "change_24h": -1.0, "market_cap": eth * 1e8},
+            {"id": "bitcoin", "rank": 1, "price": btc, "change_24h": 2.0, "market_cap": btc * 2e7},
+            {"name": "no id, skipped"}]
+
+
+def test_appends_and_reads_price_series(tmp_path):
+    store = SnapshotStore(tmp_path / "snapshots.db")
+    assert store.append_snapshot(_coins(100.0, 10.0), ts=T) == 2
+    store.append_snapshot(_coins(101.0, 11.0), ts=T + 60)
+    store.append_snapshot(_coins(102.0, 12.0), ts=T + 120)
+    store.append_snapshot(_coins(103.0, 13.0), ts=T + 120)  # same second: replaced, not duplicated
+    assert store.append_snapshot([], ts=T) == 0
+
+    assert store.get_price_series("bitcoin") == [(T, 100.0), (T + 60, 101.0), (T + 120, 103.0)]
+    assert store.get_price_series("ethereum", start_ts=T + 60, end_ts=T + 60) == [(T + 60, 11.0)]
+    assert store.get_price_series("dogecoin") == []
+    assert [coin["id"] for coin in store.get_latest_snapshot()] == ["bitcoin", "ethereum"]
+    store.close()
+
+    reopened = SnapshotStore(tmp_path / "snapshots.db")
+    assert len(reopened.get_price_series("bitcoin")) == 3
+    assert reopened._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    reopened.close()
+
+
+def test_local_history_reads_the_store_since_a_point_in_time(tmp_path):
+    controller = DataController()
+    controller.store = SnapshotStore(tmp_path / "snapshots.db")
+    since = datetime.datetime.fromtimestamp(T)
+    controller.store.append_snapshot(_coins(99.0, 9.0), ts=T - 60)  # before `since`
+    controller.store.append_snapshot(_coins(100.0, 10.0), ts=T)
+    assert controller.get_local_history("bitcoin", since=since) is None  # one point is not a series
+
+    controller.store.append_snapshot(_coins(101.0, 11.0), ts=T + 3600)
+    history = controller.get_local_history("bitcoin", since=since)
+    assert history["prices"] == [100.0, 101.0]
+    assert history["timestamps"] == [since.strftime("%H:%M"),
+                                     datetime.datetime.fromtimestamp(T + 3600).strftime("%H:%M")]
+
+    controller.store.close()
+    controller.store = None
+    assert controller.get_local_history("bitcoin", since=since) is None
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from app.replay.synthetic import NOISE_SCALE, SyntheticMarket
+
+T = 1_700_000_000.0
+
+
+def test_selected_prices_match_the_full_universe():
+    market = SyntheticMarket(5000)
+    full = market.prices_at(T)
+    index = np.array([4999, 3, 0, 1234])
+    np.testing.assert_array_equal(market.prices_at(T, index), full[index])
+    np.testing.assert_array_equal(market.prices_at(T, slice(10, 20)), full[10:20])
+    assert market.simple_price(["coin-01234"], t=T)["coin-01234"]["usd"] == pytest.approx(full[1234])
+
+
+def test_prices_are_deterministic_per_seed():
+    np.testing.assert_array_equal(SyntheticMarket(100).prices_at(T), SyntheticMarket(100).prices_at(T))
+    assert not np.array_equal(SyntheticMarket(100, seed=1).prices_at(T), SyntheticMarket(100, seed=2).prices_at(T))
+
+
+def test_noise_is_gaussian_with_the_configured_scale():
+    market = SyntheticMarket(2000)
+    noise = np.concatenate([market._noise(step, slice(None)) for step in range(20)])
+    assert abs(noise.mean()) < NOISE_SCALE * 0.05
+    assert noise.std() == pytest.approx(NOISE_SCALE, rel=0.05)
@@ -0,0 +1,90 @@
+import threading
+
+from app.utils.tracing import Tracer
+
+
+def make_tracer():
+    tracer = Tracer()
+    tracer.enable()
+    return tracer
+
+
+def test_refresh_groups_its_spans_and_sums_repeated_stages():
+    tracer = make_tracer()
+    with tracer.refresh("controller.fetch_top_coins"):
+        for _ in range(3):
+            with tracer.span("api.http"):
+                pass
+        with tracer.span("controller.format"):
+            pass
+
+    assert tracer.last_refresh_id == 1
+    assert set(tracer.last_refresh) == {"controller.fetch_top_coins", "api.http", "controller.format"}
+    assert tracer.last_refresh["api.http"][1] == 3
+    assert tracer.last_refresh["controller.fetch_top_coins"][1] == 1
+
+
+def test_spans_outside_a_refresh_do_not_overwrite_its_stages():
+    tracer = make_tracer()
+    with tracer.refresh("controller.fetch_top_coins"):
+        with tracer.span("api.http"):
+            pass
+    stages = dict(tracer.last_refresh)
+
+    def chart_fetch():
+        with tracer.span("api.http"):
+            pass
+
+    # A chart fetch on another thread and a ping on this one, after the refresh
+    worker = threading.Thread(target=chart_fetch)
+    worker.start()
+    worker.join()
+    with tracer.span("api.http"):
+        pass
+
+    assert tracer.last_refresh == stages
+    assert tracer.last_durations["api.http"] >= 0
+
+
+def test_incomplete_refresh_keeps_the_previous_one():
+    tracer = make_tracer()
+    with tracer.refresh("controller.fetch_top_coins"):
+        pass
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_refresh():
+        with tracer.refresh("controller.fetch_top_coins"):
+            with tracer.span("api.http"):
+                started.set()
+                release.wait(5)
+
+    worker = threading.Thread(target=slow_refresh)
+    worker.start()
+    started.wait(5)
+    assert tracer.last_refresh_id == 1 and "api.http" not in tracer.last_refresh
+    release.set()
+    worker.join()
+    assert tracer.last_refresh_id == 2 and "api.http" in tracer.last_refresh
+
+
+def test_resume_refresh_adds_gui_stages_to_the_last_refresh():
+    tracer = make_tracer()
+    with tracer.refresh("controller.fetch_top_coins"):
+        pass
+    with tracer.resume_refresh():
+        with tracer.span("table.populate"):
+            pass
+    with tracer.span("chart.paint"):
+        pass
+
+    assert "table.populate" in tracer.last_refresh
+    assert "chart.paint" not in tracer.last_refresh
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.refresh("controller.fetch_top_coins"):
+        with tracer.span("api.http"):
+            pass
+    assert tracer.last_refresh == {} and tracer.last_durations == {}
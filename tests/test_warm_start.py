@@ -0,0 +1,31 @@
+import json
+
+import numpy as np
+
+from app.storage.warm_start import WarmStartCache
+from app.utils.formatting import TimestampLabels
+
+
+def test_chart_is_saved_apart_from_the_snapshot(tmp_path):
+    cache = WarmStartCache(tmp_path / "warm_start.json", tmp_path / "warm_chart.json")
+    cache.save_snapshot([{"id": "bitcoin", "price": 1.0}], fetched_at=5.0)
+    before = (tmp_path / "warm_start.json").read_bytes()
+
+    timestamps = TimestampLabels(np.array([1000.0, 2000.0]))
+    cache.save_chart({"id": "bitcoin", "name": "Bitcoin"}, timestamps, np.array([1.5, 2.5]))
+    assert (tmp_path / "warm_start.json").read_bytes() == before
+    assert json.loads((tmp_path / "warm_chart.json").read_text()) == {
+        "coin": {"id": "bitcoin", "name": "Bitcoin"}, "prices": [1.5, 2.5], "timestamps_ms": [1000.0, 2000.0]}
+
+    state = WarmStartCache(tmp_path / "warm_start.json", tmp_path / "warm_chart.json").load()
+    assert state["fetched_at"] == 5.0
+    assert state["chart"]["timestamps_ms"] == [1000.0, 2000.0]
+
+
+def test_chart_from_older_snapshot_files_is_read_and_dropped_on_rewrite(tmp_path):
+    chart = {"coin": {"id": "bitcoin"}, "timestamps": ["Jan 01", "Jan 02"], "prices": [1.0, 2.0]}
+    (tmp_path / "warm_start.json").write_text(json.dumps({"coins": [], "chart": chart}))
+    cache = WarmStartCache(tmp_path / "warm_start.json", tmp_path / "warm_chart.json")
+    assert cache.load()["chart"] == chart
+    cache.save_currency("eur")
+    assert "chart" not in json.loads((tmp_path / "warm_start.json").read_text())